@@ -0,0 +1,94 @@
+"""
+Compares the sync data layer run in the threadpool (the way FastAPI runs
+sync routes) with the async data layer run on the event loop, under the same
+number of concurrent requests.
+
+Usage (from the repository root, MySQL must be up):
+    PYTHONPATH=src python benchmarks/bench_async_crud.py --concurrency 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from anyio import to_thread
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from data.connections import MySQLConnection
+from data.specialty_data import AsyncSpecialtyCRUD, SpecialtyCRUD
+from data.sql_models import Specialty
+
+type Request = Callable[[], Awaitable[None]]
+
+
+def get_title() -> str:
+    with Session(MySQLConnection.engine) as session:
+        return session.get(Specialty, 1).title
+
+
+def sync_request(title: str) -> Request:
+    def handle() -> None:
+        with Session(
+                MySQLConnection.engine, expire_on_commit=False
+        ) as session:
+            SpecialtyCRUD(session).get_by_title(title)
+
+    async def request() -> None:
+        await to_thread.run_sync(handle)
+    return request
+
+
+def async_request(title: str) -> Request:
+    async def request() -> None:
+        async with AsyncSession(
+                MySQLConnection.async_engine, expire_on_commit=False
+        ) as session:
+            await AsyncSpecialtyCRUD(session).get_by_title(title)
+    return request
+
+
+async def measure(request: Request, concurrency: int) -> list[float]:
+    latencies = []
+
+    async def timed() -> None:
+        started = time.perf_counter()
+        await request()
+        latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(timed() for _ in range(concurrency)))
+    return latencies
+
+
+def report(name: str, latencies: list[float], elapsed: float) -> None:
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:>5}: {len(latencies) / elapsed:8.1f} req/s, "
+        f"median {statistics.median(latencies) * 1000:7.1f} ms, "
+        f"p95 {p95 * 1000:7.1f} ms"
+    )
+
+
+async def run(concurrency: int) -> None:
+    title = get_title()
+    for name, request in (
+            ("sync", sync_request(title)),
+            ("async", async_request(title))
+    ):
+        await measure(request, 10)
+        started = time.perf_counter()
+        latencies = await measure(request, concurrency)
+        report(name, latencies, time.perf_counter() - started)
+    print(MySQLConnection.get_pool_statistics())
+    print(MySQLConnection.get_async_pool_statistics())
+    await MySQLConnection.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.concurrency))
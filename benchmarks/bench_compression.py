@@ -0,0 +1,102 @@
+"""
+Bytes on the wire and CPU cost of compressing responses, per route and
+encoding. Sizes are taken from the responses of the app with the
+configured 'CompressionMiddleware', CPU time is the time spent by the
+encoder on the identity body of the route with the configured levels.
+Responses below the minimum size are sent as they are and cost nothing.
+
+Static assets are compared at the build time levels of
+'StaticAssetCompressor', which cost nothing per request.
+
+Usage (from the repository root, MySQL and Redis must be up):
+    PYTHONPATH=src python benchmarks/bench_compression.py --repeat 200
+"""
+
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+
+from config import Config
+from main import app
+from web.compression import ContentEncoding, StaticAssetCompressor
+
+settings = Config.get_settings()
+
+routes = (
+    "/specialties/",
+    "/doctors/1",
+    "/services/lab-tests",
+    "/appointments/new",
+    "/appointments/new/doctors?specialty_id=1",
+    "/appointments/new/slots?doctor_id=1"
+)
+
+levels = {
+    "gzip": settings.compression_gzip_level,
+    "br": settings.compression_brotli_quality
+}
+
+
+def get_encodings() -> list[str]:
+    encodings = [
+        encoding
+        for encoding
+        in settings.compression_encodings
+        if ContentEncoding.is_available(encoding)
+    ]
+    return encodings
+
+
+def measure_cpu(body: bytes, encoding: str, repeat: int) -> float:
+    started = time.process_time()
+    for _ in range(repeat):
+        encoder = ContentEncoding.encoders[encoding](levels[encoding])
+        encoder.compress(body)
+        encoder.flush()
+    return (time.process_time() - started) / repeat
+
+
+def report(
+        name: str, encoding: str, size: int, raw_size: int, cpu: float
+) -> None:
+    print(
+        f"{name:<45} {encoding:>8}: {size:8d} B "
+        f"({size / raw_size:6.1%}), {cpu * 1000:7.3f} ms CPU"
+    )
+
+
+def bench_routes(client: TestClient, repeat: int) -> None:
+    for route in routes:
+        response = client.get(route, headers={"Accept-Encoding": "identity"})
+        body = response.content
+        report(route, "identity", len(body), len(body), 0)
+        for encoding in get_encodings():
+            response = client.get(route, headers={"Accept-Encoding": encoding})
+            compressed = response.headers.get("content-encoding") == encoding
+            report(
+                route,
+                encoding,
+                response.num_bytes_downloaded,
+                len(body),
+                measure_cpu(body, encoding, repeat) if compressed else 0
+            )
+
+
+def bench_static() -> None:
+    compressor = StaticAssetCompressor(Config.static_dir)
+    for asset in compressor._get_assets():
+        raw_size = asset.stat().st_size
+        report(asset.name, "identity", raw_size, raw_size, 0)
+        for encoding in get_encodings():
+            path = compressor._write(asset, encoding)
+            report(asset.name, encoding, path.stat().st_size, raw_size, 0)
+            path.unlink()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    bench_routes(TestClient(app), args.repeat)
+    bench_static()
@@ -0,0 +1,70 @@
+"""
+Logins per second per core for every OTP hashing strategy. A login hashes
+the code twice, once when it is issued and once when it is verified.
+Inline hashers run on one thread, the pool variant is fed by as many
+threads as it has worker processes.
+
+Usage (from the repository root):
+    PYTHONPATH=src python benchmarks/bench_otp_hashing.py --workers 4
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from service.hashing_services import HMACHasher, OTPHasher, PBKDF2Hasher
+
+
+def login(hasher: OTPHasher) -> None:
+    salt = os.urandom(16)
+    hasher.hash("123456", salt)
+    hasher.hash("123456", salt)
+
+
+def measure(hasher: OTPHasher, threads: int, duration: float) -> int:
+    logins = [0] * threads
+    deadline = time.perf_counter() + duration
+
+    def run(index: int) -> None:
+        while time.perf_counter() < deadline:
+            login(hasher)
+            logins[index] += 1
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(run, range(threads)))
+    return sum(logins)
+
+
+def report(name: str, logins: int, cores: int, duration: float) -> None:
+    per_second = logins / duration
+    print(
+        f"{name:>32}: {per_second:10.1f} logins/s, "
+        f"{per_second / cores:10.1f} logins/s per core"
+    )
+
+
+def run(iterations: int, workers: int, duration: float) -> None:
+    for name, hasher in (
+            ("hmac-sha256", HMACHasher()),
+            (f"pbkdf2-sha256:{iterations}", PBKDF2Hasher(iterations))
+    ):
+        report(name, measure(hasher, 1, duration), 1, duration)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        hasher = PBKDF2Hasher(iterations, pool)
+        login(hasher)
+        report(
+            f"pbkdf2-sha256:{iterations} x{workers}",
+            measure(hasher, workers, duration),
+            workers,
+            duration
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--duration", type=float, default=3)
+    args = parser.parse_args()
+    run(args.iterations, args.workers, args.duration)
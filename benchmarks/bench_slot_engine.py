@@ -0,0 +1,116 @@
+"""
+Compares 'AppointmentSlotEngine' with the former per-day time sets passed
+to 'AppointmentShceduleDataConstructor' on one doctor over the booking
+range. Reports time per call and peak allocated memory.
+
+Usage (from the repository root, no database needed):
+    PYTHONPATH=src python benchmarks/bench_slot_engine.py
+"""
+
+import argparse
+import random
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from datetime import date, datetime, time, timedelta
+
+from service.appointment_services import (
+    AppointmentShceduleDataConstructor,
+    AppointmentSlotEngine,
+    AppointmentTimes
+)
+from data.sql_models import WorkSchedule
+
+
+def create_work_days() -> list[WorkSchedule]:
+    work_days = [
+        WorkSchedule(
+            weekday=str(weekday),
+            start_time=time(hour=8),
+            end_time=time(hour=20)
+        )
+        for weekday
+        in range(5)
+    ]
+    return work_days
+
+
+def create_booked(amount: int) -> AppointmentTimes:
+    today = date.today()
+    booked = {
+        (
+            today + timedelta(days=random.randrange(30)),
+            time(hour=random.randrange(8, 20), minute=random.choice([0, 30]))
+        )
+        for _ in range(amount)
+    }
+    return booked
+
+
+def create_work_day_times(work_day: WorkSchedule) -> set[str]:
+    """Appointment times of a work day, as they were built before the engine"""
+    times = set()
+    appointment_time = datetime.combine(date.today(), work_day.start_time)
+    while appointment_time.time() < work_day.end_time:
+        times.add(appointment_time.time().isoformat())
+        appointment_time += timedelta(minutes=30)
+    return times
+
+
+def run_constructors(
+        work_days: list[WorkSchedule], booked: AppointmentTimes
+) -> dict:
+    doctor_schedule = {
+        int(work_day.weekday): create_work_day_times(work_day)
+        for work_day
+        in work_days
+    }
+    return AppointmentShceduleDataConstructor(doctor_schedule, booked).exec()
+
+
+def run_slot_engine(
+        work_days: list[WorkSchedule], booked: AppointmentTimes
+) -> dict:
+    work_masks = AppointmentSlotEngine.get_work_masks(work_days)
+    return AppointmentSlotEngine(work_masks, booked).exec()
+
+
+def measure_peak_memory(routine: Callable[[], dict]) -> int:
+    tracemalloc.start()
+    routine()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def report(name: str, routine: Callable[[], dict], number: int) -> None:
+    seconds = min(timeit.repeat(routine, number=number, repeat=5)) / number
+    peak = measure_peak_memory(routine)
+    print(
+        f"{name:>12}: {seconds * 1e6:9.1f} us/call, "
+        f"peak {peak / 1024:7.1f} KiB"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--booked", type=int, default=200)
+    parser.add_argument("--number", type=int, default=1000)
+    args = parser.parse_args()
+    random.seed(0)
+    work_days = create_work_days()
+    booked = create_booked(args.booked)
+    assert (
+        run_constructors(work_days, booked)
+        == run_slot_engine(work_days, booked)
+    )
+    report(
+        "constructors",
+        lambda: run_constructors(work_days, booked),
+        args.number
+    )
+    report(
+        "slot engine",
+        lambda: run_slot_engine(work_days, booked),
+        args.number
+    )
@@ -2,6 +2,7 @@ import os
 import time
 import pathlib
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -16,9 +17,60 @@ class _Settings(BaseSettings):
     mysql_database: str
     mysql_host: str
     mysql_port: int
+    mysql_echo: bool = False
+    mysql_pool_size: int = 5
+    mysql_max_overflow: int = 10
+    mysql_pool_timeout: float = 30
+    mysql_pool_recycle: int = 1800
+    mysql_pool_pre_ping: bool = True
+    mysql_connect_timeout: int = 10
+    price_catalog_lifetime: int = 300
+    catalog_cache_lifetime: int = 3600
+    reference_cache_max_size: int = 1024
+    reference_cache_lifetime: int = 300
+    page_cache_lifetime: int = 3600
+    page_cache_sizes: dict[str, int] = {
+        "specialties.html": 4,
+        "specialty_detail.html": 64,
+        "doctor_detail.html": 256,
+        "lab_tests.html": 4
+    }
+    booking_form_payload: Literal["lazy", "compact"] = "lazy"
+    compression_encodings: list[str] = ["br", "gzip"]
+    compression_minimum_size: int = 1024
+    compression_content_types: list[str] = [
+        "text/html",
+        "text/css",
+        "text/javascript",
+        "application/javascript",
+        "application/json"
+    ]
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5
+    otp_hash_algorithm: Literal["hmac-sha256", "pbkdf2-sha256"] = (
+        "hmac-sha256"
+    )
+    otp_pepper: str
+    otp_pbkdf2_iterations: int = 100000
+    otp_hash_workers: int = 0
+    token_cache_max_size: int = 10000
+    jwt_keyring: Literal["redis", "settings"] = "redis"
+    jwt_keys: dict[str, str] = {}
+    jwt_active_kid: str | None = None
+    jwt_key_rotation_interval: int = 86400
+    jwt_key_retention: int = 604800
+    jwt_keyring_refresh_interval: int = 60
     redis_password: str
     redis_host: str
     redis_port: int
+    redis_max_connections: int = 50
+    redis_pool_timeout: float = 5
+    redis_socket_timeout: float = 2
+    redis_socket_connect_timeout: float = 2
+    redis_health_check_interval: int = 30
+    redis_retries: int = 3
+    redis_retry_backoff_base: float = 0.05
+    redis_retry_backoff_cap: float = 1
     fastapi_host: str
     fastapi_port: int
 
@@ -1,11 +1,26 @@
-from decimal import Decimal
+from collections.abc import Collection
+from datetime import date, time
 
+from sqlalchemy import Numeric, and_, bindparam, func, or_, type_coerce
 from sqlmodel import Session, Sequence, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from model.appointment_models import AppointmentOuter
-from service.service_services import PriceCalculator, ServiceDataConstructor
-from data.base_data import BaseCRUD
-from data.sql_models import Patient, Appointment, Doctor, Service
+from model.appointment_models import (
+    AppointmentCursor,
+    AppointmentOuter,
+    AppointmentPage
+)
+from data.base_data import AsyncBaseCRUD, BaseCRUD, FieldDefault
+from data.sql_models import (
+    Patient,
+    Appointment,
+    Doctor,
+    DoctorToService,
+    Service,
+    ServiceToAppointment,
+    ServiceType,
+    Status
+)
 
 
 class AppointmentCRUD(BaseCRUD):
@@ -34,45 +49,232 @@ class AppointmentCRUD(BaseCRUD):
         return patient_model
 
     def get_all_by_doctor(self, doctor_id: int) -> Sequence[Appointment]:
-        statement = self.select.where(self.sql_model.doctor_id == doctor_id)
-        result = self.session.exec(statement)
+        result = self.session.exec(
+            self._select_by("doctor_id"), params={"doctor_id": doctor_id}
+        )
         appointments = result.all()
         return appointments
 
+    def get_pending_times(
+            self, doctor_id: int, start: date, end: date
+    ) -> set[tuple[date, time]]:
+        """
+        Dates and times of the doctor's pending appointments in [start, end).
+        Served by the (doctor_id, date, status) index
+        """
+        statement = self._prepare("pending_times", self._select_pending_times)
+        result = self.session.exec(
+            statement,
+            params={"doctor_id": doctor_id, "start": start, "end": end}
+        )
+        pending_times = set(result.all())
+        return pending_times
+
+    def get_pending_times_by_doctors(
+            self, doctor_ids: Collection[int], start: date, end: date
+    ) -> dict[int, set[tuple[date, time]]]:
+        """'get_pending_times()' of several doctors in a single query"""
+        statement = self._prepare(
+            "pending_times_by_doctors", self._select_pending_times_by_doctors
+        )
+        result = self.session.exec(
+            statement,
+            params={"doctor_ids": list(doctor_ids), "start": start, "end": end}
+        )
+        pending_times = {doctor_id: set() for doctor_id in doctor_ids}
+        for doctor_id, appointment_date, appointment_time in result:
+            pending_times[doctor_id].add((appointment_date, appointment_time))
+        return pending_times
+
+    def _select_pending_times_by_doctors(self):
+        statement = select(
+            self.sql_model.doctor_id, self.sql_model.date, self.sql_model.time
+        ).where(
+            self.sql_model.doctor_id.in_(
+                bindparam("doctor_ids", expanding=True)
+            ),
+            self.sql_model.date >= bindparam("start"),
+            self.sql_model.date < bindparam("end"),
+            self.sql_model.status == Status.PENDING
+        )
+        return statement
+
+    def _select_pending_times(self):
+        statement = select(self.sql_model.date, self.sql_model.time).where(
+            self.sql_model.doctor_id == bindparam("doctor_id"),
+            self.sql_model.date >= bindparam("start"),
+            self.sql_model.date < bindparam("end"),
+            self.sql_model.status == Status.PENDING
+        )
+        return statement
 
-class AppointmentDataConverter:
-    """
-    A set of utilites for conversion sqlmodel 'Appointment' to appointment
-    pydantic models
-    """
-    def __init__(self, appointment: Appointment) -> None:
-        self.appointment = appointment
-        self.service_constructor = ServiceDataConstructor(appointment.doctor)
+    def get_all_outer_by_patient(
+            self, patient_id: bytes, status: str | None = None
+    ) -> list[AppointmentOuter]:
+        """
+        Patient's appointments with doctors' names and prices summed up by
+        the database in a single query
+        """
+        params = {"patient_id": patient_id}
+        if status is None:
+            statement = self._select_outer()
+        else:
+            statement = self._select_outer_by("status")
+            params["status"] = status
+        result = self.session.exec(statement, params=params)
+        appointments = self._convert_outer(result)
+        return appointments
 
-    def to_outer(self) -> AppointmentOuter:
+    def get_outer_by_patient(
+            self, id: int, patient_id: bytes
+    ) -> AppointmentOuter:
+        """
+        A single appointment of the patient with the doctor's name and the
+        price. Raises 'NoResultFound' for appointments of other patients
+        """
+        row = self.session.exec(
+            self._select_outer_by("id"),
+            params={"patient_id": patient_id, "id": id}
+        ).one()
+        appointment = self._convert_outer_row(row)
+        return appointment
+
+    def get_page_outer_by_patient(
+            self,
+            patient_id: bytes,
+            status: str,
+            limit: int,
+            cursor: AppointmentCursor | None = None
+    ) -> AppointmentPage:
+        """
+        Keyset pagination by (date, time, id), served by the
+        (patient_id, status, date) index
+        """
+        statement = self._select_outer_by("status")
+        if cursor is not None:
+            statement = statement.where(self._after(cursor))
+        result = self.session.exec(
+            statement.limit(limit + 1),
+            params={"patient_id": patient_id, "status": status}
+        )
+        appointments = self._convert_outer(result)
+        page = self._construct_page(appointments, limit)
+        return page
+
+    def _after(self, cursor: AppointmentCursor):
+        condition = or_(
+            self.sql_model.date > cursor.date,
+            and_(
+                self.sql_model.date == cursor.date,
+                or_(
+                    self.sql_model.time > cursor.time,
+                    and_(
+                        self.sql_model.time == cursor.time,
+                        self.sql_model.id > cursor.id
+                    )
+                )
+            )
+        )
+        return condition
+
+    def _construct_page(
+            self, appointments: list[AppointmentOuter], limit: int
+    ) -> AppointmentPage:
+        if len(appointments) <= limit:
+            return AppointmentPage(appointments=appointments)
+        appointments = appointments[:limit]
+        last = appointments[-1]
+        cursor = AppointmentCursor(date=last.date, time=last.time, id=last.id)
+        page = AppointmentPage(
+            appointments=appointments, next_cursor=cursor.encode()
+        )
+        return page
+
+    def _convert_outer(self, result) -> list[AppointmentOuter]:
+        appointments = [self._convert_outer_row(row) for row in result]
+        return appointments
+
+    def _convert_outer_row(self, row) -> AppointmentOuter:
+        appointment, first_name, middle_name, last_name, price = row
         outer = AppointmentOuter(
-            **self.appointment.model_dump(exclude=["patient_id"]),
-            doctor=self.appointment.doctor.full_name,
-            price=self._calculate_appointment_price()
+            **appointment.model_dump(exclude=["patient_id"]),
+            doctor=f"{first_name} {middle_name} {last_name}",
+            price=price
         )
         return outer
 
-    def _calculate_appointment_price(self) -> Decimal:
-        total_price = sum(self._get_prices())
-        return total_price
-
-    def _get_prices(self) -> list[Decimal]:
-        prices = [
-            PriceCalculator(self.appointment.doctor, service).exec()
-            for service
-            in self._get_services()
-        ]
-        return prices
-
-    def _get_services(self) -> list[Service]:
-        services = [
-            link.service
-            for link
-            in self.appointment.appointment_links
-        ]
-        return services
+    def _select_outer(self):
+        """Appointments of the patient bound to 'patient_id'"""
+        statement = self._prepare("outer", self._build_select_outer)
+        return statement
+
+    def _select_outer_by(self, column: str):
+        statement = self._prepare(
+            f"outer_by_{column}",
+            lambda: self._select_outer().where(
+                getattr(self.sql_model, column) == bindparam(column)
+            )
+        )
+        return statement
+
+    def _build_select_outer(self):
+        statement = select(
+            self.sql_model,
+            Doctor.first_name,
+            Doctor.middle_name,
+            Doctor.last_name,
+            self._sum_price()
+        ).join(
+            Doctor, self.sql_model.doctor_id == Doctor.id
+        ).outerjoin(
+            ServiceToAppointment,
+            ServiceToAppointment.appointment_id == self.sql_model.id
+        ).outerjoin(
+            Service, ServiceToAppointment.service_id == Service.id
+        ).outerjoin(
+            ServiceType, Service.type_id == ServiceType.id
+        ).outerjoin(
+            DoctorToService,
+            and_(
+                DoctorToService.doctor_id == self.sql_model.doctor_id,
+                DoctorToService.service_id == Service.id
+            )
+        ).where(
+            self.sql_model.patient_id == bindparam("patient_id")
+        ).group_by(
+            self.sql_model.id, Doctor.id
+        ).order_by(
+            self.sql_model.date, self.sql_model.time, self.sql_model.id
+        )
+        return statement
+
+    def _sum_price(self):
+        """Markups are nullable, a missing one adds nothing to the price"""
+        price = (
+            func.coalesce(ServiceType.price, 0)
+            + func.coalesce(Service.markup, 0)
+            + func.coalesce(DoctorToService.markup, 0)
+        )
+        total = type_coerce(
+            func.coalesce(func.sum(price), 0),
+            Numeric(FieldDefault.PRECISION, FieldDefault.SCALE)
+        )
+        return total
+
+
+class AsyncAppointmentCRUD(AsyncBaseCRUD):
+    def __init__(
+            self,
+            session: AsyncSession,
+            sql_model: type[Appointment] = Appointment,
+            return_model: type[Appointment] = Appointment
+    ) -> None:
+        super().__init__(session, sql_model, return_model)
+
+    async def get_all_by_doctor(self, doctor_id: int) -> Sequence[Appointment]:
+        result = await self.session.exec(
+            self._select_by("doctor_id"), params={"doctor_id": doctor_id}
+        )
+        appointments = result.all()
+        return appointments
+
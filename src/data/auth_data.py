@@ -1,28 +1,163 @@
 from redis import Redis
+from redis import asyncio as aioredis
 
 from exceptions.exc import OTPCodeNotFound
-from model.auth_models import OTPCode
-from data.connections import redis_conn
+from model.auth_models import JWTKey, OTPCode
+from data.connections import RedisConnection, redis_conn
 
 
-class OTPCodeRedis:
-    def __init__(self, conn: Redis = redis_conn, lifetime: int = 180) -> None:
-        self.conn = conn
-        self.lifetime = lifetime
-        self.prefix = "otp:"
+class OTPCodeRedisMixin:
+    prefix = "otp:"
 
-    def get(self, phone: str) -> OTPCode:
-        otp_code = self.conn.hgetall(f"{self.prefix}{phone}")
+    def _get_key(self, phone: str) -> str:
+        return f"{self.prefix}{phone}"
+
+    def _get_mapping(self, otp: OTPCode) -> dict[str, bytes | str]:
+        mapping = {
+            "salt": otp.salt, "code": otp.code, "algorithm": otp.algorithm
+        }
+        return mapping
+
+    def _convert(self, phone: str, otp_code: dict[bytes, bytes]) -> OTPCode:
         if not otp_code:
             raise OTPCodeNotFound()
         return OTPCode(
-            phone=phone, code=otp_code.get(b"code"), salt=otp_code.get(b"salt")
+            phone=phone,
+            code=otp_code.get(b"code"),
+            salt=otp_code.get(b"salt"),
+            **self._get_algorithm(otp_code)
         )
 
+    def _get_algorithm(self, otp_code: dict[bytes, bytes]) -> dict[str, str]:
+        """Codes stored without an algorithm keep the model's default"""
+        algorithm = otp_code.get(b"algorithm")
+        if algorithm is None:
+            return {}
+        return {"algorithm": algorithm.decode("utf-8")}
+
+
+class OTPCodeRedis(OTPCodeRedisMixin):
+    def __init__(
+            self,
+            conn: Redis = redis_conn,
+            lifetime: int = 180,
+            max_attempts: int = 5
+    ) -> None:
+        self.conn = conn
+        self.lifetime = lifetime
+        self.max_attempts = max_attempts
+
+    def get(self, phone: str) -> OTPCode:
+        otp_code = self.conn.hgetall(self._get_key(phone))
+        return self._convert(phone, otp_code)
+
+    def consume(self, otp: OTPCode) -> bool:
+        """
+        Deletes the code only if it is still the checked one, so a code lets
+        in a single attempt, even of several concurrent ones
+        """
+        key = self._get_key(otp.phone)
+
+        def delete_if_unchanged(pipe) -> bool:
+            if pipe.hget(key, "code") != otp.code:
+                return False
+            pipe.multi()
+            pipe.delete(key)
+            return True
+
+        is_consumed = self.conn.transaction(
+            delete_if_unchanged, key, value_from_callable=True
+        )
+        return is_consumed
+
+    def fail(self, phone: str) -> None:
+        """
+        Counts a mismatched attempt. The code is deleted by the last of
+        'max_attempts', so it can't be guessed by retrying
+        """
+        key = self._get_key(phone)
+
+        def count_attempt(pipe) -> None:
+            if not pipe.exists(key):
+                return
+            attempts = int(pipe.hget(key, "attempts") or 0) + 1
+            pipe.multi()
+            if attempts < self.max_attempts:
+                pipe.hset(key, "attempts", attempts)
+            else:
+                pipe.delete(key)
+
+        self.conn.transaction(count_attempt, key)
+
     def set(self, otp: OTPCode) -> None:
-        key = f"{self.prefix}{otp.phone}"
-        self.conn.hset(key, mapping={"salt": otp.salt, "code": otp.code})
-        self.conn.expire(key, self.lifetime)
+        """
+        The code and its expiry are written in one transaction. A new code
+        replaces the previous one along with its failed attempts
+        """
+        key = self._get_key(otp.phone)
+        pipe = self.conn.pipeline(transaction=True)
+        pipe.delete(key)
+        pipe.hset(key, mapping=self._get_mapping(otp))
+        pipe.expire(key, self.lifetime)
+        pipe.execute()
 
     def delete(self, phone: str) -> None:
-        self.conn.delete(f"{self.prefix}{phone}")
+        self.conn.delete(self._get_key(phone))
+
+
+class AsyncOTPCodeRedis(OTPCodeRedisMixin):
+    """'OTPCodeRedis' for async routes, on the pooled async client"""
+    def __init__(
+            self,
+            conn: aioredis.Redis = RedisConnection.async_conn,
+            lifetime: int = 180
+    ) -> None:
+        self.conn = conn
+        self.lifetime = lifetime
+
+    async def get(self, phone: str) -> OTPCode:
+        otp_code = await self.conn.hgetall(self._get_key(phone))
+        return self._convert(phone, otp_code)
+
+    async def set(self, otp: OTPCode) -> None:
+        key = self._get_key(otp.phone)
+        async with self.conn.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=self._get_mapping(otp))
+            pipe.expire(key, self.lifetime)
+            await pipe.execute()
+
+    async def delete(self, phone: str) -> None:
+        await self.conn.delete(self._get_key(phone))
+
+
+class JWTKeyRedis:
+    """
+    The keys are stored in one hash of key ids to their JSON, so adding a
+    key is a single write
+    """
+    key = "jwt:keys"
+    rotation_key = "jwt:rotation"
+
+    def __init__(self, conn: Redis = redis_conn) -> None:
+        self.conn = conn
+
+    def get_all(self) -> list[JWTKey]:
+        keys = [
+            JWTKey.model_validate_json(value)
+            for value
+            in self.conn.hvals(self.key)
+        ]
+        return keys
+
+    def add(self, key: JWTKey) -> None:
+        self.conn.hset(self.key, key.kid, key.model_dump_json())
+
+    def delete(self, *kids: str) -> None:
+        if kids:
+            self.conn.hdel(self.key, *kids)
+
+    def lock_rotation(self, timeout: int) -> bool:
+        """Only the worker which takes the lock rotates the key"""
+        locked = self.conn.set(self.rotation_key, 1, nx=True, ex=timeout)
+        return bool(locked)
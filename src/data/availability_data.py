@@ -0,0 +1,356 @@
+from collections.abc import AsyncIterator, Collection, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date, time, timedelta
+from itertools import chain
+from uuid import uuid4
+
+from redis import Redis
+from redis import asyncio as aioredis
+from redis.exceptions import WatchError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from data.connections import RedisConnection, redis_conn
+from data.sql_models import WorkSchedule
+
+type FreeTimes = dict[str, list[str]]
+
+
+class AvailabilityRedisMixin:
+    prefix = "availability:"
+    write_timeout = int(timedelta(minutes=1).total_seconds())
+    booking_range: timedelta
+
+    @property
+    def days(self) -> list[date]:
+        today = date.today()
+        days = [
+            today + timedelta(days=offset)
+            for offset
+            in range(self.booking_range.days)
+        ]
+        return days
+
+    @property
+    def lifetime(self) -> int:
+        """Date keys outlive the booking range by a day"""
+        lifetime = int((self.booking_range + timedelta(days=1)).total_seconds())
+        return lifetime
+
+    def _queue_add(
+            self, pipe, doctor_id: int, day: date, appointment_time: time
+    ) -> None:
+        key = self._get_date_key(doctor_id, day)
+        pipe.sadd(key, appointment_time.isoformat())
+        pipe.expire(key, self.lifetime)
+        pipe.incr(self._get_version_key(doctor_id))
+
+    def _queue_remove(
+            self, pipe, doctor_id: int, day: date, appointment_time: time
+    ) -> None:
+        pipe.srem(
+            self._get_date_key(doctor_id, day), appointment_time.isoformat()
+        )
+        pipe.incr(self._get_version_key(doctor_id))
+
+    def _queue_begin_write(self, pipe, doctor_id: int, write: str) -> None:
+        writing_key = self._get_writing_key(doctor_id)
+        pipe.sadd(writing_key, write)
+        pipe.expire(writing_key, self.write_timeout)
+        pipe.incr(self._get_version_key(doctor_id))
+
+    def _queue_end_write(self, pipe, doctor_id: int, write: str) -> None:
+        pipe.srem(self._get_writing_key(doctor_id), write)
+        pipe.incr(self._get_version_key(doctor_id))
+
+    def _queue_get(self, pipe, doctor_id: int, days: list[date]) -> None:
+        pipe.scard(self._get_writing_key(doctor_id))
+        pipe.get(self._get_built_key(doctor_id))
+        for day in days:
+            pipe.smembers(self._get_date_key(doctor_id, day))
+
+    def _read(
+            self, days: list[date], results: Iterator
+    ) -> FreeTimes | None:
+        """Consumes the replies queued by '_queue_get()' for one doctor"""
+        writing, built = next(results), next(results)
+        times = [next(results) for _ in days]
+        if writing or not self._is_built(built):
+            return None
+        free_times = self._convert(days, times)
+        return free_times
+
+    def _is_built(self, built: bytes | None) -> bool:
+        return built is not None and built.decode() == date.today().isoformat()
+
+    def _is_in_range(self, day: date) -> bool:
+        days = self.days
+        return days[0] <= day <= days[-1]
+
+    def _convert(
+            self, days: list[date], times: list[Collection[bytes]]
+    ) -> FreeTimes:
+        free_times = {
+            day.isoformat(): sorted(value.decode() for value in day_times)
+            for day, day_times
+            in zip(days, times)
+            if day_times
+        }
+        return free_times
+
+    def _get_date_key(self, doctor_id: int, day: date) -> str:
+        return f"{self.prefix}{doctor_id}:{day.isoformat()}"
+
+    def _get_built_key(self, doctor_id: int) -> str:
+        return f"{self.prefix}{doctor_id}:built"
+
+    def _get_version_key(self, doctor_id: int) -> str:
+        return f"{self.prefix}{doctor_id}:version"
+
+    def _get_writing_key(self, doctor_id: int) -> str:
+        return f"{self.prefix}{doctor_id}:writing"
+
+
+class AvailabilityRedis(AvailabilityRedisMixin):
+    """
+    Free appointment times of doctors. Every (doctor, date) pair is a set of
+    ISO formatted times. The index of a doctor is valid for the day it was
+    built on, writes made in between are applied incrementally with
+    'add()' and 'remove()'. Each write bumps the doctor's version, so a
+    build started before the write won't overwrite it.
+    Database writes affecting a doctor are wrapped into 'writing()': until
+    the index is updated after the commit, lookups of the doctor miss and
+    builds aren't stored, so a committed change is never served stale
+    """
+    def __init__(
+            self,
+            conn: Redis = redis_conn,
+            booking_range: timedelta = timedelta(days=30)
+    ) -> None:
+        self.conn = conn
+        self.booking_range = booking_range
+
+    def get(self, doctor_id: int) -> FreeTimes | None:
+        """Returns 'None' if the index of the doctor isn't built for today"""
+        free_times = self.get_many([doctor_id])[doctor_id]
+        return free_times
+
+    def get_many(
+            self, doctor_ids: Collection[int]
+    ) -> dict[int, FreeTimes | None]:
+        """'get()' of several doctors in one round trip"""
+        doctor_ids, days = list(doctor_ids), self.days
+        with self.conn.pipeline(transaction=False) as pipe:
+            for doctor_id in doctor_ids:
+                self._queue_get(pipe, doctor_id, days)
+            results = iter(pipe.execute())
+        free_times = {
+            doctor_id: self._read(days, results) for doctor_id in doctor_ids
+        }
+        return free_times
+
+    def get_version(self, doctor_id: int) -> int:
+        version = self.conn.get(self._get_version_key(doctor_id))
+        return int(version or 0)
+
+    def get_versions(self, doctor_ids: Collection[int]) -> dict[int, int]:
+        doctor_ids = list(doctor_ids)
+        versions = self.conn.mget(
+            [self._get_version_key(doctor_id) for doctor_id in doctor_ids]
+        )
+        return {
+            doctor_id: int(version or 0)
+            for doctor_id, version
+            in zip(doctor_ids, versions)
+        }
+
+    def set(self, doctor_id: int, free_times: FreeTimes, version: int) -> bool:
+        """
+        Stores a freshly built index. Nothing is stored if the doctor's
+        version differs from the one read before the build
+        """
+        version_key = self._get_version_key(doctor_id)
+        writing_key = self._get_writing_key(doctor_id)
+        with self.conn.pipeline() as pipe:
+            try:
+                pipe.watch(version_key, writing_key)
+                if int(pipe.get(version_key) or 0) != version:
+                    return False
+                if pipe.scard(writing_key):
+                    return False
+                pipe.multi()
+                self._rewrite(pipe, doctor_id, free_times)
+                pipe.execute()
+            except WatchError:
+                return False
+        return True
+
+    def add(self, doctor_id: int, day: date, appointment_time: time) -> None:
+        """Frees the time of a cancelled or rescheduled appointment"""
+        if not self._is_in_range(day):
+            self._bump_version(doctor_id)
+            return
+        with self.conn.pipeline() as pipe:
+            self._queue_add(pipe, doctor_id, day, appointment_time)
+            pipe.execute()
+
+    def remove(self, doctor_id: int, day: date, appointment_time: time) -> None:
+        """Takes the time of a booked appointment"""
+        with self.conn.pipeline() as pipe:
+            self._queue_remove(pipe, doctor_id, day, appointment_time)
+            pipe.execute()
+
+    def delete(self, doctor_id: int) -> None:
+        """Forces the index of the doctor to be rebuilt on the next lookup"""
+        with self.conn.pipeline() as pipe:
+            pipe.delete(self._get_built_key(doctor_id))
+            pipe.incr(self._get_version_key(doctor_id))
+            pipe.execute()
+
+    @contextmanager
+    def writing(self, *doctor_ids: int) -> Iterator[None]:
+        """
+        Wraps a transaction affecting the doctors together with the update
+        of their indexes. A write left unfinished expires after
+        'write_timeout'
+        """
+        writes = {
+            doctor_id: self.begin_write(doctor_id) for doctor_id in doctor_ids
+        }
+        try:
+            yield
+        finally:
+            for doctor_id, write in writes.items():
+                self.end_write(doctor_id, write)
+
+    def begin_write(self, doctor_id: int) -> str:
+        """Returns the id of the write to end it with"""
+        write = uuid4().hex
+        with self.conn.pipeline() as pipe:
+            self._queue_begin_write(pipe, doctor_id, write)
+            pipe.execute()
+        return write
+
+    def end_write(self, doctor_id: int, write: str) -> None:
+        with self.conn.pipeline() as pipe:
+            self._queue_end_write(pipe, doctor_id, write)
+            pipe.execute()
+
+    def _rewrite(self, pipe, doctor_id: int, free_times: FreeTimes) -> None:
+        for day in self.days:
+            pipe.delete(self._get_date_key(doctor_id, day))
+        for day, times in free_times.items():
+            key = self._get_date_key(doctor_id, date.fromisoformat(day))
+            pipe.sadd(key, *times)
+            pipe.expire(key, self.lifetime)
+        pipe.set(
+            self._get_built_key(doctor_id),
+            date.today().isoformat(),
+            ex=int(timedelta(days=1).total_seconds())
+        )
+
+    def _bump_version(self, doctor_id: int) -> None:
+        self.conn.incr(self._get_version_key(doctor_id))
+
+
+class AsyncAvailabilityRedis(AvailabilityRedisMixin):
+    """
+    The writes of 'AvailabilityRedis' for async routes, on the pooled async
+    client. Indexes are still built by the sync one
+    """
+    def __init__(
+            self,
+            conn: aioredis.Redis = RedisConnection.async_conn,
+            booking_range: timedelta = timedelta(days=30)
+    ) -> None:
+        self.conn = conn
+        self.booking_range = booking_range
+
+    async def get_version(self, doctor_id: int) -> int:
+        version = await self.conn.get(self._get_version_key(doctor_id))
+        return int(version or 0)
+
+    async def add(
+            self, doctor_id: int, day: date, appointment_time: time
+    ) -> None:
+        if not self._is_in_range(day):
+            await self.conn.incr(self._get_version_key(doctor_id))
+            return
+        async with self.conn.pipeline() as pipe:
+            self._queue_add(pipe, doctor_id, day, appointment_time)
+            await pipe.execute()
+
+    async def remove(
+            self, doctor_id: int, day: date, appointment_time: time
+    ) -> None:
+        async with self.conn.pipeline() as pipe:
+            self._queue_remove(pipe, doctor_id, day, appointment_time)
+            await pipe.execute()
+
+    @asynccontextmanager
+    async def writing(self, *doctor_ids: int) -> AsyncIterator[None]:
+        writes = {
+            doctor_id: await self.begin_write(doctor_id)
+            for doctor_id
+            in doctor_ids
+        }
+        try:
+            yield
+        finally:
+            for doctor_id, write in writes.items():
+                await self.end_write(doctor_id, write)
+
+    async def begin_write(self, doctor_id: int) -> str:
+        write = uuid4().hex
+        async with self.conn.pipeline() as pipe:
+            self._queue_begin_write(pipe, doctor_id, write)
+            await pipe.execute()
+        return write
+
+    async def end_write(self, doctor_id: int, write: str) -> None:
+        async with self.conn.pipeline() as pipe:
+            self._queue_end_write(pipe, doctor_id, write)
+            await pipe.execute()
+
+
+class WorkScheduleChanges:
+    """
+    Rebuilds indexes of doctors whose work schedules change. The write
+    starts at the flush and ends once the transaction is over
+    """
+    info_key = "work_schedule_doctors"
+
+    @classmethod
+    def listen(cls) -> None:
+        event.listen(Session, "after_flush", cls._collect)
+        event.listen(Session, "after_commit", cls._release)
+        event.listen(Session, "after_rollback", cls._discard)
+
+    @classmethod
+    def _collect(cls, session: Session, flush_context) -> None:
+        doctor_ids = {
+            instance.doctor_id
+            for instance
+            in chain(session.new, session.dirty, session.deleted)
+            if isinstance(instance, WorkSchedule)
+        }
+        writes = session.info.setdefault(cls.info_key, {})
+        availability = AvailabilityRedis()
+        for doctor_id in doctor_ids - writes.keys():
+            writes[doctor_id] = availability.begin_write(doctor_id)
+
+    @classmethod
+    def _release(cls, session: Session) -> None:
+        availability = AvailabilityRedis()
+        for doctor_id, write in session.info.pop(cls.info_key, {}).items():
+            availability.delete(doctor_id)
+            availability.end_write(doctor_id, write)
+
+    @classmethod
+    def _discard(cls, session: Session) -> None:
+        availability = AvailabilityRedis()
+        for doctor_id, write in session.info.pop(cls.info_key, {}).items():
+            availability.end_write(doctor_id, write)
+
+
+WorkScheduleChanges.listen()
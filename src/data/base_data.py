@@ -1,7 +1,16 @@
+from collections.abc import Callable, Hashable
 from datetime import datetime
 
 from pydantic import ConfigDict, BaseModel
+from sqlalchemy import bindparam
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 from sqlmodel import SQLModel, Field, Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from data.change_data import ChangeNotifier
+from data.identity_data import IdentityMap
+from data.reference_data import ReferenceCache
 
 
 class FieldDefault:
@@ -27,7 +36,54 @@ class PersonSQLModel(BaseSQLModel):
     first_name: str | None = Field(default=None)
 
 
-class BaseCRUD:
+class Statements:
+    """
+    Statements built once per process and shared by every CRUD. Values are
+    passed as bound parameters on execution, so a statement is never
+    rebuilt, its cache key is computed once and its compiled form stays in
+    the engine's compiled cache
+    """
+    _statements: dict[Hashable, object] = {}
+
+    @classmethod
+    def get[T](cls, key: Hashable, build: Callable[[], T]) -> T:
+        statement = cls._statements.get(key)
+        if statement is None:
+            statement = cls._statements.setdefault(key, build())
+        return statement
+
+
+class StatementsMixin:
+    """Prepared statements of the CRUD's 'sql_model'"""
+    sql_model: type[BaseSQLModel]
+
+    @property
+    def select(self):
+        statement = self._prepare("select", lambda: select(self.sql_model))
+        return statement
+
+    def _select_by(self, column: str):
+        """'select' filtered by the bound parameter named after 'column'"""
+        statement = self._prepare(
+            f"select_by_{column}",
+            lambda: self.select.where(
+                getattr(self.sql_model, column) == bindparam(column)
+            )
+        )
+        return statement
+
+    def _prepare[T](self, name: str, build: Callable[[], T]) -> T:
+        statement = Statements.get((self.sql_model, name), build)
+        return statement
+
+
+class BaseCRUD(StatementsMixin):
+    """
+    Rows of the tables opted into 'ReferenceCache' are read by 'get()',
+    'get_all()' and '_get()' from the cache and merged into the session
+    without a query. Entities of the tables tracked by 'IdentityMap' are
+    looked up once per session
+    """
     def __init__(
             self,
             session: Session,
@@ -40,6 +96,7 @@ class BaseCRUD:
     def create(self, create_data: BaseModel) -> BaseModel:
         instance = self.sql_model(**create_data.model_dump())
         self._add(instance)
+        IdentityMap.add(self.session, instance)
         return self.return_model(**instance.model_dump())
 
     def get(self, id: int | bytes) -> BaseModel:
@@ -47,6 +104,8 @@ class BaseCRUD:
         return self.return_model(**entry.model_dump())
 
     def get_all(self):
+        if self._uses_cache():
+            return self._get_all_cached()
         return self.session.exec(self.select).all()
 
     def update(self, id: int | bytes, data: dict) -> BaseModel:
@@ -63,22 +122,156 @@ class BaseCRUD:
         self.session.flush()
 
     def _get(self, id: int | bytes) -> BaseSQLModel:
-        statement = self.select.where(self.sql_model.id == id)
-        entry = self.session.exec(statement)
+        entry = self._get_by("id", id, lambda: self._load(id))
+        return entry
+
+    def _get_by(
+            self,
+            column: str,
+            value: object,
+            load: Callable[[], BaseSQLModel]
+    ) -> BaseSQLModel:
+        entry = IdentityMap.get(self.session, self.table, column, value)
+        if entry is None:
+            entry = load()
+            IdentityMap.add(self.session, entry)
+        return entry
+
+    def _load(self, id: int | bytes) -> BaseSQLModel:
+        if self._uses_cache():
+            return self._get_cached(id)
+        return self._select_one(id)
+
+    def _select_one(self, id: int | bytes) -> BaseSQLModel:
+        entry = self.session.exec(self._select_by("id"), params={"id": id})
         return entry.one()
 
     @property
-    def select(self):
-        return select(self.sql_model)
+    def table(self) -> str:
+        return self.sql_model.__tablename__
+
+    def _uses_cache(self) -> bool:
+        """A session sees its own uncommitted changes of the table"""
+        changed = self.session.info.get(ChangeNotifier.info_key, ())
+        uses_cache = (
+            ReferenceCache.is_cached(self.table) and self.table not in changed
+        )
+        return uses_cache
+
+    def _get_cached(self, id: int) -> BaseSQLModel:
+        key = (self.table, id)
+        generation = ReferenceCache.get_generation()
+        values = ReferenceCache.get(key)
+        if values is not None:
+            return self._merge(values)
+        entry = self._select_one(id)
+        ReferenceCache.set(key, entry.model_dump(), generation)
+        return entry
+
+    def _get_all_cached(self) -> list[BaseSQLModel]:
+        key = (self.table, None)
+        generation = ReferenceCache.get_generation()
+        all_values = ReferenceCache.get(key)
+        if all_values is not None:
+            return [self._merge(values) for values in all_values]
+        entries = self.session.exec(self.select).all()
+        ReferenceCache.set(
+            key, [entry.model_dump() for entry in entries], generation
+        )
+        return entries
+
+    def _merge(self, values: dict) -> BaseSQLModel:
+        """Rows already in the session are returned as they are"""
+        key = identity_key(self.sql_model, values["id"])
+        entry = self.session.identity_map.get(key)
+        if entry is None:
+            instance = self.sql_model.model_validate(values)
+            make_transient_to_detached(instance)
+            entry = self.session.merge(instance, load=False)
+        return entry
 
     def _update(self, entry: BaseSQLModel, data: dict) -> BaseSQLModel:
+        IdentityMap.discard(self.session, entry)
         data["updated_at"] = datetime.now()
         for key, value in data.items():
             if hasattr(entry, key):
                 setattr(entry, key, value)
         self._add(entry)
         self.session.commit()
+        IdentityMap.add(self.session, entry)
 
     def _delete(self, entry: BaseSQLModel) -> None:
+        IdentityMap.discard(self.session, entry)
         self.session.delete(entry)
         self.session.commit()
+
+
+class AsyncBaseCRUD(StatementsMixin):
+    """
+    'BaseCRUD' counterpart working on top of 'AsyncSession'. Plain column
+    operations are native async, routines which walk relationships are run
+    by the sync CRUD inside 'AsyncSession.run_sync()', so lazy loads are
+    still executed by the async driver on the event loop
+    """
+    def __init__(
+            self,
+            session: AsyncSession,
+            sql_model: type[BaseSQLModel],
+            return_model: type[BaseModel]) -> None:
+        self.session = session
+        self.sql_model = sql_model
+        self.return_model = return_model
+
+    async def create(self, create_data: BaseModel) -> BaseModel:
+        instance = self.sql_model(**create_data.model_dump())
+        await self._add(instance)
+        return self.return_model(**instance.model_dump())
+
+    async def get(self, id: int | bytes) -> BaseModel:
+        entry = await self._get(id)
+        return self.return_model(**entry.model_dump())
+
+    async def get_all(self):
+        if ReferenceCache.is_cached(self.sql_model.__tablename__):
+            return await self.run_sync_crud(lambda crud: crud.get_all())
+        result = await self.session.exec(self.select)
+        return result.all()
+
+    async def update(self, id: int | bytes, data: dict) -> BaseModel:
+        entry = await self._get(id)
+        await self._update(entry, data)
+        return self.return_model(**entry.model_dump())
+
+    async def run_sync_crud[T](self, routine: Callable[[BaseCRUD], T]) -> T:
+        result = await self.session.run_sync(
+            lambda session: routine(self._get_sync_crud(session))
+        )
+        return result
+
+    def _get_sync_crud(self, session: Session) -> BaseCRUD:
+        return BaseCRUD(session, self.sql_model, self.return_model)
+
+    async def _add(self, instance: BaseSQLModel) -> None:
+        self.session.add(instance)
+        await self.session.flush()
+
+    async def _get(self, id: int | bytes) -> BaseSQLModel:
+        table = self.sql_model.__tablename__
+        if ReferenceCache.is_cached(table) or IdentityMap.is_tracked(table):
+            return await self.run_sync_crud(lambda crud: crud._get(id))
+        entry = await self.session.exec(
+            self._select_by("id"), params={"id": id}
+        )
+        return entry.one()
+
+    async def _update(self, entry: BaseSQLModel, data: dict) -> None:
+        data["updated_at"] = datetime.now()
+        for key, value in data.items():
+            if hasattr(entry, key):
+                setattr(entry, key, value)
+        await self._add(entry)
+        await self.session.commit()
+
+    async def _delete(self, entry: BaseSQLModel) -> None:
+        await self.session.delete(entry)
+        await self.session.commit()
@@ -0,0 +1,104 @@
+from collections.abc import Collection
+
+from redis import Redis
+from redis import asyncio as aioredis
+
+from config import Config
+from data.change_data import ChangeNotifier
+from data.connections import RedisConnection, redis_conn
+
+settings = Config.get_settings()
+
+
+class CatalogRedisMixin:
+    """
+    Serialized catalog pages. Keys carry the catalog version, so bumping it
+    on a change of any catalog table makes every page be rebuilt on the next
+    lookup, while the outdated entries expire on their own
+    """
+    tables = (
+        "specialties",
+        "specialties_to_doctors",
+        "doctors",
+        "doctors_to_services",
+        "services",
+        "services_to_specialties",
+        "services_types"
+    )
+    prefix = "catalog:"
+
+    @property
+    def version_key(self) -> str:
+        return f"{self.prefix}version"
+
+    def _get_key(self, name: str, version: int) -> str:
+        return f"{self.prefix}{version}:{name}"
+
+
+class CatalogRedis(CatalogRedisMixin):
+    def __init__(
+            self,
+            conn: Redis = redis_conn,
+            lifetime: int = settings.catalog_cache_lifetime
+    ) -> None:
+        self.conn = conn
+        self.lifetime = lifetime
+
+    def get_version(self) -> int:
+        version = self.conn.get(self.version_key)
+        return int(version or 0)
+
+    def get(self, name: str, version: int) -> bytes | None:
+        value = self.conn.get(self._get_key(name, version))
+        return value
+
+    def set(
+            self,
+            name: str,
+            version: int,
+            value: bytes,
+            lifetime: int | None = None
+    ) -> None:
+        """
+        Pages built from data read before an invalidation are stored under
+        the outdated version, so they are never served
+        """
+        self.conn.set(
+            self._get_key(name, version), value, ex=lifetime or self.lifetime
+        )
+
+    def invalidate(self, tables: Collection[str] | None = None) -> None:
+        self.conn.incr(self.version_key)
+
+
+class AsyncCatalogRedis(CatalogRedisMixin):
+    """'CatalogRedis' for async routes, on the pooled async client"""
+    def __init__(
+            self,
+            conn: aioredis.Redis = RedisConnection.async_conn,
+            lifetime: int = settings.catalog_cache_lifetime
+    ) -> None:
+        self.conn = conn
+        self.lifetime = lifetime
+
+    async def get_version(self) -> int:
+        version = await self.conn.get(self.version_key)
+        return int(version or 0)
+
+    async def get(self, name: str, version: int) -> bytes | None:
+        value = await self.conn.get(self._get_key(name, version))
+        return value
+
+    async def set(
+            self,
+            name: str,
+            version: int,
+            value: bytes,
+            lifetime: int | None = None
+    ) -> None:
+        await self.conn.set(
+            self._get_key(name, version), value, ex=lifetime or self.lifetime
+        )
+
+
+ChangeNotifier.subscribe(CatalogRedis.tables, CatalogRedis().invalidate)
@@ -0,0 +1,67 @@
+"""
+Notifications about committed changes of tables. Caches derived from the
+database subscribe to the tables they are built from and get dropped once a
+change of any of them is committed
+"""
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+type ChangeCallback = Callable[[set[str]], None]
+
+
+class ChangeNotifier:
+    info_key = "changed_tables"
+    _subscribers: dict[str, list[ChangeCallback]] = defaultdict(list)
+
+    @classmethod
+    def subscribe(
+            cls, tables: Iterable[str], callback: ChangeCallback
+    ) -> None:
+        for table in tables:
+            cls._subscribers[table].append(callback)
+
+    @classmethod
+    def notify(cls, tables: set[str]) -> None:
+        callbacks = dict.fromkeys(
+            callback
+            for table
+            in sorted(tables)
+            for callback
+            in cls._subscribers.get(table, [])
+        )
+        for callback in callbacks:
+            callback(tables)
+
+    @classmethod
+    def listen(cls) -> None:
+        """
+        Tracks flushes of every session, including the sync sessions behind
+        'AsyncSession'
+        """
+        event.listen(Session, "after_flush", cls._collect)
+        event.listen(Session, "after_commit", cls._release)
+        event.listen(Session, "after_rollback", cls._discard)
+
+    @classmethod
+    def _collect(cls, session: Session, flush_context) -> None:
+        changed = session.info.setdefault(cls.info_key, set())
+        for instance in chain(session.new, session.dirty, session.deleted):
+            changed.add(type(instance).__table__.name)
+
+    @classmethod
+    def _release(cls, session: Session) -> None:
+        changed = session.info.pop(cls.info_key, set())
+        if changed:
+            cls.notify(changed)
+
+    @classmethod
+    def _discard(cls, session: Session) -> None:
+        session.info.pop(cls.info_key, None)
+
+
+ChangeNotifier.listen()
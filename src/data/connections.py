@@ -1,27 +1,293 @@
-from redis import Redis
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator
+
+from redis import BlockingConnectionPool, Redis
+from redis import asyncio as aioredis
+from redis.asyncio.retry import Retry as AsyncRetry
+from redis.backoff import ExponentialWithJitterBackoff
+from redis.exceptions import ConnectionError
+from redis.retry import Retry
+from sqlalchemy import Engine, event
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config import Config
+from model.connection_models import (
+    PoolStatistics, RedisPoolStatistics, StatementCacheStatistics
+)
 
 settings = Config.get_settings()
 
 
+class PoolStatisticsMixin:
+    """
+    Records how long pool checkouts wait for a connection and how many of
+    them time out
+    """
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            self._record_timeout()
+            raise
+        finally:
+            self._record_wait(time.perf_counter() - started)
+
+    def _record_wait(self, waited: float) -> None:
+        with self._stats_lock:
+            self.checkouts += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+    def _record_timeout(self) -> None:
+        with self._stats_lock:
+            self.timeouts += 1
+
+    def statistics(self) -> PoolStatistics:
+        stats = PoolStatistics(
+            size=self.size(),
+            max_overflow=self._max_overflow,
+            checked_in=self.checkedin(),
+            checked_out=self.checkedout(),
+            overflow=max(self.overflow(), 0),
+            checkouts=self.checkouts,
+            timeouts=self.timeouts,
+            wait_time_total=self.wait_time_total,
+            wait_time_max=self.wait_time_max
+        )
+        return stats
+
+
+class InstrumentedQueuePool(PoolStatisticsMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(PoolStatisticsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class StatementCacheMonitor:
+    """
+    Counts executions of compiled statements by whether the compiled form
+    was found in the engine's compiled cache
+    """
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(
+            self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        if context is None or context.compiled is None:
+            return
+        with self._lock:
+            if context.cache_hit is CacheStats.CACHE_HIT:
+                self.hits += 1
+            elif context.cache_hit is CacheStats.CACHE_MISS:
+                self.misses += 1
+            else:
+                self.uncached += 1
+
+    def statistics(self) -> StatementCacheStatistics:
+        cache = self.engine._compiled_cache
+        stats = StatementCacheStatistics(
+            size=len(cache) if cache is not None else 0,
+            max_size=cache.capacity if cache is not None else 0,
+            hits=self.hits,
+            misses=self.misses,
+            uncached=self.uncached
+        )
+        return stats
+
+
+class InstrumentedAsyncRedisPool(aioredis.BlockingConnectionPool):
+    """
+    Records how long commands wait for a connection and how many of them
+    time out. The counters are only touched from the event loop, so they
+    need no lock.
+
+    Connections can't outlive the event loop they were opened in. When the
+    pool is used from a new loop, e.g. one started by 'asyncio.run' or
+    'TestClient', the connections of the previous loop are dropped
+    """
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    async def get_connection(self):
+        self._bind(asyncio.get_running_loop())
+        started = time.perf_counter()
+        try:
+            return await super().get_connection()
+        except ConnectionError as exc:
+            if isinstance(exc.__cause__, asyncio.TimeoutError):
+                self.timeouts += 1
+            raise
+        finally:
+            self._record_wait(time.perf_counter() - started)
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self.reset()
+        self._lock = asyncio.Lock()
+        self._condition = asyncio.Condition()
+
+    def _record_wait(self, waited: float) -> None:
+        self.checkouts += 1
+        self.wait_time_total += waited
+        self.wait_time_max = max(self.wait_time_max, waited)
+
+    def statistics(self) -> RedisPoolStatistics:
+        in_use = len(self._in_use_connections)
+        idle = len(self._available_connections)
+        stats = RedisPoolStatistics(
+            max_connections=self.max_connections,
+            created=in_use + idle,
+            in_use=in_use,
+            idle=idle,
+            checkouts=self.checkouts,
+            timeouts=self.timeouts,
+            wait_time_total=self.wait_time_total,
+            wait_time_max=self.wait_time_max
+        )
+        return stats
+
+
+def _get_pool_settings() -> dict:
+    pool_settings = {
+        "echo": settings.mysql_echo,
+        "pool_size": settings.mysql_pool_size,
+        "max_overflow": settings.mysql_max_overflow,
+        "pool_timeout": settings.mysql_pool_timeout,
+        "pool_recycle": settings.mysql_pool_recycle,
+        "pool_pre_ping": settings.mysql_pool_pre_ping,
+        "connect_args": {"connect_timeout": settings.mysql_connect_timeout}
+    }
+    return pool_settings
+
+
 class MySQLConnection:
     MYSQL_URL = (
         f"mysql+pymysql://{settings.mysql_user}:{settings.mysql_password}"
         f"@{settings.mysql_host}:{settings.mysql_port}/{settings.mysql_database}"
     )
-    engine = create_engine(MYSQL_URL, echo=True)
+    ASYNC_MYSQL_URL = MYSQL_URL.replace("+pymysql", "+aiomysql", 1)
+    engine = create_engine(
+        MYSQL_URL, poolclass=InstrumentedQueuePool, **_get_pool_settings()
+    )
+    async_engine = create_async_engine(
+        ASYNC_MYSQL_URL,
+        poolclass=InstrumentedAsyncQueuePool,
+        **_get_pool_settings()
+    )
+    statement_cache = StatementCacheMonitor(engine)
+    async_statement_cache = StatementCacheMonitor(async_engine.sync_engine)
 
     @classmethod
     def get_session(cls) -> Session:
         with Session(cls.engine, expire_on_commit=False) as session:
             yield session
 
+    @classmethod
+    async def get_async_session(cls) -> AsyncIterator[AsyncSession]:
+        async with AsyncSession(
+                cls.async_engine, expire_on_commit=False
+        ) as session:
+            yield session
 
-redis_conn = Redis(
-    host=settings.redis_host,
-    password=settings.redis_password,
-    port=settings.redis_port,
-    decode_responses=False
-)
+    @classmethod
+    def get_pool_statistics(cls) -> PoolStatistics:
+        return cls.engine.pool.statistics()
+
+    @classmethod
+    def get_async_pool_statistics(cls) -> PoolStatistics:
+        return cls.async_engine.pool.statistics()
+
+    @classmethod
+    def get_statement_cache_statistics(cls) -> StatementCacheStatistics:
+        return cls.statement_cache.statistics()
+
+    @classmethod
+    def get_async_statement_cache_statistics(
+            cls
+    ) -> StatementCacheStatistics:
+        return cls.async_statement_cache.statistics()
+
+
+def _get_redis_pool_settings() -> dict:
+    pool_settings = {
+        "host": settings.redis_host,
+        "password": settings.redis_password,
+        "port": settings.redis_port,
+        "max_connections": settings.redis_max_connections,
+        "timeout": settings.redis_pool_timeout,
+        "socket_timeout": settings.redis_socket_timeout,
+        "socket_connect_timeout": settings.redis_socket_connect_timeout,
+        "health_check_interval": settings.redis_health_check_interval,
+        "decode_responses": False
+    }
+    return pool_settings
+
+
+def _get_redis_backoff() -> ExponentialWithJitterBackoff:
+    backoff = ExponentialWithJitterBackoff(
+        cap=settings.redis_retry_backoff_cap,
+        base=settings.redis_retry_backoff_base
+    )
+    return backoff
+
+
+class RedisConnection:
+    """
+    Both clients wait up to 'redis_pool_timeout' for a free connection and
+    retry commands failed on connection errors or timeouts with exponential
+    backoff
+    """
+    conn = Redis(
+        connection_pool=BlockingConnectionPool(
+            retry=Retry(_get_redis_backoff(), settings.redis_retries),
+            **_get_redis_pool_settings()
+        )
+    )
+    async_conn = aioredis.Redis(
+        connection_pool=InstrumentedAsyncRedisPool(
+            retry=AsyncRetry(_get_redis_backoff(), settings.redis_retries),
+            **_get_redis_pool_settings()
+        )
+    )
+
+    @classmethod
+    def get_async_conn(cls) -> aioredis.Redis:
+        return cls.async_conn
+
+    @classmethod
+    def get_async_pool_statistics(cls) -> RedisPoolStatistics:
+        return cls.async_conn.connection_pool.statistics()
+
+
+redis_conn = RedisConnection.conn
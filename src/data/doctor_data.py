@@ -1,14 +1,18 @@
 from decimal import Decimal
 from typing import override
 
-from sqlmodel import Session
+from sqlalchemy import bindparam
+from sqlmodel import Session, Sequence
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from model.doctor_models import DoctorOuter, DoctorDetail
 from model.service_models import ServiceOuter
 from service.service_services import PriceCalculator
-from data.sql_models import Doctor, Service
-from data.base_data import BaseCRUD
-from data.service_data import ServiceDataConverter
+from data.sql_models import Doctor, Service, SpecialtyToDoctor
+from data.base_data import AsyncBaseCRUD, BaseCRUD
+from data.identity_data import IdentityMap
+from data.service_data import PriceCatalog, ServiceDataConverter
+from data.load_plans import DoctorLoadPlan
 
 
 class DoctorCRUD(BaseCRUD):
@@ -22,10 +26,56 @@ class DoctorCRUD(BaseCRUD):
 
     @override
     def get(self, id: int) -> DoctorDetail:
-        doctor = self._get(id)
+        doctor = self._get_with_services(id)
         doctor_detail = DoctorDataConverter(doctor=doctor).convert_to_detail()
         return doctor_detail
 
+    def get_all_by_specialty(self, specialty_id: int) -> Sequence[Doctor]:
+        statement = self._prepare("by_specialty", self._select_by_specialty)
+        doctors = self.session.exec(
+            statement, params={"specialty_id": specialty_id}
+        ).all()
+        return doctors
+
+    def _select_by_specialty(self):
+        statement = self.select.join(
+            SpecialtyToDoctor, SpecialtyToDoctor.doctor_id == self.sql_model.id
+        ).where(
+            SpecialtyToDoctor.specialty_id == bindparam("specialty_id")
+        ).order_by(self.sql_model.id)
+        return statement
+
+    def _get_with_services(self, id: int) -> Doctor:
+        statement = self._prepare(
+            "with_services_by_id",
+            lambda: self._select_by("id").options(
+                *DoctorLoadPlan.service_options()
+            )
+        )
+        entry = self.session.exec(statement, params={"id": id}).one()
+        IdentityMap.add(self.session, entry)
+        return entry
+
+
+class AsyncDoctorCRUD(AsyncBaseCRUD):
+    def __init__(
+            self,
+            session: AsyncSession,
+            sql_model: type[Doctor] = Doctor,
+            return_model: type[DoctorDetail] = DoctorDetail
+    ) -> None:
+        super().__init__(session, sql_model, return_model)
+
+    @override
+    async def get(self, id: int) -> DoctorDetail:
+        await PriceCatalog.preload()
+        doctor_detail = await self.run_sync_crud(lambda crud: crud.get(id))
+        return doctor_detail
+
+    @override
+    def _get_sync_crud(self, session: Session) -> DoctorCRUD:
+        return DoctorCRUD(session)
+
 
 class DoctorDataConverter:
     def __init__(
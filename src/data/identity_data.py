@@ -0,0 +1,62 @@
+"""
+Request-scoped identity map. Entities looked up by their id or by another
+unique column are memoized in 'session.info', so every service sharing the
+request session gets them without querying again. The map lives as long as
+the session and is dropped on rollback, when the loaded entities expire
+"""
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel
+
+type IdentityKey = tuple[str, str, object]
+
+
+class IdentityMap:
+    info_key = "identity_map"
+    columns: dict[str, tuple[str, ...]] = {
+        "patients": ("id", "phone"),
+        "doctors": ("id",)
+    }
+
+    @classmethod
+    def is_tracked(cls, table: str) -> bool:
+        return table in cls.columns
+
+    @classmethod
+    def get(
+            cls, session: Session, table: str, column: str, value: object
+    ) -> SQLModel | None:
+        entries = session.info.get(cls.info_key, {})
+        entity = entries.get((table, column, value))
+        return entity
+
+    @classmethod
+    def add(cls, session: Session, entity: SQLModel) -> None:
+        """Registers the entity under every tracked column of its table"""
+        table = type(entity).__tablename__
+        if not cls.is_tracked(table):
+            return
+        entries = session.info.setdefault(cls.info_key, {})
+        for column in cls.columns[table]:
+            entries[(table, column, getattr(entity, column))] = entity
+
+    @classmethod
+    def discard(cls, session: Session, entity: SQLModel) -> None:
+        """Is called before changing the entity, as its keys may change"""
+        entries: dict[IdentityKey, SQLModel] = session.info.get(
+            cls.info_key, {}
+        )
+        for key in [key for key, value in entries.items() if value is entity]:
+            del entries[key]
+
+    @classmethod
+    def listen(cls) -> None:
+        event.listen(Session, "after_rollback", cls._clear)
+
+    @classmethod
+    def _clear(cls, session: Session) -> None:
+        session.info.pop(cls.info_key, None)
+
+
+IdentityMap.listen()
@@ -0,0 +1,85 @@
+"""
+Loader plans for relationship trees walked by data constructors. Every plan is
+a set of 'selectinload' options, so the number of emitted queries depends on
+the depth of the tree and not on the number of rows in it
+"""
+
+from sqlalchemy.orm import Load, selectinload
+from sqlmodel import Session, Sequence, select
+
+from data.sql_models import Doctor, Service, Specialty
+
+
+class ServiceLoadPlan:
+    @classmethod
+    def options(cls) -> list[Load]:
+        """Relationships walked by 'ServiceDataConstructor'"""
+        options = [
+            selectinload(Service.type),
+            selectinload(Service.service_links)
+        ]
+        return options
+
+
+class DoctorLoadPlan:
+    @classmethod
+    def options(cls) -> list[Load]:
+        """Relationships walked by 'DoctorDataConstructor'"""
+        options = cls.service_options() + cls.schedule_options()
+        return options
+
+    @classmethod
+    def service_options(cls) -> list[Load]:
+        options = [
+            selectinload(Doctor.services).options(*ServiceLoadPlan.options())
+        ]
+        return options
+
+    @classmethod
+    def schedule_options(cls) -> list[Load]:
+        """Work days the missing availability indexes are built from"""
+        options = [selectinload(Doctor.work_days)]
+        return options
+
+
+class SpecialtyLoadPlan:
+    @classmethod
+    def options(cls) -> list[Load]:
+        """Relationships walked by 'SpecialtyDataConstructor'"""
+        options = [
+            selectinload(Specialty.doctors).options(*DoctorLoadPlan.options())
+        ]
+        return options
+
+    @classmethod
+    def catalog_options(cls) -> list[Load]:
+        """Relationships walked by 'SpecialtyDataConverter'"""
+        options = [
+            selectinload(Specialty.doctors).options(
+                *DoctorLoadPlan.service_options()
+            )
+        ]
+        return options
+
+
+class BookingFormLoadPlan:
+    """
+    Fetches the whole tree used by 'AppointmentBookingFormDataConstructor':
+    specialties -> doctors -> services -> service types and markups, plus
+    doctors' work days. Free times come from the availability index, so
+    appointments aren't loaded
+    """
+    def __init__(
+            self, session: Session, options: list[Load] | None = None
+    ) -> None:
+        self.session = session
+        self.options = options or SpecialtyLoadPlan.options()
+
+    @property
+    def select(self):
+        statement = select(Specialty).options(*self.options)
+        return statement
+
+    def exec(self) -> Sequence[Specialty]:
+        specialties = self.session.exec(self.select).all()
+        return specialties
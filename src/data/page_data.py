@@ -0,0 +1,53 @@
+import time
+
+from redis import asyncio as aioredis
+
+from config import Config
+from data.connections import RedisConnection
+
+settings = Config.get_settings()
+
+
+class AsyncPageRedis:
+    """
+    Rendered HTML pages shared between workers, on the pooled async client.
+    Keys already carry the version of the data a page is built from, so
+    entries are never overwritten and just expire. Keys of every template
+    are also kept in a sorted set by the time they were stored, so the
+    oldest pages are evicted once the template has more of them than its
+    size
+    """
+    prefix = "page:"
+
+    def __init__(
+            self,
+            conn: aioredis.Redis = RedisConnection.async_conn,
+            lifetime: int = settings.page_cache_lifetime
+    ) -> None:
+        self.conn = conn
+        self.lifetime = lifetime
+
+    async def get(self, key: str) -> bytes | None:
+        page = await self.conn.get(f"{self.prefix}{key}")
+        return page
+
+    async def set(self, name: str, key: str, page: bytes, size: int) -> None:
+        index_key = self._get_index_key(name)
+        async with self.conn.pipeline() as pipe:
+            pipe.set(f"{self.prefix}{key}", page, ex=self.lifetime)
+            pipe.zadd(index_key, {key: time.time()})
+            pipe.expire(index_key, self.lifetime)
+            pipe.zcard(index_key)
+            *_, count = await pipe.execute()
+        if count > size:
+            await self._evict(index_key, count - size)
+
+    async def _evict(self, index_key: str, count: int) -> None:
+        evicted = await self.conn.zpopmin(index_key, count)
+        if evicted:
+            await self.conn.delete(
+                *(f"{self.prefix}{key.decode()}" for key, _ in evicted)
+            )
+
+    def _get_index_key(self, name: str) -> str:
+        return f"{self.prefix}index:{name}"
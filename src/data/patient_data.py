@@ -1,16 +1,16 @@
 from typing import override
 from uuid import UUID
 
-from sqlmodel import Session, Sequence
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from logger.setup import get_logger
 from model.patient_models import (
     PatientInner, PatientOuter, PatientWithAppointments
 )
-from model.appointment_models import AppointmentOuter
-from data.base_data import BaseCRUD
-from data.sql_models import Patient, Appointment
-from data.appointment_data import AppointmentDataConverter
+from data.base_data import AsyncBaseCRUD, BaseCRUD
+from data.sql_models import Patient
+from data.appointment_data import AppointmentCRUD
 
 
 class PatientCRUD(BaseCRUD):  # TODO: split conversion methods into separate class
@@ -24,7 +24,7 @@ class PatientCRUD(BaseCRUD):  # TODO: split conversion methods into separate cla
         super().__init__(session, sql_model, return_model)
 
     def get(self, patient_id: str) -> PatientOuter:
-        patient = super().get(self.uuid_to_bytes(patient_id))
+        patient = self._get(self.uuid_to_bytes(patient_id))
         return self.convert_to_patient_outer(patient)
 
     def get_by_phone(self, phone: str) -> PatientOuter:
@@ -61,10 +61,11 @@ class PatientCRUD(BaseCRUD):  # TODO: split conversion methods into separate cla
     def uuid_to_bytes(cls, id: str) -> bytes:
         return UUID(id).bytes
 
-    def _get_by_phone(self, phone: str) -> Patient:  # FIX:
-        return self.session.exec(
-            self.select.where(self.sql_model.phone == phone)
-        ).one()
+    def _get_by_phone(self, phone: str) -> Patient:
+        patient = self._get_by("phone", phone, lambda: self.session.exec(
+            self._select_by("phone"), params={"phone": phone}
+        ).one())
+        return patient
 
     @classmethod
     def convert_to_patient_inner(cls, patient: PatientOuter) -> PatientInner:
@@ -83,18 +84,51 @@ class PatientCRUD(BaseCRUD):  # TODO: split conversion methods into separate cla
             self, patient: Patient
     ) -> PatientWithAppointments:
         patient_outer = self.convert_to_patient_outer(patient)
-        appointments = self._convert_appointments(patient.appointments)
+        appointments = AppointmentCRUD(self.session).get_all_outer_by_patient(
+            patient.id
+        )
         patient_with_appointments = PatientWithAppointments(
             **patient_outer.model_dump(), appointments=appointments
         )
         return patient_with_appointments
 
-    def _convert_appointments(
-            self, appointments: Sequence[Appointment]
-    ) -> list[AppointmentOuter]:
-        converted_appointments = [
-            AppointmentDataConverter(appointment).to_outer()
-            for appointment
-            in appointments
-        ]
-        return converted_appointments
+
+class AsyncPatientCRUD(AsyncBaseCRUD):
+    @override
+    def __init__(
+            self,
+            session: AsyncSession,
+            sql_model=Patient,
+            return_model=PatientInner
+    ) -> None:
+        super().__init__(session, sql_model, return_model)
+
+    @override
+    async def get(self, patient_id: str) -> PatientOuter:
+        patient = await self.run_sync_crud(lambda crud: crud.get(patient_id))
+        return patient
+
+    async def get_by_phone(self, phone: str) -> PatientOuter:
+        patient = await self.run_sync_crud(
+            lambda crud: crud.get_by_phone(phone)
+        )
+        return patient
+
+    async def get_with_appointments(
+            self, patient_id: str
+    ) -> PatientWithAppointments:
+        patient_with_appointments = await self.run_sync_crud(
+            lambda crud: crud.get_with_appointments(patient_id)
+        )
+        return patient_with_appointments
+
+    @override
+    async def update(self, patient_id: str, data: dict) -> PatientOuter:
+        patient = await self.run_sync_crud(
+            lambda crud: crud.update(patient_id, data)
+        )
+        return patient
+
+    @override
+    def _get_sync_crud(self, session: Session) -> PatientCRUD:
+        return PatientCRUD(session)
@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Collection
+from typing import Any
+
+from config import Config
+from model.cache_models import CacheStatistics
+from data.change_data import ChangeNotifier
+
+settings = Config.get_settings()
+
+type CacheKey = tuple[str, int | None]
+
+
+class ReferenceCache:
+    """
+    Per-worker cache of reference rows, bounded by size with LRU eviction and
+    by lifetime. Values are column values of rows, keyed by (table, id), or
+    lists of them for whole tables, keyed by (table, None). Entries of a table
+    are dropped when a change of it is committed. The lifetime covers changes
+    made by other processes
+    """
+    tables = ("specialties", "services_types", "services", "doctors")
+    max_size = settings.reference_cache_max_size
+    lifetime = settings.reference_cache_lifetime
+    hits = 0
+    misses = 0
+    evictions = 0
+    _entries: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict()
+    _generation = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def is_cached(cls, table: str) -> bool:
+        return table in cls.tables
+
+    @classmethod
+    def get_generation(cls) -> int:
+        return cls._generation
+
+    @classmethod
+    def get(cls, key: CacheKey) -> Any | None:
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is None or cls._is_expired(entry[0]):
+                cls._entries.pop(key, None)
+                cls.misses += 1
+                return None
+            cls._entries.move_to_end(key)
+            cls.hits += 1
+            return entry[1]
+
+    @classmethod
+    def set(cls, key: CacheKey, value: Any, generation: int) -> None:
+        """
+        Values loaded while the cache was invalidated are not kept, as they
+        may predate the change
+        """
+        with cls._lock:
+            if generation != cls._generation:
+                return
+            cls._entries[key] = (time.monotonic(), value)
+            cls._entries.move_to_end(key)
+            cls._evict()
+
+    @classmethod
+    def invalidate(cls, tables: Collection[str] | None = None) -> None:
+        with cls._lock:
+            for key in list(cls._entries):
+                if tables is None or key[0] in tables:
+                    del cls._entries[key]
+            cls._generation += 1
+
+    @classmethod
+    def statistics(cls) -> CacheStatistics:
+        with cls._lock:
+            statistics = CacheStatistics(
+                size=len(cls._entries),
+                max_size=cls.max_size,
+                hits=cls.hits,
+                misses=cls.misses,
+                evictions=cls.evictions
+            )
+        return statistics
+
+    @classmethod
+    def _evict(cls) -> None:
+        while len(cls._entries) > cls.max_size:
+            cls._entries.popitem(last=False)
+            cls.evictions += 1
+
+    @classmethod
+    def _is_expired(cls, loaded_at: float) -> bool:
+        return time.monotonic() - loaded_at > cls.lifetime
+
+
+ChangeNotifier.subscribe(ReferenceCache.tables, ReferenceCache.invalidate)
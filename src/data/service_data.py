@@ -1,10 +1,23 @@
+import asyncio
+import threading
+import time
 from decimal import Decimal
+from typing import override
 
-from sqlmodel import Session
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from config import Config
 from model.service_models import ServiceOuter
-from data.base_data import BaseCRUD
-from data.sql_models import Service, Doctor
+from data.connections import MySQLConnection
+from data.base_data import AsyncBaseCRUD, BaseCRUD
+from data.change_data import ChangeNotifier
+from data.sql_models import DoctorToService, Service, ServiceType, Doctor
+
+type Prices = dict[tuple[int, int], Decimal]
+
+settings = Config.get_settings()
 
 
 class ServiceCRUD(BaseCRUD):
@@ -17,7 +30,11 @@ class ServiceCRUD(BaseCRUD):
         super().__init__(session, sql_model, return_model)
 
     def get_lab_tests(self) -> list[ServiceOuter]:
-        all_services = self.get_all()
+        statement = self._prepare(
+            "with_type",
+            lambda: self.select.options(selectinload(self.sql_model.type))
+        )
+        all_services = self.session.exec(statement).all()
         lab_tests = [
             ServiceOuter(title=service.title, price=service.price)
             for service
@@ -27,6 +44,26 @@ class ServiceCRUD(BaseCRUD):
         return lab_tests
 
 
+class AsyncServiceCRUD(AsyncBaseCRUD):
+    def __init__(
+        self,
+        session: AsyncSession,
+        sql_model: type[Service] = Service,
+        return_model: type[ServiceOuter] = ServiceOuter
+    ) -> None:
+        super().__init__(session, sql_model, return_model)
+
+    async def get_lab_tests(self) -> list[ServiceOuter]:
+        lab_tests = await self.run_sync_crud(
+            lambda crud: crud.get_lab_tests()
+        )
+        return lab_tests
+
+    @override
+    def _get_sync_crud(self, session: Session) -> ServiceCRUD:
+        return ServiceCRUD(session)
+
+
 class ServiceDataConverter:
     def __init__(self, doctor: Doctor, service: Service) -> None:
         self.service = service
@@ -55,12 +92,102 @@ class PriceCalculator:
         self.service = service
 
     def exec(self) -> Decimal:
-        doctor_markup = self._get_doctor_to_service_markup()
-        price = self.service.price + doctor_markup
+        price = PriceCatalog.get(self.doctor.id, self.service.id)
         return price
 
-    def _get_doctor_to_service_markup(self) -> Decimal:
-        for link in self.service.service_links:
-            if (link.doctor_id == self.doctor.id) and \
-                    (link.service_id == self.service.id):
-                return link.markup
+
+class PriceCatalog:
+    """
+    Prices of every (doctor, service) pair: service type price, service
+    markup and doctor's markup. Loaded at once and dropped when a change of
+    any of the source tables is committed. The lifetime covers changes made
+    by other processes
+    """
+    tables = (
+        ServiceType.__tablename__,
+        Service.__tablename__,
+        DoctorToService.__tablename__
+    )
+    lifetime = settings.price_catalog_lifetime
+    _prices: Prices | None = None
+    _loaded_at = 0.0
+    _generation = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, doctor_id: int, service_id: int) -> Decimal:
+        """
+        A pair missing from the catalog may have been added by another
+        process after the load, so the catalog is reloaded once for it
+        """
+        key = (doctor_id, service_id)
+        prices = cls._get_prices()
+        if key not in prices:
+            prices = cls._load()
+        return prices[key]
+
+    @classmethod
+    async def preload(cls) -> None:
+        """
+        Async callers read the catalog inside 'AsyncSession.run_sync()', on
+        the event loop, so a missing catalog is loaded in a thread beforehand
+        """
+        if cls._prices is None or cls._is_expired():
+            await asyncio.to_thread(cls._get_prices)
+
+    @classmethod
+    def invalidate(cls, tables: set[str] | None = None) -> None:
+        with cls._lock:
+            cls._prices = None
+            cls._generation += 1
+
+    @classmethod
+    def _get_prices(cls) -> Prices:
+        prices = cls._prices
+        if prices is None or cls._is_expired():
+            prices = cls._load()
+        return prices
+
+    @classmethod
+    def _is_expired(cls) -> bool:
+        return time.monotonic() - cls._loaded_at > cls.lifetime
+
+    @classmethod
+    def _load(cls) -> Prices:
+        """
+        Prices loaded while the catalog was invalidated are returned, but not
+        kept, as they may predate the change
+        """
+        generation = cls._generation
+        with Session(MySQLConnection.engine) as session:
+            prices = cls._select_prices(session)
+        with cls._lock:
+            if generation == cls._generation:
+                cls._prices = prices
+                cls._loaded_at = time.monotonic()
+        return prices
+
+    @classmethod
+    def _select_prices(cls, session: Session) -> Prices:
+        statement = select(
+            DoctorToService.doctor_id,
+            DoctorToService.service_id,
+            ServiceType.price,
+            Service.markup,
+            DoctorToService.markup
+        ).join(
+            Service, DoctorToService.service_id == Service.id
+        ).join(
+            ServiceType, Service.type_id == ServiceType.id
+        )
+        prices = {
+            (doctor_id, service_id): sum(
+                (price or 0 for price in price_parts), Decimal(0)
+            )
+            for doctor_id, service_id, *price_parts
+            in session.exec(statement)
+        }
+        return prices
+
+
+ChangeNotifier.subscribe(PriceCatalog.tables, PriceCatalog.invalidate)
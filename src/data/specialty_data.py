@@ -1,10 +1,15 @@
+from typing import override
+
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from model.specialty_models import SpecialtyOuter
 from model.doctor_models import DoctorOuter
-from data.base_data import BaseCRUD
+from data.base_data import AsyncBaseCRUD, BaseCRUD
 from data.sql_models import Specialty
+from data.load_plans import SpecialtyLoadPlan
 from data.doctor_data import DoctorDataConverter
+from data.service_data import PriceCatalog
 
 
 class SpecialtyCRUD(BaseCRUD):
@@ -22,8 +27,13 @@ class SpecialtyCRUD(BaseCRUD):
         return specialty_outer
 
     def _get_by_title(self, title: str) -> Specialty:
-        statement = self.select.where(self.sql_model.title == title)
-        entry = self.session.exec(statement).one()
+        statement = self._prepare(
+            "catalog_by_title",
+            lambda: self._select_by("title").options(
+                *SpecialtyLoadPlan.catalog_options()
+            )
+        )
+        entry = self.session.exec(statement, params={"title": title}).one()
         return entry
 
 
@@ -45,3 +55,24 @@ class SpecialtyDataConverter:
         doctor_data_converter = DoctorDataConverter(self.specialty.doctors)
         doctors_outer = doctor_data_converter.convert_multiple_doctors_to_outer()
         return doctors_outer
+
+
+class AsyncSpecialtyCRUD(AsyncBaseCRUD):
+    def __init__(
+            self,
+            session: AsyncSession,
+            sql_model: type[Specialty] = Specialty,
+            return_model: type[SpecialtyOuter] = SpecialtyOuter
+    ) -> None:
+        super().__init__(session, sql_model, return_model)
+
+    async def get_by_title(self, title: str) -> SpecialtyOuter:
+        await PriceCatalog.preload()
+        specialty_outer = await self.run_sync_crud(
+            lambda crud: crud.get_by_title(title)
+        )
+        return specialty_outer
+
+    @override
+    def _get_sync_crud(self, session: Session) -> SpecialtyCRUD:
+        return SpecialtyCRUD(session)
@@ -74,7 +74,9 @@ CREATE TABLE appointments (
     ON UPDATE CASCADE,
   FOREIGN KEY (patient_id) REFERENCES patients(id) 
     ON DELETE CASCADE 
-    ON UPDATE CASCADE
+    ON UPDATE CASCADE,
+  INDEX(doctor_id, date, status),
+  INDEX(patient_id, status, date)
 ) ENGINE = InnoDB;
 
 CREATE TABLE specialties (
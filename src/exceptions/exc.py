@@ -35,6 +35,18 @@ class AccessTokenExpired(HTTPException):
         )
 
 
+class InvalidCursor(HTTPException):
+    def __init__(self, detail: str = "Invalid page cursor"):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=detail
+        )
+
+
 class AppointmentNotFound(HTTPException):
     def __init__(self, detail: str = "Appointment not found"):
         super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+class DoctorNotFound(HTTPException):
+    def __init__(self, detail: str = "Doctor not found"):
+        super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
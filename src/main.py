@@ -1,13 +1,14 @@
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
 
 from config import Config
 from exceptions import exc, handlers
+from web.compression import CompressionMiddleware, PrecompressedStaticFiles
 from web import (
     appointment_routes,
     auth_routes,
     doctor_routes,
+    health_routes,
     index_routes,
     patient_routes,
     service_routes,
@@ -15,16 +16,34 @@ from web import (
 )
 
 Config.setup()
+settings = Config.get_settings()
 
 app = FastAPI()
 
-app.mount("/static", StaticFiles(directory=Config.static_dir), name="static")
+app.add_middleware(
+    CompressionMiddleware,
+    encodings=settings.compression_encodings,
+    minimum_size=settings.compression_minimum_size,
+    content_types=settings.compression_content_types,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality
+)
+
+app.mount(
+    "/static",
+    PrecompressedStaticFiles(
+        directory=Config.static_dir,
+        encodings=settings.compression_encodings
+    ),
+    name="static"
+)
 
 app.include_router(appointment_routes.router)
 app.include_router(auth_routes.login_router)
 app.include_router(auth_routes.verify_code_router)
 app.include_router(auth_routes.refresh_router)
 app.include_router(doctor_routes.router)
+app.include_router(health_routes.router)
 app.include_router(index_routes.router)
 app.include_router(patient_routes.patient_appointments_router)
 app.include_router(patient_routes.patient_info_router)
@@ -1,9 +1,12 @@
+import base64
+import binascii
 from datetime import date, time
 from decimal import Decimal
 from typing import Literal
 
-from pydantic import Field
+from pydantic import Field, ValidationError
 
+from exceptions.exc import InvalidCursor
 from model.base_models import AbstractModel
 from data.base_data import FieldDefault
 
@@ -39,6 +42,27 @@ class AppointmentOuter(AppointmentBaseOuter):
     )
 
 
+class AppointmentCursor(AppointmentDateTime):
+    """Position of the last appointment on a page"""
+    id: int
+
+    def encode(self) -> str:
+        encoded = base64.urlsafe_b64encode(self.model_dump_json().encode())
+        return encoded.decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "AppointmentCursor":
+        try:
+            return cls.model_validate_json(base64.urlsafe_b64decode(cursor))
+        except (binascii.Error, ValueError, ValidationError):
+            raise InvalidCursor()
+
+
+class AppointmentPage(AbstractModel):
+    appointments: list[AppointmentOuter]
+    next_cursor: str | None = None
+
+
 class ServiceToAppointment(AbstractModel):
     appointment_id: int
     service_id: int
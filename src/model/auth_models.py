@@ -1,6 +1,15 @@
+from pydantic import BaseModel
+
 from model.patient_models import Phone
 
 
 class OTPCode(Phone):
     code: bytes
     salt: bytes
+    algorithm: str = "pbkdf2-sha256:100000"
+
+
+class JWTKey(BaseModel):
+    kid: str
+    secret: str
+    created_at: float = 0
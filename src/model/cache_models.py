@@ -0,0 +1,17 @@
+from pydantic import BaseModel, computed_field
+
+
+class CacheStatistics(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+
+    @computed_field
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        if not lookups:
+            return 0.0
+        return self.hits / lookups
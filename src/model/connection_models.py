@@ -0,0 +1,54 @@
+from pydantic import BaseModel, computed_field
+
+
+class PoolStatistics(BaseModel):
+    size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_time_total: float
+    wait_time_max: float
+
+    @computed_field
+    @property
+    def wait_time_avg(self) -> float:
+        if not self.checkouts:
+            return 0.0
+        return self.wait_time_total / self.checkouts
+
+
+class RedisPoolStatistics(BaseModel):
+    max_connections: int
+    created: int
+    in_use: int
+    idle: int
+    checkouts: int
+    timeouts: int
+    wait_time_total: float
+    wait_time_max: float
+
+    @computed_field
+    @property
+    def wait_time_avg(self) -> float:
+        if not self.checkouts:
+            return 0.0
+        return self.wait_time_total / self.checkouts
+
+
+class StatementCacheStatistics(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    uncached: int
+
+    @computed_field
+    @property
+    def hit_ratio(self) -> float:
+        executions = self.hits + self.misses + self.uncached
+        if not executions:
+            return 0.0
+        return self.hits / executions
@@ -5,6 +5,7 @@ from pydantic import Field, ValidationError
 from fastapi import Form
 from fastapi.exceptions import RequestValidationError
 
+from model.base_models import BaseModel
 from model.appointment_models import AppointmentBase
 from model.patient_models import PatientCreate, Phone
 
@@ -90,3 +91,14 @@ class PatientUpdateForm(PatientCreate):
             )
         except ValidationError as exc:
             raise RequestValidationError(exc.errors())
+
+
+class DoctorOption(BaseModel):
+    id: int
+    full_name: str
+
+
+class ServiceOption(BaseModel):
+    id: int
+    title: str
+    price: str
@@ -5,6 +5,12 @@ from model.doctor_models import DoctorOuter
 from data.base_data import FieldDefault
 
 
+class SpecialtyShort(AbstractModel):
+    id: int
+    title: str = Field(max_length=FieldDefault.SPECIALTY_TITLE_MAX_LENGHT)
+    description: None | str = Field(default=None)
+
+
 class SpecialtyOuter(AbstractModel):
     title: str = Field(max_length=FieldDefault.SPECIALTY_TITLE_MAX_LENGHT)
     description: None | str = Field(default=None)
@@ -1,7 +1,9 @@
+import asyncio
 from datetime import date, time, timedelta
 from typing import override
 
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import Depends, Request, status
 from fastapi.responses import RedirectResponse
 
@@ -12,16 +14,18 @@ from model.patient_models import PatientOuter
 from model.appointment_models import (
     AppointmentInner, AppointmentCreate
 )
-from service.base_services import BaseService
+from service.base_services import AsyncBaseService, BaseService
 from service.auth_services import JWTTokenService
 from service.patient_services import PatientService
 from data.connections import MySQLConnection
 from data.base_data import BaseCRUD
-from data.sql_models import Appointment, ServiceToAppointment
+from data.sql_models import Appointment, ServiceToAppointment, WorkSchedule
 from data.appointment_data import AppointmentCRUD
+from data.availability_data import AsyncAvailabilityRedis, AvailabilityRedis
 
 type AppointmentSchedule = dict[date, set[time]]
 type AppointmentTimes = set[tuple[date, time]]
+type WorkMasks = dict[int, int]
 
 
 class BaseAppointmentServiceWithCRUD(BaseService):
@@ -115,21 +119,124 @@ class AppointmentShceduleDataConstructor:
             self.schedule[self.today_iso] = sorted(list(self.free_hours))
 
 
+class AppointmentSlotEngine:
+    """
+    'AppointmentShceduleDataConstructor' on integer bitmaps. Bit N of a day
+    is the 30 minutes slot starting at N * 30 minutes after midnight, days of
+    the booking range follow each other in one integer, so free times of the
+    whole range are computed with a single 'work & ~booked'
+    """
+    slot_duration = timedelta(minutes=30)
+    slots_per_day = 48
+    day_mask = (1 << slots_per_day) - 1
+    slot_times = [
+        time(hour=slot // 2, minute=slot % 2 * 30).isoformat()
+        for slot
+        in range(slots_per_day)
+    ]
+
+    def __init__(
+            self,
+            work_masks: WorkMasks,
+            appointment_datetimes: AppointmentTimes,
+            booking_range: timedelta = timedelta(days=30)
+    ) -> None:
+        self.work_masks = work_masks
+        self.appointment_datetimes = appointment_datetimes
+        self.today = date.today()
+        self.days = booking_range.days
+
+    @classmethod
+    def get_work_mask(cls, work_day: WorkSchedule) -> int:
+        """Slots starting from 'start_time' and before 'end_time'"""
+        first = cls._get_slot(work_day.start_time)
+        last = -(-cls._get_minutes(work_day.end_time) // 30)
+        mask = ((1 << last) - 1) & ~((1 << first) - 1)
+        return mask
+
+    @classmethod
+    def get_work_masks(cls, work_days: list[WorkSchedule]) -> WorkMasks:
+        work_masks = {}
+        for work_day in work_days:
+            weekday = int(work_day.weekday)
+            work_masks[weekday] = (
+                work_masks.get(weekday, 0) | cls.get_work_mask(work_day)
+            )
+        return work_masks
+
+    @classmethod
+    def _get_slot(cls, slot_time: time) -> int:
+        return cls._get_minutes(slot_time) // 30
+
+    @classmethod
+    def _get_minutes(cls, slot_time: time) -> int:
+        return slot_time.hour * 60 + slot_time.minute
+
+    def exec(self) -> dict[str, list[str]]:
+        free = self._get_work_bitmap() & ~self._get_booked_bitmap()
+        schedule = self._convert(free)
+        return schedule
+
+    def _get_work_bitmap(self) -> int:
+        bitmap = 0
+        weekday = self.today.weekday()
+        for offset in range(self.days):
+            work_mask = self.work_masks.get((weekday + offset) % 7)
+            if work_mask:
+                bitmap |= work_mask << (offset * self.slots_per_day)
+        return bitmap
+
+    def _get_booked_bitmap(self) -> int:
+        bitmap = 0
+        for appointment_date, appointment_time in self.appointment_datetimes:
+            offset = (appointment_date - self.today).days
+            if 0 <= offset < self.days:
+                slot = self._get_slot(appointment_time)
+                bitmap |= 1 << (offset * self.slots_per_day + slot)
+        return bitmap
+
+    def _convert(self, free: int) -> dict[str, list[str]]:
+        """The only place where slots are turned into ISO strings"""
+        schedule = {}
+        for offset in range(self.days):
+            day_bits = (free >> offset * self.slots_per_day) & self.day_mask
+            if day_bits:
+                day = self.today + timedelta(days=offset)
+                schedule[day.isoformat()] = self._get_times(day_bits)
+        return schedule
+
+    def _get_times(self, day_bits: int) -> list[str]:
+        times = []
+        while day_bits:
+            lowest = day_bits & -day_bits
+            times.append(self.slot_times[lowest.bit_length() - 1])
+            day_bits ^= lowest
+        return times
+
+
 class AppointmentBooking(BaseAppointmentServiceWithCRUD):
     @override
     def __init__(self, session: Session, request: Request) -> None:
         super().__init__(session)
         self.request = request
+        self.availability = AvailabilityRedis()
 
     def exec(self, form: AppointmentBookingForm) -> RedirectResponse:
+        with self.availability.writing(form.doctor_id):
+            appointment = self.book(form)
+            self._take_appointment_time(appointment)
+        response = self._construct_response(appointment.id)
+        return response
+
+    def book(self, form: AppointmentBookingForm) -> Appointment:
+        """Commits the appointment, the availability index is left as is"""
         try:
             appointment = self._create_appointment(form)
         except DataDoesNotMatch:
             self._rollback()
         else:
             self._finish_transaction(form.service_id, appointment.id)
-            response = self._construct_response(appointment.id)
-            return response
+            return appointment
 
     def _create_appointment(
             self, form: AppointmentBookingForm
@@ -174,6 +281,11 @@ class AppointmentBooking(BaseAppointmentServiceWithCRUD):
         )
         crud.create(entry)
 
+    def _take_appointment_time(self, appointment: Appointment) -> None:
+        self.availability.remove(
+            appointment.doctor_id, appointment.date, appointment.time
+        )
+
     def _rollback(self) -> None:
         self.session.rollback()
         raise FormInputError((
@@ -231,6 +343,42 @@ class AppointmentJWTTokenService(BaseAppointmentServiceWithCRUD):
         return content.get("id")
 
 
+class AsyncAppointmentBooking(AsyncBaseService):
+    """
+    Only the transaction runs through 'run_sync()', the availability index
+    is updated with the async client and the response is signed in a thread
+    """
+    @override
+    def __init__(self, session: AsyncSession, request: Request) -> None:
+        super().__init__(session)
+        self.request = request
+        self.availability = AsyncAvailabilityRedis()
+
+    async def exec(self, form: AppointmentBookingForm) -> RedirectResponse:
+        booking = AppointmentBooking(self.session.sync_session, self.request)
+        async with self.availability.writing(form.doctor_id):
+            appointment = await self.run_sync(
+                lambda session: booking.book(form)
+            )
+            await self.availability.remove(
+                appointment.doctor_id, appointment.date, appointment.time
+            )
+        response = await asyncio.to_thread(
+            booking._construct_response, appointment.id
+        )
+        return response
+
+
+class AsyncAppointmentJWTTokenService(AsyncBaseService):
+    async def get_appointment(self, token: str) -> AppointmentInner:
+        appointment = await self.run_sync(
+            lambda session: AppointmentJWTTokenService(
+                session
+            ).get_appointment(token)
+        )
+        return appointment
+
+
 def get_appointment_booking(
         request: Request,
         session: Session = Depends(MySQLConnection.get_session),
@@ -242,3 +390,16 @@ def get_appointment_jwt_token_service(
         session: Session = Depends(MySQLConnection.get_session),
 ) -> AppointmentJWTTokenService:
     return AppointmentJWTTokenService(session)
+
+
+async def get_async_appointment_booking(
+        request: Request,
+        session: AsyncSession = Depends(MySQLConnection.get_async_session),
+) -> AsyncAppointmentBooking:
+    return AsyncAppointmentBooking(session, request)
+
+
+async def get_async_appointment_jwt_token_service(
+        session: AsyncSession = Depends(MySQLConnection.get_async_session),
+) -> AsyncAppointmentJWTTokenService:
+    return AsyncAppointmentJWTTokenService(session)
@@ -1,6 +1,11 @@
+import asyncio
 import hashlib
+import hmac
 import secrets
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends, Request
@@ -9,29 +14,105 @@ from jose import jwt
 from jose.exceptions import ExpiredSignatureError, JWTError
 from sqlmodel import Session
 
+from config import Config
 from logger.setup import get_logger
 from exceptions.exc import (
     FormInputError,
     OTPCodeHashDoesNotMatch,
+    OTPCodeNotFound,
     UnauthorizedError,
     AccessTokenExpired
 )
+from model.cache_models import CacheStatistics
 from model.form_models import PhoneForm
-from model.auth_models import OTPCode
+from model.auth_models import JWTKey, OTPCode
 from model.patient_models import PatientCreate, PatientOuter
 from service.base_services import BaseService
-from data.auth_data import OTPCodeRedis
+from service.hashing_services import OTPHasher, OTPHashers
+from service.keyring_services import JWTKeyring, JWTKeyrings
+from data.auth_data import AsyncOTPCodeRedis, OTPCodeRedis
 from data.connections import MySQLConnection
 
+settings = Config.get_settings()
+
 type Payload = dict[str, bytes | int | datetime]
 
 
+class TokenCache:
+    """
+    Per-worker cache of verified token payloads, keyed by the SHA-256 of the
+    token and bounded by size with LRU eviction. An entry is missed from the
+    second of its 'exp' on, so an expired token is always decoded again and
+    rejected by the signature check
+    """
+    max_size = settings.token_cache_max_size
+    hits = 0
+    misses = 0
+    evictions = 0
+    _entries: OrderedDict[bytes, Payload] = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, token: str) -> Payload | None:
+        key = cls._get_key(token)
+        with cls._lock:
+            payload = cls._entries.get(key)
+            if payload is None or cls._is_expired(payload):
+                cls._entries.pop(key, None)
+                cls.misses += 1
+                return None
+            cls._entries.move_to_end(key)
+            cls.hits += 1
+            return dict(payload)
+
+    @classmethod
+    def set(cls, token: str, payload: Payload) -> None:
+        """Payloads without 'exp' never expire, so they are not kept"""
+        if not isinstance(payload.get("exp"), int):
+            return
+        key = cls._get_key(token)
+        with cls._lock:
+            cls._entries[key] = dict(payload)
+            cls._entries.move_to_end(key)
+            cls._evict()
+
+    @classmethod
+    def statistics(cls) -> CacheStatistics:
+        with cls._lock:
+            statistics = CacheStatistics(
+                size=len(cls._entries),
+                max_size=cls.max_size,
+                hits=cls.hits,
+                misses=cls.misses,
+                evictions=cls.evictions
+            )
+        return statistics
+
+    @classmethod
+    def _get_key(cls, token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    @classmethod
+    def _evict(cls) -> None:
+        while len(cls._entries) > cls.max_size:
+            cls._entries.popitem(last=False)
+            cls.evictions += 1
+
+    @classmethod
+    def _is_expired(cls, payload: Payload) -> bool:
+        return time.time() >= payload["exp"]
+
+
 class JWTTokenService:
-    secret = secrets.token_hex(16)
     alg = "HS256"
 
-    def __init__(self, exp_delta: timedelta = timedelta(minutes=1)) -> None:
+    def __init__(
+            self,
+            exp_delta: timedelta = timedelta(minutes=1),
+            keyring: JWTKeyring | None = None
+    ) -> None:
         self.exp_delta = exp_delta
+        self.keyring = keyring or JWTKeyrings.get_default()
 
     @property
     def exp_time(self) -> datetime:
@@ -39,13 +120,32 @@ class JWTTokenService:
 
     def create(self, id: int | bytes | str) -> str:
         payload = self._construct_payload(id)
-        token = jwt.encode(payload, self.secret, algorithm=self.alg)
+        key = self.keyring.get_active()
+        token = jwt.encode(
+            payload, key.secret, algorithm=self.alg, headers={"kid": key.kid}
+        )
         return token
 
     def verify(self, token: str) -> Payload:
-        payload = jwt.decode(token, self.secret, algorithms=[self.alg])
+        key = self._get_key(token)
+        payload = jwt.decode(token, key.secret, algorithms=[self.alg])
         return payload
 
+    def verify_cached(self, token: str) -> Payload:
+        """'verify' for tokens checked on every request, e.g. access tokens"""
+        payload = TokenCache.get(token)
+        if payload is None:
+            payload = self.verify(token)
+            TokenCache.set(token, payload)
+        return payload
+
+    def _get_key(self, token: str) -> JWTKey:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.keyring.get(kid) if isinstance(kid, str) else None
+        if key is None:
+            raise JWTError("Token is signed with an unknown key")
+        return key
+
     def _construct_payload(self, id: int | bytes) -> Payload:
         """
         Content is whether `patient` bytes UUID or `appointment` integer id
@@ -93,7 +193,7 @@ class AuthService(BaseService):
 
     def _get_access_token_payload(self) -> Payload:
         try:
-            payload = JWTTokenService().verify(self.access_token)
+            payload = JWTTokenService().verify_cached(self.access_token)
         except ExpiredSignatureError:
             raise AccessTokenExpired()
         except JWTError as exc:
@@ -193,6 +293,9 @@ class AuthService(BaseService):
 
 
 class OTPCodeService:
+    def __init__(self, hasher: OTPHasher | None = None) -> None:
+        self.hasher = hasher or OTPHashers.get_default()
+
     def create(self, phone: str) -> None:
         code = self._generate_code()
         self._send_otp_code(code)
@@ -203,6 +306,10 @@ class OTPCodeService:
             is_matched = self._hash_matches(form)
         except OTPCodeHashDoesNotMatch:
             raise FormInputError("Verification code does not match")
+        except OTPCodeNotFound:
+            raise FormInputError(
+                "Code expired or already used, request a new one"
+            )
         else:
             return is_matched
 
@@ -215,8 +322,18 @@ class OTPCodeService:
 
     def _save_otp_code(self, phone: str, code: str) -> None:
         salt, hashed_value = self._hash_otp_code(code)
-        otp_code = OTPCode(phone=phone, salt=salt, code=hashed_value)
-        OTPCodeRedis().set(otp_code)
+        OTPCodeRedis().set(self._construct_otp_code(phone, salt, hashed_value))
+
+    def _construct_otp_code(
+            self, phone: str, salt: bytes, hashed_value: bytes
+    ) -> OTPCode:
+        otp_code = OTPCode(
+            phone=phone,
+            salt=salt,
+            code=hashed_value,
+            algorithm=self.hasher.algorithm
+        )
+        return otp_code
 
     def _hash_otp_code(self, code: str) -> tuple[bytes, bytes]:
         salt = os.urandom(16)
@@ -224,22 +341,51 @@ class OTPCodeService:
         return salt, hashed
 
     def _hash_matches(self, form: PhoneForm) -> bool:
-        otp_code_db = OTPCodeRedis().get(form.phone)
-        hashed_code = self._hash(form.code, otp_code_db.salt)
-        return self._check_hash(hashed_code, otp_code_db.code)
+        """
+        A matching code is consumed, a mismatched one is kept for another
+        attempt until 'OTPCodeRedis.max_attempts' of them fail
+        """
+        otp_redis = OTPCodeRedis()
+        otp_code_db = otp_redis.get(form.phone)
+        hasher = OTPHashers.from_algorithm(otp_code_db.algorithm)
+        hashed_code = hasher.hash(form.code, otp_code_db.salt)
+        try:
+            self._check_hash(hashed_code, otp_code_db.code)
+        except OTPCodeHashDoesNotMatch:
+            otp_redis.fail(form.phone)
+            raise
+        if not otp_redis.consume(otp_code_db):
+            raise OTPCodeNotFound()
+        return True
 
     def _hash(self, value: str, salt: bytes) -> bytes:
-        hashed = hashlib.pbkdf2_hmac(
-            "sha256", value.encode("utf-8"), salt, 100000
-        )
+        hashed = self.hasher.hash(value, salt)
         return hashed
 
     def _check_hash(self, hashed_code: bytes, db_code: bytes) -> bool:
-        if hashed_code == db_code:
+        """Compared in constant time, so timing doesn't reveal the hash"""
+        if hmac.compare_digest(hashed_code, db_code):
             return True
         raise OTPCodeHashDoesNotMatch()
 
 
+class AsyncOTPCodeService(OTPCodeService):
+    """
+    'OTPCodeService' for async routes. The code is hashed in a worker
+    thread, so a costly hasher doesn't block the event loop
+    """
+    async def create(self, phone: str) -> None:
+        code = self._generate_code()
+        self._send_otp_code(code)
+        await self._save_otp_code(phone, code)
+
+    async def _save_otp_code(self, phone: str, code: str) -> None:
+        salt, hashed_value = await asyncio.to_thread(self._hash_otp_code, code)
+        await AsyncOTPCodeRedis().set(
+            self._construct_otp_code(phone, salt, hashed_value)
+        )
+
+
 def get_auth_service(
         request: Request,
         session: Session = Depends(MySQLConnection.get_session)
@@ -250,3 +396,12 @@ def get_auth_service(
 def authorize(auth: AuthService = Depends(get_auth_service)) -> str:
     patient_id = auth.authorize()
     return patient_id
+
+
+async def authorize_async(request: Request) -> str:
+    """
+    'authorize' for async routes. Authorization only verifies the access
+    token, so no database session is opened
+    """
+    patient_id = AuthService(session=None, request=request).authorize()
+    return patient_id
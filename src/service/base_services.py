@@ -1,6 +1,22 @@
+from collections.abc import Callable
+
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 
 class BaseService:
     def __init__(self, session: Session) -> None:
         self.session = session
+
+
+class AsyncBaseService:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def run_sync[T](self, routine: Callable[[Session], T]) -> T:
+        """
+        Runs a routine of a sync service on the event loop. Queries inside it
+        are executed by the async driver through 'AsyncSession.run_sync()'
+        """
+        result = await self.session.run_sync(routine)
+        return result
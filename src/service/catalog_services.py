@@ -0,0 +1,36 @@
+from collections.abc import Awaitable, Callable
+from datetime import date
+
+from pydantic import TypeAdapter
+
+from data.catalog_data import AsyncCatalogRedis
+
+
+class CatalogCache:
+    """
+    Read-through cache of catalog pages in 'AsyncCatalogRedis'. Pages are
+    stored as JSON of their pydantic models and loaded from the database on
+    a miss
+    """
+    def __init__(self, store: AsyncCatalogRedis | None = None) -> None:
+        self.store = store or AsyncCatalogRedis()
+
+    async def get_version(self) -> str:
+        """Catalog pages also depend on the date, e.g. doctors' experience"""
+        version = await self.store.get_version()
+        return f"{version}:{date.today().isoformat()}"
+
+    async def get[T](
+            self,
+            name: str,
+            adapter: TypeAdapter[T],
+            load: Callable[[], Awaitable[T]],
+            lifetime: int | None = None
+    ) -> T:
+        version = await self.store.get_version()
+        cached = await self.store.get(name, version)
+        if cached is not None:
+            return adapter.validate_json(cached)
+        page = await load()
+        await self.store.set(name, version, adapter.dump_json(page), lifetime)
+        return page
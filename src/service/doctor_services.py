@@ -1,20 +1,26 @@
-from datetime import datetime, date, time, timedelta
+from collections.abc import Collection
+from datetime import date
 from typing import override
 
 from fastapi import Depends
+from pydantic import TypeAdapter
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from model.doctor_models import DoctorDetail
-from service.base_services import BaseService
+from service.base_services import AsyncBaseService, BaseService
 from service.appointment_services import (
-    AppointmentShceduleDataConstructor,
+    AppointmentSlotEngine,
     AppointmentTimes
 )
+from service.catalog_services import CatalogCache
 from service.service_services import ServiceDataConstructor
 from data.connections import MySQLConnection
 from data.sql_models import Doctor, WorkSchedule
 from data.base_data import BaseCRUD
-from data.doctor_data import DoctorCRUD
+from data.doctor_data import AsyncDoctorCRUD, DoctorCRUD
+from data.appointment_data import AppointmentCRUD
+from data.availability_data import AvailabilityRedis, FreeTimes
 
 
 class DoctorPage(BaseService):
@@ -28,16 +34,45 @@ class DoctorPage(BaseService):
         return doctor
 
 
+class AsyncDoctorPage(AsyncBaseService):
+    """Pages are served from 'CatalogCache'"""
+    doctor_adapter = TypeAdapter(DoctorDetail)
+
+    @override
+    def __init__(
+            self, session: AsyncSession, cache: CatalogCache | None = None
+    ) -> None:
+        super().__init__(session)
+        self.crud = AsyncDoctorCRUD(session)
+        self.cache = cache or CatalogCache()
+
+    async def get_version(self) -> str:
+        version = await self.cache.get_version()
+        return version
+
+    async def get_detailed_info(self, id: int) -> DoctorDetail:
+        doctor = await self.cache.get(
+            f"doctor:{id}", self.doctor_adapter, lambda: self.crud.get(id)
+        )
+        return doctor
+
+
 class DoctorDataConstructor:
     def __init__(
             self,
             doctors: list[Doctor] | None = None,
-            doctor: Doctor | None = None
+            doctor: Doctor | None = None,
+            availability: "DoctorAvailability | None" = None,
+            free_times: dict[int, FreeTimes] | None = None
     ) -> None:
         self.doctors = doctors
         self.doctor = doctor
+        self.availability = availability or DoctorAvailability()
+        self.free_times = free_times
 
     def exec(self) -> list[dict]:
+        if self.free_times is None:
+            self.free_times = self.availability.get_many(self.doctors)
         dumped_doctors = [self._dump(doctor) for doctor in self.doctors]
         return dumped_doctors
 
@@ -64,75 +99,127 @@ class DoctorDataConstructor:
         self.dumped_doctor.update({"services": services})
 
     def _add_appointment_schedule(self) -> None:
-        doctor_schedule = self._get_schedule()
-        appointments = self._get_appointments()
-        constructor = AppointmentShceduleDataConstructor(
-            doctor_schedule, appointments
-        )
-        appointment_schedule = constructor.exec()
+        appointment_schedule = self._get_free_times()
         self.dumped_doctor.update({"schedule": appointment_schedule})
 
-    def _get_schedule(self) -> dict:
-        schedule = {}
-        for work_day in self.doctor.work_days:
-            self._populate_schedule(work_day, schedule)
-        return schedule
-
-    def _populate_schedule(
-            self, work_day: WorkSchedule, schedule: dict
-    ) -> None:
-        schedule_value = self._get_schedule_value(work_day)
-        schedule.update(schedule_value)
-
-    def _get_schedule_value(self, work_day: WorkSchedule) -> dict:
-        week_day, constructor = self._construct_schedule_value_data(work_day)
-        schedule_value = {week_day: constructor.exec()}
-        return schedule_value
-
-    def _construct_schedule_value_data(
-            self, work_day: WorkSchedule
-    ) -> tuple[int, "WorkScheduleDataConstructor"]:
-        week_day = self._get_week_day(work_day)
-        constructor = WorkScheduleDataConstructor(work_day)
-        return week_day, constructor
-
-    def _get_week_day(self, work_day: WorkSchedule) -> int:
-        week_day_int = int(work_day.weekday)
-        return week_day_int
-
-    def _get_appointments(self) -> AppointmentTimes:
-        appointments = set(
-            (appointment.date, appointment.time)
-            for appointment
-            in self.doctor.appointments
-            if appointment.status == "pending"
+    def _get_free_times(self) -> FreeTimes:
+        """Falls back to a lookup for doctors not prefetched by 'exec()'"""
+        if self.free_times is None or self.doctor.id not in self.free_times:
+            return self.availability.get(self.doctor.id)
+        return self.free_times[self.doctor.id]
+
+
+class DoctorAvailability:
+    """
+    Lookup of doctors' free appointment times in 'AvailabilityRedis'. A missing
+    index is built in its own session, which is opened after the doctor's
+    version is read, so bookings committed during the build are not lost.
+    Indexes missing for several doctors are built with a single query
+    """
+    def __init__(self, store: AvailabilityRedis | None = None) -> None:
+        self.store = store or AvailabilityRedis()
+
+    def get(self, doctor_id: int) -> FreeTimes:
+        free_times = self.store.get(doctor_id)
+        if free_times is None:
+            free_times = self.build(doctor_id)
+        return free_times
+
+    def get_many(self, doctors: Collection[Doctor]) -> dict[int, FreeTimes]:
+        """
+        'get()' of several doctors. Missing indexes are built from the work
+        days of the passed doctors, so these should already be loaded
+        """
+        if not doctors:
+            return {}
+        free_times = self.store.get_many([doctor.id for doctor in doctors])
+        missing = [
+            doctor for doctor in doctors if free_times[doctor.id] is None
+        ]
+        if missing:
+            free_times.update(self.build_many(missing))
+        return free_times
+
+    def get_range(
+            self,
+            doctor_id: int,
+            start: date | None = None,
+            end: date | None = None
+    ) -> FreeTimes:
+        """Free times on the days within [start, end]"""
+        first = (start or date.min).isoformat()
+        last = (end or date.max).isoformat()
+        free_times = {
+            day: times
+            for day, times
+            in self.get(doctor_id).items()
+            if first <= day <= last
+        }
+        return free_times
+
+    def get_version(self, doctor_id: int) -> str:
+        version = self.format_version(
+            doctor_id, self.store.get_version(doctor_id)
         )
-        return appointments
-
-
-class WorkScheduleDataConstructor:
-    appointment_duration = timedelta(minutes=30)
-
-    def __init__(self, work_day: WorkSchedule) -> None:
-        self.work_day = work_day
-        self.appointment_time = self._set_appointment_time()
-        self.schedule = set()
-
-    def _set_appointment_time(self) -> datetime:
-        return datetime.combine(date.today(), self.work_day.start_time)
-
-    def exec(self) -> set[time]:
-        self._create_schedule()
-        return self.schedule
-
-    def _create_schedule(self) -> set[time]:
-        while self.appointment_time.time() < self.work_day.end_time:
-            self._add_appointment_time()
-        return self.schedule
-
-    def _add_appointment_time(self) -> None:
-        self.schedule.add(self.appointment_time.time().isoformat())
-        self.appointment_time += self.appointment_duration
+        return version
+
+    @staticmethod
+    def format_version(doctor_id: int, index_version: int) -> str:
+        """The index is rebuilt every day as the booking range moves on"""
+        version = f"{doctor_id}:{index_version}:{date.today().isoformat()}"
+        return version
+
+    def build(self, doctor_id: int) -> FreeTimes:
+        version = self.store.get_version(doctor_id)
+        with Session(MySQLConnection.engine) as session:
+            doctor = BaseCRUD(session, Doctor, Doctor)._get(doctor_id)
+            free_times = self._construct_free_times(
+                doctor.work_days, self._get_booked(session, doctor_id)
+            )
+        self.store.set(doctor_id, free_times, version)
+        return free_times
+
+    def build_many(self, doctors: Collection[Doctor]) -> dict[int, FreeTimes]:
+        doctor_ids = [doctor.id for doctor in doctors]
+        versions = self.store.get_versions(doctor_ids)
+        with Session(MySQLConnection.engine) as session:
+            booked = self._get_booked_many(session, doctor_ids)
+        free_times = {}
+        for doctor in doctors:
+            doctor_free_times = self._construct_free_times(
+                doctor.work_days, booked[doctor.id]
+            )
+            self.store.set(doctor.id, doctor_free_times, versions[doctor.id])
+            free_times[doctor.id] = doctor_free_times
+        return free_times
+
+    def _construct_free_times(
+            self, work_days: list[WorkSchedule], booked: AppointmentTimes
+    ) -> FreeTimes:
+        work_masks = AppointmentSlotEngine.get_work_masks(work_days)
+        engine = AppointmentSlotEngine(
+            work_masks, booked, self.store.booking_range
+        )
+        free_times = engine.exec()
+        return free_times
+
+    def _get_booked(
+            self, session: Session, doctor_id: int
+    ) -> AppointmentTimes:
+        today = date.today()
+        booked = AppointmentCRUD(session).get_pending_times(
+            doctor_id, today, today + self.store.booking_range
+        )
+        return booked
+
+    def _get_booked_many(
+            self, session: Session, doctor_ids: list[int]
+    ) -> dict[int, AppointmentTimes]:
+        today = date.today()
+        booked = AppointmentCRUD(session).get_pending_times_by_doctors(
+            doctor_ids, today, today + self.store.booking_range
+        )
+        return booked
 
 
 def get_doctor_page(
@@ -140,3 +227,10 @@ def get_doctor_page(
 ) -> DoctorPage:
     doctor_page = DoctorPage(session)
     return doctor_page
+
+
+async def get_async_doctor_page(
+        session: AsyncSession = Depends(MySQLConnection.get_async_session)
+) -> AsyncDoctorPage:
+    doctor_page = AsyncDoctorPage(session)
+    return doctor_page
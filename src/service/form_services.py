@@ -3,34 +3,50 @@ Services for loading data to HTML select forms. Placed into a distinct module
 due to import errors
 """
 
+import asyncio
+from datetime import date
 from typing import override
 
 from fastapi import Depends, Request
+from pydantic import TypeAdapter
+from sqlalchemy.exc import NoResultFound
 from sqlmodel import Session, Sequence
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from exceptions.exc import UnauthorizedError
-from service.base_services import BaseService
+from config import Config
+from exceptions.exc import DoctorNotFound, UnauthorizedError
+from model.form_models import DoctorOption, ServiceOption
+from service.base_services import AsyncBaseService, BaseService
 from service.auth_services import AuthService
+from service.catalog_services import CatalogCache
 from service.patient_services import PatientDataConstructor
-from service.appointment_services import (
-    AppointmentShceduleDataConstructor,
-    AppointmentTimes
-)
-from service.specialty_services import SpecialtyDataConstructor
-from service.doctor_services import DoctorDataConstructor
+from service.service_services import ServiceDataConstructor
+from service.doctor_services import DoctorAvailability
 from data.connections import MySQLConnection
 from data.base_data import BaseCRUD
-from data.sql_models import Appointment, Specialty, Doctor
+from data.doctor_data import DoctorCRUD
+from data.sql_models import Appointment, Doctor, Specialty
+from data.availability_data import AsyncAvailabilityRedis, FreeTimes
+from data.service_data import PriceCatalog
+from data.load_plans import BookingFormLoadPlan
+
+settings = Config.get_settings()
 
 
 class AppointmentBookingFormDataConstructor(BaseService):
     @override
-    def __init__(self, session: Session, request: Request) -> None:
+    def __init__(
+            self,
+            session: Session,
+            request: Request,
+            payload: str = settings.booking_form_payload
+    ) -> None:
         super().__init__(session)
         self.appointment_crud = BaseCRUD(session, Appointment, Appointment)
         self.specialty_crud = BaseCRUD(session, Specialty, Specialty)
         self.cookies: dict[str, str] = request.cookies
         self.auth_service = AuthService(session, request)
+        self.payload = payload
 
     def exec(self) -> dict:
         """Initial method"""
@@ -40,7 +56,7 @@ class AppointmentBookingFormDataConstructor(BaseService):
     def _construct_content(self) -> dict:
         content = {
             "patient": self._get_patient_data(),
-            "specialties": self._get_specialties_data()
+            "options": self._get_options_data()
         }
         return content
 
@@ -58,48 +74,344 @@ class AppointmentBookingFormDataConstructor(BaseService):
         patient_data = constructor.exec()
         return patient_data
 
-    def _get_specialties_data(self) -> None:
-        specialties = self.specialty_crud.get_all()
-        specialties_data = self._construct_specialties_data(specialties)
-        return specialties_data
+    def _get_options_data(self) -> dict:
+        if self.payload == "compact":
+            options_data = self._get_compact_options_data()
+        else:
+            options_data = self._get_lazy_options_data()
+        return options_data
+
+    def _get_lazy_options_data(self) -> dict:
+        """
+        Only specialties are embedded, the rest is loaded by the form per
+        selection through 'BookingFormOptions'
+        """
+        specialties_data = [
+            specialty.model_dump(include=["id", "title"])
+            for specialty
+            in self.specialty_crud.get_all()
+        ]
+        return {"format": "lazy", "specialties": specialties_data}
+
+    def _get_compact_options_data(self) -> dict:
+        encoder = CompactBookingPayload(self._get_specialties())
+        options_data = encoder.exec()
+        return options_data
+
+    def _get_specialties(self) -> Sequence[Specialty]:
+        load_plan = BookingFormLoadPlan(self.session)
+        specialties = load_plan.exec()
+        return specialties
+
+
+class CompactBookingPayload:
+    """
+    Columnar encoding of the whole booking form. Times, prices and services
+    are stored once and referred to by their indices. Every doctor's free
+    times are a list of day offsets from 'start', each with a hex bitmask
+    over the indices of the times. Free times of all doctors are fetched at
+    once, so doctors' work days should be loaded
+    """
+    def __init__(
+            self,
+            specialties: Sequence[Specialty],
+            availability: DoctorAvailability | None = None,
+            start: date | None = None
+    ) -> None:
+        self.specialties = specialties
+        self.availability = availability or DoctorAvailability()
+        self.start = start or date.today()
+        self.times: dict[str, int] = {}
+        self.prices: dict[str, int] = {}
+        self.services: dict[int, int] = {}
+        self.doctors: dict[int, int] = {}
+        self.free_times: dict[int, FreeTimes] = {}
+        self.specialties_table = {"id": [], "title": [], "doctors": []}
+        self.doctors_table = {
+            "id": [],
+            "full_name": [],
+            "services": [],
+            "prices": [],
+            "days": [],
+            "slots": []
+        }
+        self.services_table = {"id": [], "title": []}
+
+    def exec(self) -> dict:
+        self.free_times = self.availability.get_many(self._get_doctors())
+        for specialty in self.specialties:
+            self._add_specialty(specialty)
+        payload = {
+            "format": "compact",
+            "start": self.start.isoformat(),
+            "times": list(self.times),
+            "prices": list(self.prices),
+            "services": self.services_table,
+            "doctors": self.doctors_table,
+            "specialties": self.specialties_table
+        }
+        return payload
+
+    def _get_doctors(self) -> list[Doctor]:
+        doctors = {
+            doctor.id: doctor
+            for specialty
+            in self.specialties
+            for doctor
+            in specialty.doctors
+        }
+        return list(doctors.values())
+
+    def _add_specialty(self, specialty: Specialty) -> None:
+        self.specialties_table["id"].append(specialty.id)
+        self.specialties_table["title"].append(specialty.title)
+        self.specialties_table["doctors"].append([
+            self._get_doctor_index(doctor) for doctor in specialty.doctors
+        ])
+
+    def _get_doctor_index(self, doctor: Doctor) -> int:
+        if doctor.id not in self.doctors:
+            self.doctors[doctor.id] = len(self.doctors)
+            self._add_doctor(doctor)
+        return self.doctors[doctor.id]
+
+    def _add_doctor(self, doctor: Doctor) -> None:
+        services = ServiceDataConstructor(doctor).exec()
+        days, slots = self._encode_free_times(self.free_times[doctor.id])
+        self.doctors_table["id"].append(doctor.id)
+        self.doctors_table["full_name"].append(doctor.full_name)
+        self.doctors_table["services"].append([
+            self._get_service_index(service) for service in services
+        ])
+        self.doctors_table["prices"].append([
+            self._get_index(self.prices, service["price"])
+            for service
+            in services
+        ])
+        self.doctors_table["days"].append(days)
+        self.doctors_table["slots"].append(slots)
+
+    def _get_service_index(self, service: dict) -> int:
+        if service["id"] not in self.services:
+            self.services[service["id"]] = len(self.services)
+            self.services_table["id"].append(service["id"])
+            self.services_table["title"].append(service["title"])
+        return self.services[service["id"]]
+
+    def _encode_free_times(
+            self, free_times: FreeTimes
+    ) -> tuple[list[int], list[str]]:
+        days, slots = [], []
+        for day, times in free_times.items():
+            days.append((date.fromisoformat(day) - self.start).days)
+            slots.append(self._encode_times(times))
+        return days, slots
 
-    def _construct_specialties_data(
-            self, specialties: Sequence[Specialty]
-    ) -> list[dict]:
-        constructor = SpecialtyDataConstructor(self.session, specialties)
-        specialties_data = constructor.exec()
-        return specialties_data
+    def _encode_times(self, times: list[str]) -> str:
+        mask = 0
+        for time in times:
+            mask |= 1 << self._get_index(self.times, time)
+        return format(mask, "x")
+
+    def _get_index(self, dictionary: dict[str, int], value: str) -> int:
+        return dictionary.setdefault(value, len(dictionary))
+
+
+class BookingFormOptions(BaseService):
+    """Options of the booking form selects for a made selection"""
+    @override
+    def __init__(
+            self,
+            session: Session,
+            availability: DoctorAvailability | None = None
+    ) -> None:
+        super().__init__(session)
+        self.doctor_crud = DoctorCRUD(session)
+        self.availability = availability or DoctorAvailability()
+
+    def get_doctors(self, specialty_id: int) -> list[DoctorOption]:
+        doctors = [
+            DoctorOption(id=doctor.id, full_name=doctor.full_name)
+            for doctor
+            in self.doctor_crud.get_all_by_specialty(specialty_id)
+        ]
+        return doctors
+
+    def get_services(self, doctor_id: int) -> list[ServiceOption]:
+        try:
+            doctor = self.doctor_crud._get_with_services(doctor_id)
+        except NoResultFound:
+            raise DoctorNotFound()
+        services = [
+            ServiceOption(**service)
+            for service
+            in ServiceDataConstructor(doctor).exec()
+        ]
+        return services
+
+    def get_slots(
+            self,
+            doctor_id: int,
+            start: date | None = None,
+            end: date | None = None
+    ) -> FreeTimes:
+        try:
+            slots = self.availability.get_range(doctor_id, start, end)
+        except NoResultFound:
+            raise DoctorNotFound()
+        return slots
 
 
 class AppointmentRescheduleFormDataConstructor(BaseService):
     def __init__(self, session: Session, doctor_id: int) -> None:
         super().__init__(session)
-        self.doctor_crud = BaseCRUD(session, Doctor, Doctor)
-        self.doctor = self._get_doctor(int(doctor_id))
-        self.doctor_data_constructor = DoctorDataConstructor(doctor=self.doctor)
-
-    def _get_doctor(self, doctor_id: int) -> Doctor:
-        doctor = self.doctor_crud._get(doctor_id)
-        return doctor
+        self.doctor_id = int(doctor_id)
+        self.availability = DoctorAvailability()
 
     def exec(self) -> dict:
-        appointment_schedule = self._get_appointment_schedule()
+        appointment_schedule = self.availability.get(self.doctor_id)
         return appointment_schedule
 
-    def _get_appointment_schedule(self) -> dict:
-        constructor = AppointmentShceduleDataConstructor(
-            self._get_doctor_schedule(), self._get_doctor_appointments()
+    def get_version(self) -> str:
+        version = self.availability.get_version(self.doctor_id)
+        return version
+
+
+class AsyncAppointmentBookingFormDataConstructor(AsyncBaseService):
+    """
+    Only queries are run on the event loop. The compact payload reads the
+    availability index and the price catalog, which may load themselves in
+    their own sync sessions, so it is encoded in a thread
+    """
+    @override
+    def __init__(
+            self,
+            session: AsyncSession,
+            request: Request,
+            payload: str = settings.booking_form_payload
+    ) -> None:
+        super().__init__(session)
+        self.request = request
+        self.payload = payload
+
+    async def exec(self) -> dict:
+        if self.payload != "compact":
+            content = await self.run_sync(
+                lambda session: self._get_constructor(session).exec()
+            )
+            return content
+        patient_data, specialties = await self.run_sync(self._load)
+        options_data = await asyncio.to_thread(
+            CompactBookingPayload(specialties).exec
+        )
+        content = {"patient": patient_data, "options": options_data}
+        return content
+
+    def _load(self, session: Session) -> tuple[dict, Sequence[Specialty]]:
+        constructor = self._get_constructor(session)
+        patient_data = constructor._get_patient_data()
+        return patient_data, constructor._get_specialties()
+
+    def _get_constructor(
+            self, session: Session
+    ) -> AppointmentBookingFormDataConstructor:
+        constructor = AppointmentBookingFormDataConstructor(
+            session, self.request, self.payload
+        )
+        return constructor
+
+
+class AsyncAppointmentRescheduleFormDataConstructor(AsyncBaseService):
+    @override
+    def __init__(self, session: AsyncSession, doctor_id: int) -> None:
+        super().__init__(session)
+        self.doctor_id = doctor_id
+        self.availability = DoctorAvailability()
+        self.index = AsyncAvailabilityRedis()
+
+    async def exec(self) -> dict:
+        """A missing index is built in its own sync session, off the loop"""
+        appointment_schedule = await asyncio.to_thread(
+            self.availability.get, self.doctor_id
         )
-        appointment_schedule = constructor.exec()
         return appointment_schedule
 
-    def _get_doctor_schedule(self) -> dict:
-        schedule = self.doctor_data_constructor._get_schedule()
-        return schedule
+    async def get_version(self) -> str:
+        index_version = await self.index.get_version(self.doctor_id)
+        version = DoctorAvailability.format_version(
+            self.doctor_id, index_version
+        )
+        return version
+
+
+class AsyncBookingFormOptions(AsyncBaseService):
+    """
+    Doctors and services are served from 'CatalogCache', slots from the
+    availability index
+    """
+    doctors_adapter = TypeAdapter(list[DoctorOption])
+    services_adapter = TypeAdapter(list[ServiceOption])
+
+    @override
+    def __init__(
+            self, session: AsyncSession, cache: CatalogCache | None = None
+    ) -> None:
+        super().__init__(session)
+        self.cache = cache or CatalogCache()
+        self.availability = DoctorAvailability()
+
+    async def get_catalog_version(self) -> str:
+        version = await self.cache.get_version()
+        return version
+
+    def get_slots_version(self, doctor_id: int) -> str:
+        version = self.availability.get_version(doctor_id)
+        return version
 
-    def _get_doctor_appointments(self) -> AppointmentTimes:
-        appointments = self.doctor_data_constructor._get_appointments()
-        return appointments
+    async def get_doctors(self, specialty_id: int) -> list[DoctorOption]:
+        doctors = await self.cache.get(
+            f"form-doctors:{specialty_id}",
+            self.doctors_adapter,
+            lambda: self.run_sync(
+                lambda session: BookingFormOptions(
+                    session, self.availability
+                ).get_doctors(specialty_id)
+            )
+        )
+        return doctors
+
+    async def get_services(self, doctor_id: int) -> list[ServiceOption]:
+        services = await self.cache.get(
+            f"form-services:{doctor_id}",
+            self.services_adapter,
+            lambda: self._load_services(doctor_id)
+        )
+        return services
+
+    async def _load_services(self, doctor_id: int) -> list[ServiceOption]:
+        await PriceCatalog.preload()
+        services = await self.run_sync(
+            lambda session: BookingFormOptions(
+                session, self.availability
+            ).get_services(doctor_id)
+        )
+        return services
+
+    def get_slots(
+            self,
+            doctor_id: int,
+            start: date | None = None,
+            end: date | None = None
+    ) -> FreeTimes:
+        """
+        The index is in Redis, no session is needed. Blocks while a missing
+        index is built, so it is called from a worker thread
+        """
+        try:
+            slots = self.availability.get_range(doctor_id, start, end)
+        except NoResultFound:
+            raise DoctorNotFound()
+        return slots
 
 
 def get_booking_form_data_constructor(
@@ -116,3 +428,26 @@ def get_reschedule_data_constructor(
 ) -> AppointmentRescheduleFormDataConstructor:
     constructor = AppointmentRescheduleFormDataConstructor(session, id)
     return constructor
+
+
+async def get_async_booking_form_data_constructor(
+        request: Request,
+        session: AsyncSession = Depends(MySQLConnection.get_async_session),
+) -> AsyncAppointmentBookingFormDataConstructor:
+    constructor = AsyncAppointmentBookingFormDataConstructor(session, request)
+    return constructor
+
+
+async def get_async_reschedule_data_constructor(
+        id: int,
+        session: AsyncSession = Depends(MySQLConnection.get_async_session)
+) -> AsyncAppointmentRescheduleFormDataConstructor:
+    constructor = AsyncAppointmentRescheduleFormDataConstructor(session, id)
+    return constructor
+
+
+async def get_async_booking_form_options(
+        session: AsyncSession = Depends(MySQLConnection.get_async_session)
+) -> AsyncBookingFormOptions:
+    options = AsyncBookingFormOptions(session)
+    return options
@@ -0,0 +1,104 @@
+"""
+Hashing strategies of OTP codes. The algorithm, with its cost, is stored
+alongside every code, so codes issued before a configuration change are
+still verified with the strategy they were hashed by
+"""
+
+import hashlib
+import hmac
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from config import Config
+
+settings = Config.get_settings()
+
+
+def pbkdf2(value: str, salt: bytes, iterations: int) -> bytes:
+    """Module level, so it can be pickled into the process pool"""
+    hashed = hashlib.pbkdf2_hmac(
+        "sha256", value.encode("utf-8"), salt, iterations
+    )
+    return hashed
+
+
+class HMACHasher:
+    """
+    Keyed with a server pepper. A single HMAC is enough for a code that
+    lives for minutes, as the pepper never leaves the server
+    """
+    name = "hmac-sha256"
+
+    def __init__(self, pepper: str = settings.otp_pepper) -> None:
+        self.pepper = pepper.encode("utf-8")
+
+    @property
+    def algorithm(self) -> str:
+        return self.name
+
+    def hash(self, value: str, salt: bytes) -> bytes:
+        hashed = hmac.new(
+            self.pepper, salt + value.encode("utf-8"), hashlib.sha256
+        ).digest()
+        return hashed
+
+
+class PBKDF2Hasher:
+    """Is run in 'executor' if one is given, off the request thread"""
+    name = "pbkdf2-sha256"
+
+    def __init__(
+            self,
+            iterations: int = settings.otp_pbkdf2_iterations,
+            executor: Executor | None = None
+    ) -> None:
+        self.iterations = iterations
+        self.executor = executor
+
+    @property
+    def algorithm(self) -> str:
+        return f"{self.name}:{self.iterations}"
+
+    def hash(self, value: str, salt: bytes) -> bytes:
+        if self.executor is None:
+            return pbkdf2(value, salt, self.iterations)
+        future = self.executor.submit(pbkdf2, value, salt, self.iterations)
+        return future.result()
+
+
+type OTPHasher = HMACHasher | PBKDF2Hasher
+
+
+class OTPHashers:
+    _executor: ProcessPoolExecutor | None = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_default(cls) -> OTPHasher:
+        hasher = cls.from_algorithm(settings.otp_hash_algorithm)
+        return hasher
+
+    @classmethod
+    def from_algorithm(cls, algorithm: str) -> OTPHasher:
+        """'algorithm' is the name with the cost, e.g. 'pbkdf2-sha256:1000'"""
+        name, _, cost = algorithm.partition(":")
+        if name == HMACHasher.name:
+            return HMACHasher()
+        if name == PBKDF2Hasher.name:
+            return PBKDF2Hasher(
+                int(cost or settings.otp_pbkdf2_iterations),
+                cls.get_executor()
+            )
+        raise ValueError(f"Unknown OTP hashing algorithm: {algorithm}")
+
+    @classmethod
+    def get_executor(cls) -> ProcessPoolExecutor | None:
+        """Is started on first use, when 'otp_hash_workers' is set"""
+        if not settings.otp_hash_workers:
+            return None
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=settings.otp_hash_workers
+                )
+        return cls._executor
@@ -0,0 +1,170 @@
+"""
+Signing keys of JWT tokens. Every token carries the id of the key it was
+signed with in its 'kid' header, so it is verified by every worker sharing
+the keyring, and keeps being verified after its key is rotated out, until
+the token itself expires.
+
+Usage (to rotate the shared key at once, from the repository root):
+    PYTHONPATH=src python -m service.keyring_services
+"""
+
+import math
+import secrets
+import threading
+import time
+
+from config import Config
+from model.auth_models import JWTKey
+from data.auth_data import JWTKeyRedis
+
+settings = Config.get_settings()
+
+
+class SettingsKeyring:
+    """
+    Keys of 'jwt_keys'. A key is rotated by deploying the new key alongside
+    the old one, then switching 'jwt_active_kid' to it
+    """
+    def __init__(
+            self,
+            keys: dict[str, str] = settings.jwt_keys,
+            active_kid: str | None = settings.jwt_active_kid
+    ) -> None:
+        if not keys:
+            raise ValueError("No JWT keys are set in 'jwt_keys'")
+        self.keys = {
+            kid: JWTKey(kid=kid, secret=secret)
+            for kid, secret
+            in keys.items()
+        }
+        self.active_kid = active_kid or list(keys)[-1]
+        if self.active_kid not in self.keys:
+            raise ValueError(f"Unknown active JWT key: {self.active_kid}")
+
+    def get_active(self) -> JWTKey:
+        return self.keys[self.active_kid]
+
+    def get(self, kid: str) -> JWTKey | None:
+        return self.keys.get(kid)
+
+
+class RedisKeyring:
+    """
+    Keys shared by the workers through Redis. A worker reloads them every
+    'refresh_interval' seconds, and the first one to find the active key
+    older than 'rotation_interval' adds a new key. A new key signs only
+    after a 'refresh_interval', by when every worker has loaded it, while
+    the older keys keep verifying for 'retention', the longest lifetime of
+    a token
+    """
+    def __init__(
+            self,
+            storage: JWTKeyRedis | None = None,
+            rotation_interval: int = settings.jwt_key_rotation_interval,
+            retention: int = settings.jwt_key_retention,
+            refresh_interval: int = settings.jwt_keyring_refresh_interval
+    ) -> None:
+        self.storage = storage or JWTKeyRedis()
+        self.rotation_interval = rotation_interval
+        self.retention = retention
+        self.refresh_interval = refresh_interval
+        self.keys: dict[str, JWTKey] = {}
+        self.loaded_at = -math.inf
+        self._lock = threading.Lock()
+
+    def get_active(self) -> JWTKey:
+        """The newest key every worker has had the time to load"""
+        self._refresh()
+        published_before = time.time() - self.refresh_interval
+        keys = sorted(self.keys.values(), key=lambda key: key.created_at)
+        published = [key for key in keys if key.created_at <= published_before]
+        return (published or keys)[-1]
+
+    def get(self, kid: str) -> JWTKey | None:
+        """
+        An unknown key may have been added since the last load, which is
+        then reloaded at once, though not more often than every second
+        """
+        self._refresh()
+        if kid not in self.keys:
+            self._refresh(min_interval=1)
+        return self.keys.get(kid)
+
+    def rotate(self) -> JWTKey:
+        key = JWTKey(
+            kid=secrets.token_hex(8),
+            secret=secrets.token_hex(32),
+            created_at=time.time()
+        )
+        self.storage.add(key)
+        self._prune()
+        self._load()
+        return key
+
+    def _refresh(self, min_interval: float | None = None) -> None:
+        if min_interval is None:
+            min_interval = self.refresh_interval
+        if time.monotonic() - self.loaded_at < min_interval:
+            return
+        with self._lock:
+            if time.monotonic() - self.loaded_at < min_interval:
+                return
+            self._load()
+            if not self.keys or (
+                    self._is_rotation_due()
+                    and self.storage.lock_rotation(
+                        max(self.refresh_interval, 1)
+                    )
+            ):
+                self.rotate()
+
+    def _load(self) -> None:
+        self.keys = {key.kid: key for key in self.storage.get_all()}
+        self.loaded_at = time.monotonic()
+
+    def _is_rotation_due(self) -> bool:
+        newest = max(self.keys.values(), key=lambda key: key.created_at)
+        return time.time() - newest.created_at >= self.rotation_interval
+
+    def _prune(self) -> None:
+        """
+        A key stops signing when the next one starts, so tokens it signed
+        expire at most 'retention' after that
+        """
+        keys = sorted(self.storage.get_all(), key=lambda key: key.created_at)
+        expired_before = time.time() - self.retention - self.refresh_interval
+        retired = [
+            key.kid
+            for key, next_key
+            in zip(keys, keys[1:])
+            if next_key.created_at < expired_before
+        ]
+        self.storage.delete(*retired)
+
+
+type JWTKeyring = SettingsKeyring | RedisKeyring
+
+
+class JWTKeyrings:
+    _default: JWTKeyring | None = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_default(cls) -> JWTKeyring:
+        """Is shared by the worker, so the keys are loaded once per refresh"""
+        with cls._lock:
+            if cls._default is None:
+                cls._default = cls.from_source(settings.jwt_keyring)
+        return cls._default
+
+    @classmethod
+    def from_source(cls, source: str) -> JWTKeyring:
+        if source == "settings":
+            return SettingsKeyring()
+        if source == "redis":
+            return RedisKeyring()
+        raise ValueError(f"Unknown JWT keyring: {source}")
+
+
+if __name__ == "__main__":
+    print(RedisKeyring().rotate().kid)
@@ -1,18 +1,30 @@
+from collections.abc import Callable
+from functools import cached_property
 from typing import override
 
 from fastapi import Depends
 from sqlalchemy.exc import NoResultFound
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from exceptions.exc import DataDoesNotMatch, AppointmentNotFound
-from model.patient_models import PatientCreate, PatientOuter
-from model.appointment_models import AppointmentOuter, AppointmentDateTime
-from service.base_services import BaseService
-from service.auth_services import authorize
+from model.patient_models import (
+    PatientCreate, PatientOuter, PatientWithAppointments
+)
+from model.appointment_models import (
+    AppointmentCursor,
+    AppointmentDateTime,
+    AppointmentOuter,
+    AppointmentPage
+)
+from service.base_services import AsyncBaseService, BaseService
+from service.auth_services import authorize, authorize_async
 from data.connections import MySQLConnection
 from data.base_data import BaseCRUD
 from data.patient_data import PatientCRUD
-from data.appointment_data import Appointment
+from data.appointment_data import Appointment, AppointmentCRUD
+from data.availability_data import AsyncAvailabilityRedis, AvailabilityRedis
+from data.sql_models import Status
 
 
 class BasePatientService(BaseService):
@@ -87,7 +99,13 @@ class PatientPage(BasePatientService):
     @override
     def __init__(self, session: Session, patient_id: str) -> None:
         super().__init__(session)
-        self.patient = self.crud.get_with_appointments(patient_id)
+        self.patient_id = patient_id
+        self.availability = AvailabilityRedis()
+
+    @cached_property
+    def patient(self) -> PatientWithAppointments:
+        patient = self.crud.get_with_appointments(self.patient_id)
+        return patient
 
     @property
     def patient_crud(self) -> PatientCRUD:
@@ -106,21 +124,60 @@ class PatientPage(BasePatientService):
 
     def update_info(self, form: PatientCreate) -> None:
         update_data = form.model_dump()
-        self.patient_crud.update(self.patient.id, update_data)
+        self.patient_crud.update(self.patient_id, update_data)
         self.session.commit()
 
     def reschedule_appointment(
             self, id: int, form: AppointmentDateTime
     ) -> None:
+        appointment = self.get_appointment(id)
+        previous = appointment.model_copy()
         update_data = form.model_dump()
-        self._update_appointment(id, update_data)
+        with self.availability.writing(appointment.doctor_id):
+            self._update_appointment(id, update_data)
+            if appointment.status == Status.PENDING:
+                self._free_appointment_time(previous)
+                self._take_appointment_time(appointment.doctor_id, form)
 
     def change_appointment_status(self, id: int, status: str) -> None:
-        update_data = self._prepare_update_appointment_data(id, status)
-        self._update_appointment(id, update_data)
-
-    def _prepare_update_appointment_data(self, id: int, status: str) -> dict:
         appointment = self.get_appointment(id)
+        previous_status = appointment.status
+        update_data = self._prepare_update_appointment_data(
+            appointment, status
+        )
+        with self.availability.writing(appointment.doctor_id):
+            self._update_appointment(id, update_data)
+            self._sync_availability(appointment, previous_status)
+
+    def _sync_availability(
+            self, appointment: AppointmentOuter, previous_status: str
+    ) -> None:
+        if self._frees_time(previous_status, appointment.status):
+            self._free_appointment_time(appointment)
+        elif self._takes_time(previous_status, appointment.status):
+            self._take_appointment_time(appointment.doctor_id, appointment)
+
+    @staticmethod
+    def _frees_time(previous_status: str, status: str) -> bool:
+        return previous_status == Status.PENDING and status != Status.PENDING
+
+    @staticmethod
+    def _takes_time(previous_status: str, status: str) -> bool:
+        return status == Status.PENDING and previous_status != Status.PENDING
+
+    def _free_appointment_time(self, appointment: AppointmentOuter) -> None:
+        self.availability.add(
+            appointment.doctor_id, appointment.date, appointment.time
+        )
+
+    def _take_appointment_time(
+            self, doctor_id: int, appointment: AppointmentDateTime
+    ) -> None:
+        self.availability.remove(doctor_id, appointment.date, appointment.time)
+
+    def _prepare_update_appointment_data(
+            self, appointment: AppointmentOuter, status: str
+    ) -> dict:
         appointment.status = status
         appointment_dumped = appointment.model_dump(exclude=["doctor", "price"])
         return appointment_dumped
@@ -130,31 +187,117 @@ class PatientPage(BasePatientService):
         self.session.commit()
 
     def get_appointment(self, id: int) -> AppointmentOuter:
-        for appointment in self.patient.appointments:
-            if appointment.id == id:
-                return appointment
-        else:
+        """Looked up by (id, patient_id) without loading the whole patient"""
+        try:
+            appointment = self.appointment_outer_crud.get_outer_by_patient(
+                id, self.patient_id_bytes
+            )
+        except NoResultFound:
             raise AppointmentNotFound()
+        return appointment
 
     def get_appointments(self, status: str) -> list[AppointmentOuter]:
-        filtered_appointments = [
-                appointment
-                for appointment
-                in self.patient.appointments
-                if appointment.status == status
-            ]
-        sorted_appointments = self._sort_appointments_by_date(
-            filtered_appointments
+        """Filtered by status and sorted by date in the database"""
+        appointments = self.appointment_outer_crud.get_all_outer_by_patient(
+            self.patient_id_bytes, status
         )
-        return sorted_appointments
+        return appointments
 
-    def _sort_appointments_by_date(
-            self, appointments: list[AppointmentOuter]
-    ) -> list[AppointmentOuter]:
-        sorted_appointments = sorted(
-            appointments, key=lambda appointment: appointment.date
+    def get_appointments_page(
+            self, status: str, cursor: str | None = None, limit: int = 20
+    ) -> AppointmentPage:
+        page = self.appointment_outer_crud.get_page_outer_by_patient(
+            self.patient_id_bytes,
+            status,
+            limit,
+            AppointmentCursor.decode(cursor) if cursor else None
         )
-        return sorted_appointments
+        return page
+
+    @property
+    def appointment_outer_crud(self) -> AppointmentCRUD:
+        return AppointmentCRUD(self.session)
+
+    @property
+    def patient_id_bytes(self) -> bytes:
+        return self.crud.uuid_to_bytes(self.patient_id)
+
+
+class AsyncPatientPage(AsyncBaseService):
+    """
+    Runs 'PatientPage' routines on the event loop. Writes to appointments
+    update the availability index with the async client around them
+    """
+    @override
+    def __init__(self, session: AsyncSession, patient_id: str) -> None:
+        super().__init__(session)
+        self.patient_id = patient_id
+        self.availability = AsyncAvailabilityRedis()
+
+    async def get_patient_public(self) -> PatientCreate:
+        patient_public = await self._run(lambda page: page.patient_public)
+        return patient_public
+
+    async def update_info(self, form: PatientCreate) -> None:
+        await self._run(lambda page: page.update_info(form))
+
+    async def reschedule_appointment(
+            self, id: int, form: AppointmentDateTime
+    ) -> None:
+        appointment = await self.get_appointment(id)
+        doctor_id = appointment.doctor_id
+        async with self.availability.writing(doctor_id):
+            await self._run(
+                lambda page: page._update_appointment(id, form.model_dump())
+            )
+            if appointment.status == Status.PENDING:
+                await self.availability.add(
+                    doctor_id, appointment.date, appointment.time
+                )
+                await self.availability.remove(doctor_id, form.date, form.time)
+
+    async def change_appointment_status(self, id: int, status: str) -> None:
+        appointment = await self.get_appointment(id)
+        previous_status = appointment.status
+        async with self.availability.writing(appointment.doctor_id):
+            await self._run(
+                lambda page: page._update_appointment(
+                    id,
+                    page._prepare_update_appointment_data(appointment, status)
+                )
+            )
+            if PatientPage._frees_time(previous_status, status):
+                await self.availability.add(
+                    appointment.doctor_id, appointment.date, appointment.time
+                )
+            elif PatientPage._takes_time(previous_status, status):
+                await self.availability.remove(
+                    appointment.doctor_id, appointment.date, appointment.time
+                )
+
+    async def get_appointment(self, id: int) -> AppointmentOuter:
+        appointment = await self._run(lambda page: page.get_appointment(id))
+        return appointment
+
+    async def get_appointments(self, status: str) -> list[AppointmentOuter]:
+        appointments = await self._run(
+            lambda page: page.get_appointments(status)
+        )
+        return appointments
+
+    async def get_appointments_page(
+            self, status: str, cursor: str | None = None, limit: int = 20
+    ) -> AppointmentPage:
+        page = await self._run(
+            lambda page: page.get_appointments_page(status, cursor, limit)
+        )
+        return page
+
+    async def _run[T](self, routine: Callable[[PatientPage], T]) -> T:
+        result = await self.run_sync(
+            lambda session: routine(PatientPage(session, self.patient_id))
+        )
+        return result
 
 
 def get_patient_page(
@@ -163,3 +306,11 @@ def get_patient_page(
 ) -> PatientPage:
     patient_page = PatientPage(session, patient_id)
     return patient_page
+
+
+async def get_async_patient_page(
+        session: AsyncSession = Depends(MySQLConnection.get_async_session),
+        patient_id: str = Depends(authorize_async)
+) -> AsyncPatientPage:
+    patient_page = AsyncPatientPage(session, patient_id)
+    return patient_page
@@ -1,9 +1,14 @@
 from fastapi import Depends
+from pydantic import TypeAdapter
 from sqlmodel import Sequence, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from model.service_models import ServiceOuter
+from service.base_services import AsyncBaseService
+from service.catalog_services import CatalogCache
 from data.connections import MySQLConnection
 from data.sql_models import Doctor, Service
-from data.service_data import ServiceCRUD, PriceCalculator
+from data.service_data import AsyncServiceCRUD, ServiceCRUD, PriceCalculator
 
 
 class ServicePage:
@@ -21,6 +26,33 @@ class ServicePage:
         return sorted_lab_tests
 
 
+class AsyncServicePage(AsyncBaseService):
+    """Pages are served from 'CatalogCache'"""
+    lab_tests_adapter = TypeAdapter(list[ServiceOuter])
+
+    def __init__(
+            self, session: AsyncSession, cache: CatalogCache | None = None
+    ) -> None:
+        super().__init__(session)
+        self.crud = AsyncServiceCRUD(session)
+        self.cache = cache or CatalogCache()
+
+    async def get_version(self) -> str:
+        version = await self.cache.get_version()
+        return version
+
+    async def get_lab_tests(self) -> list[ServiceOuter]:
+        lab_tests = await self.cache.get(
+            "lab-tests", self.lab_tests_adapter, self._get_lab_tests
+        )
+        return lab_tests
+
+    async def _get_lab_tests(self) -> list[ServiceOuter]:
+        lab_tests = await self.crud.get_lab_tests()
+        sorted_lab_tests = sorted(lab_tests, key=lambda s: s.price)
+        return sorted_lab_tests
+
+
 class ServiceDataConstructor:
     def __init__(self, doctor: Doctor) -> None:
         self.doctor = doctor
@@ -53,3 +85,10 @@ def get_service_page(
 ) -> ServicePage:
     service_page = ServicePage(session)
     return service_page
+
+
+async def get_async_service_page(
+        session: AsyncSession = Depends(MySQLConnection.get_async_session)
+) -> AsyncServicePage:
+    service_page = AsyncServicePage(session)
+    return service_page
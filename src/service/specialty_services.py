@@ -1,14 +1,17 @@
 from typing import override
 
 from fastapi import Depends
+from pydantic import TypeAdapter
 from sqlmodel import Session, Sequence
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from model.specialty_models import SpecialtyOuter
-from service.base_services import BaseService
-from service.doctor_services import DoctorDataConstructor
+from model.specialty_models import SpecialtyOuter, SpecialtyShort
+from service.base_services import AsyncBaseService, BaseService
+from service.catalog_services import CatalogCache
+from service.doctor_services import DoctorAvailability, DoctorDataConstructor
 from data.connections import MySQLConnection
-from data.sql_models import Specialty
-from data.specialty_data import SpecialtyCRUD
+from data.sql_models import Doctor, Specialty
+from data.specialty_data import AsyncSpecialtyCRUD, SpecialtyCRUD
 
 
 class SpecialtyPage(BaseService):
@@ -26,20 +29,68 @@ class SpecialtyPage(BaseService):
         return specialty
 
 
+class AsyncSpecialtyPage(AsyncBaseService):
+    """Pages are served from 'CatalogCache'"""
+    specialties_adapter = TypeAdapter(list[SpecialtyShort])
+    specialty_adapter = TypeAdapter(SpecialtyOuter)
+
+    @override
+    def __init__(
+            self, session: AsyncSession, cache: CatalogCache | None = None
+    ) -> None:
+        super().__init__(session)
+        self.crud = AsyncSpecialtyCRUD(session)
+        self.cache = cache or CatalogCache()
+
+    async def get_version(self) -> str:
+        version = await self.cache.get_version()
+        return version
+
+    async def get_all_specialties(self) -> list[SpecialtyShort]:
+        specialties = await self.cache.get(
+            "specialties", self.specialties_adapter, self._get_all_specialties
+        )
+        return specialties
+
+    async def get_detailed_info(self, title: str) -> SpecialtyOuter:
+        specialty = await self.cache.get(
+            f"specialty:{title}",
+            self.specialty_adapter,
+            lambda: self.crud.get_by_title(title)
+        )
+        return specialty
+
+    async def _get_all_specialties(self) -> list[SpecialtyShort]:
+        specialties = [
+            SpecialtyShort(**specialty.model_dump())
+            for specialty
+            in await self.crud.get_all()
+        ]
+        return specialties
+
+
 class SpecialtyDataConstructor(BaseService):
     @override
     def __init__(
-            self, session: Session, specialties: Sequence[Specialty]
+            self,
+            session: Session,
+            specialties: Sequence[Specialty],
+            availability: DoctorAvailability | None = None
     ) -> None:
         super().__init__(session)
         self.specialties = specialties
+        self.availability = availability or DoctorAvailability()
 
     @property
     def doctor_data_constructor(self) -> DoctorDataConstructor:
-        constructor = DoctorDataConstructor(self.specialty.doctors)
+        constructor = DoctorDataConstructor(
+            self.specialty.doctors, free_times=self.free_times
+        )
         return constructor
 
     def exec(self) -> list[dict]:
+        """Free times of all doctors are fetched at once"""
+        self.free_times = self.availability.get_many(self._get_doctors())
         dumped_specialties = [
             self._dump(specialty) for specialty in self.specialties
         ]
@@ -58,9 +109,26 @@ class SpecialtyDataConstructor(BaseService):
         doctors = self.doctor_data_constructor.exec()
         self.dumped_specialty.update({"doctors": doctors})
 
+    def _get_doctors(self) -> list[Doctor]:
+        doctors = {
+            doctor.id: doctor
+            for specialty
+            in self.specialties
+            for doctor
+            in specialty.doctors
+        }
+        return list(doctors.values())
+
 
 def get_specialty_page(
         session: Session = Depends(MySQLConnection.get_session)
 ) -> SpecialtyPage:
     specialty_page = SpecialtyPage(session)
     return specialty_page
+
+
+async def get_async_specialty_page(
+        session: AsyncSession = Depends(MySQLConnection.get_async_session)
+) -> AsyncSpecialtyPage:
+    specialty_page = AsyncSpecialtyPage(session)
+    return specialty_page
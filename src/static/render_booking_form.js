@@ -1,7 +1,8 @@
 document.addEventListener("DOMContentLoaded", () => {
-  const formData = JSON.parse(
+  const optionsData = JSON.parse(
     document.getElementById("form-data").textContent
   );
+  const urls = document.getElementById("appointment-form").dataset;
 
   const specialties = document.getElementById("specialties");
   const doctors = document.getElementById("doctors");
@@ -9,86 +10,199 @@ document.addEventListener("DOMContentLoaded", () => {
   const appointment_date = document.getElementById("appointment_date");
   const appointment_time = document.getElementById("appointment_time");
 
-  doctors.innerHTML = "<option value=''>Select doctor</option>";
-  doctors.disabled = true;
-  services.innerHTML = "<option value=''>Select service</option>";
-  services.disabled = true;
-  appointment_date.innerHTML = "<option value=''>Select appointment date</option>";
-  appointment_date.disabled = true;
-  appointment_time.innerHTML = "<option value=''>Select appointment time</option>";
-  appointment_time.disabled = true;
+  let slots = Promise.resolve({});
 
-  Object.values(formData).forEach((specialty) => {
-    specialties.add(new Option(specialty.title, specialty.id));
-  })
+  const fetchJSON = (url, params) => {
+    const query = new URLSearchParams(params);
+    return fetch(`${url}?${query}`).then((response) => {
+      if (!response.ok) {
+        throw new Error(`HTTP error! Status: ${response.status}`);
+      }
+      return response.json();
+    });
+  };
 
-  specialties.addEventListener("change", () => {
-    const specialty = specialties.value;
+  // Options are requested from the server per selection
+  const lazySource = () => ({
+    specialties: optionsData.specialties,
+    doctors: (specialty) => fetchJSON(
+      urls.doctorsUrl, { specialty_id: specialty }
+    ),
+    services: (doctor) => fetchJSON(urls.servicesUrl, { doctor_id: doctor }),
+    slots: (doctor) => fetchJSON(urls.slotsUrl, { doctor_id: doctor }),
+  });
 
-    doctors.innerHTML = "<option value=''>Select doctor</option>";
-    doctors.disabled = !specialty;
+  const addDays = (start, offset) => {
+    const date = new Date(`${start}T00:00:00Z`);
+    date.setUTCDate(date.getUTCDate() + offset);
+    return date.toISOString().slice(0, 10);
+  };
 
-    const specialtyArr = formData[specialty - 1];
-    for (const specialtyElem of formData) {
-      if (specialty == specialtyElem.id) {
-        Object.values(specialtyArr.doctors).forEach((doctor) => {
-          doctors.add(new Option(doctor.full_name, doctor.id));
-        });
+  const decodeTimes = (times, slot) => {
+    const decoded = [];
+    let mask = BigInt(`0x${slot}`);
+    for (let index = 0; mask > 0n; index++, mask >>= 1n) {
+      if (mask & 1n) {
+        decoded.push(times[index]);
       }
     }
+    return decoded.sort();
+  };
+
+  // Every option is embedded into the page in the columnar format built by
+  // 'CompactBookingPayload'
+  const compactSource = () => {
+    const { start, times, prices } = optionsData;
+    const doctorsTable = optionsData.doctors;
+    const servicesTable = optionsData.services;
+    const specialtiesTable = optionsData.specialties;
+    const doctorIndices = new Map(
+      doctorsTable.id.map((id, index) => [String(id), index])
+    );
+    const specialtyIndices = new Map(
+      specialtiesTable.id.map((id, index) => [String(id), index])
+    );
+
+    const doctor = (index) => ({
+      id: doctorsTable.id[index],
+      full_name: doctorsTable.full_name[index],
+    });
+    const service = (doctorIndex, position) => {
+      const index = doctorsTable.services[doctorIndex][position];
+      return {
+        id: servicesTable.id[index],
+        title: servicesTable.title[index],
+        price: prices[doctorsTable.prices[doctorIndex][position]],
+      };
+    };
+    const schedule = (doctorIndex) => {
+      const decoded = {};
+      doctorsTable.days[doctorIndex].forEach((offset, position) => {
+        decoded[addDays(start, offset)] = decodeTimes(
+          times, doctorsTable.slots[doctorIndex][position]
+        );
+      });
+      return decoded;
+    };
+
+    return {
+      specialties: specialtiesTable.id.map((id, index) => ({
+        id: id, title: specialtiesTable.title[index],
+      })),
+      doctors: async (specialty) => specialtiesTable.doctors[
+        specialtyIndices.get(specialty)
+      ].map(doctor),
+      services: async (id) => {
+        const index = doctorIndices.get(id);
+        return doctorsTable.services[index].map(
+          (_, position) => service(index, position)
+        );
+      },
+      slots: async (id) => schedule(doctorIndices.get(id)),
+    };
+  };
+
+  const source = optionsData.format === "compact"
+    ? compactSource()
+    : lazySource();
+
+  const reset = (select, placeholder, disabled = true) => {
+    select.innerHTML = `<option value=''>${placeholder}</option>`;
+    select.disabled = disabled;
+  };
+
+  const resetDoctors = () => reset(doctors, "Select doctor");
+  const resetServices = () => reset(services, "Select service");
+  const resetDates = () => reset(appointment_date, "Select appointment date");
+  const resetTimes = () => reset(appointment_time, "Select appointment time");
+
+  resetDoctors();
+  resetServices();
+  resetDates();
+  resetTimes();
+
+  source.specialties.forEach((specialty) => {
+    specialties.add(new Option(specialty.title, specialty.id));
   });
 
-  doctors.addEventListener("change", () => {
+  specialties.addEventListener("change", async () => {
     const specialty = specialties.value;
+
+    resetDoctors();
+    resetServices();
+    resetDates();
+    resetTimes();
+    if (!specialty) {
+      return;
+    }
+
+    const doctorsData = await source.doctors(specialty);
+    if (specialty !== specialties.value) {
+      return;
+    }
+    doctorsData.forEach((doctor) => {
+      doctors.add(new Option(doctor.full_name, doctor.id));
+    });
+    doctors.disabled = false;
+  });
+
+  doctors.addEventListener("change", async () => {
     const doctor = doctors.value;
 
-    services.innerHTML = "<option value=''>Select service</option>";
-    services.disabled = !doctor;
-    
-    const doctorsArr = formData[specialty - 1].doctors;
-    for (const doctorsElem of doctorsArr) {
-      if (doctor == doctorsElem.id) {
-        Object.values(doctorsElem.services).forEach((service) => {
-          services.add(new Option(`${service.title}: ${service.price}`, service.id));
-        });
-      }
+    resetServices();
+    resetDates();
+    resetTimes();
+    if (!doctor) {
+      return;
+    }
+
+    // Slots are prefetched while the service is being chosen
+    slots = source.slots(doctor);
+    const servicesData = await source.services(doctor);
+    if (doctor !== doctors.value) {
+      return;
     }
+    servicesData.forEach((service) => {
+      services.add(new Option(`${service.title}: ${service.price}`, service.id));
+    });
+    services.disabled = false;
   });
 
-  services.addEventListener("change", () => {
-    const specialty = specialties.value;
+  services.addEventListener("change", async () => {
     const doctor = doctors.value;
 
-    appointment_date.innerHTML = "<option value=''>Select appointment date</option>";
-    appointment_date.disabled = !doctor;
-    appointment_time.innerHTML = "<option value=''>Select appointment time</option>";
-    appointment_time.disabled = true;
-
-    const doctorsArr = formData[specialty - 1].doctors;
-    for (const doctorsElem of doctorsArr) {
-      if (doctor == doctorsElem.id) {
-        Object.keys(doctorsElem.schedule).forEach((date) => {
-          appointment_date.add(new Option(date, date));
-        });
-      }
+    resetDates();
+    resetTimes();
+    if (!services.value) {
+      return;
+    }
+
+    const schedule = await slots;
+    if (doctor !== doctors.value) {
+      return;
     }
+    Object.keys(schedule).forEach((date) => {
+      appointment_date.add(new Option(date, date));
+    });
+    appointment_date.disabled = false;
   });
 
-  appointment_date.addEventListener("change", () => {
-    const specialty = specialties.value;
+  appointment_date.addEventListener("change", async () => {
     const doctor = doctors.value;
     const date = appointment_date.value;
 
-    appointment_time.innerHTML = "<option value=''>Select appointment time</option>";
-    appointment_time.disabled = !appointment_date;
+    resetTimes();
+    if (!date) {
+      return;
+    }
 
-    const doctorsArr = formData[specialty - 1].doctors;
-    for (const doctorsElem of doctorsArr) {
-      if (doctor == doctorsElem.id) {
-        Object.values(doctorsElem.schedule[date]).forEach((time) => {
-          appointment_time.add(new Option(time, time));
-        });
-      }
+    const schedule = await slots;
+    if (doctor !== doctors.value || date !== appointment_date.value) {
+      return;
     }
+    Object.values(schedule[date]).forEach((time) => {
+      appointment_time.add(new Option(time, time));
+    });
+    appointment_time.disabled = false;
   });
 });
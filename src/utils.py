@@ -2,6 +2,7 @@ import base64
 import json
 from pathlib import Path
 
+from sqlalchemy import Engine, event
 from sqlalchemy.orm.exc import ObjectDeletedError
 from sqlmodel import Session, inspect
 
@@ -137,3 +138,20 @@ class SetUpTest:
     def _delete_entry(self, entry: BaseSQLModel) -> None:
         self.session.delete(entry)
         self.session.commit()
+
+
+class QueryCounter:
+    """Counts statements sent to the database inside the `with` block"""
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.count = 0
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._increment)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._increment)
+
+    def _increment(self, *args) -> None:
+        self.count += 1
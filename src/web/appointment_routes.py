@@ -1,18 +1,25 @@
-from fastapi import APIRouter, Depends, Request, status
-from fastapi.responses import RedirectResponse
+from datetime import date
+
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, RedirectResponse
 from fastapi_utils.cbv import cbv
 from jose.exceptions import ExpiredSignatureError
 from starlette.templating import _TemplateResponse
 
-from web.base_routes import BaseRouter
+from web.base_routes import BaseRouter, ConditionalGet
 from model.form_models import AppointmentBookingForm
 from service.appointment_services import (
-    AppointmentBooking,
-    get_appointment_booking,
-    AppointmentJWTTokenService,
-    get_appointment_jwt_token_service
+    AsyncAppointmentBooking,
+    get_async_appointment_booking,
+    AsyncAppointmentJWTTokenService,
+    get_async_appointment_jwt_token_service
+)
+from service.form_services import (
+    AsyncBookingFormOptions,
+    get_async_booking_form_data_constructor,
+    get_async_booking_form_options
 )
-from service.form_services import get_booking_form_data_constructor
 
 router = APIRouter(prefix="/appointments")
 
@@ -25,40 +32,113 @@ class Appointment(BaseRouter):
         status_code=status.HTTP_200_OK,
         response_class=_TemplateResponse
     )
-    def get_appointment(
+    async def get_appointment(
             self,
             request: Request,
-            form_content=Depends(get_booking_form_data_constructor)
+            form_content=Depends(get_async_booking_form_data_constructor)
     ) -> _TemplateResponse:
-        form = form_content.exec()
+        form = await form_content.exec()
         content = {"request": request, "form": form}
         return self.template.TemplateResponse("appointment_new.html", content)
 
+    @router.get(
+        "/new/doctors",
+        name="form_doctors",
+        response_class=JSONResponse,
+        status_code=status.HTTP_200_OK
+    )
+    async def get_form_doctors(
+            self,
+            request: Request,
+            specialty_id: int,
+            options: AsyncBookingFormOptions = Depends(
+                get_async_booking_form_options
+            )
+    ) -> Response:
+        conditional = ConditionalGet(
+            request, await options.get_catalog_version()
+        )
+        if conditional.is_not_modified():
+            return conditional.not_modified()
+        doctors = await options.get_doctors(specialty_id)
+        response = JSONResponse(jsonable_encoder(doctors))
+        return conditional.apply(response)
+
+    @router.get(
+        "/new/services",
+        name="form_services",
+        response_class=JSONResponse,
+        status_code=status.HTTP_200_OK
+    )
+    async def get_form_services(
+            self,
+            request: Request,
+            doctor_id: int,
+            options: AsyncBookingFormOptions = Depends(
+                get_async_booking_form_options
+            )
+    ) -> Response:
+        conditional = ConditionalGet(
+            request, await options.get_catalog_version()
+        )
+        if conditional.is_not_modified():
+            return conditional.not_modified()
+        services = await options.get_services(doctor_id)
+        response = JSONResponse(jsonable_encoder(services))
+        return conditional.apply(response)
+
+    @router.get(
+        "/new/slots",
+        name="form_slots",
+        response_class=JSONResponse,
+        status_code=status.HTTP_200_OK
+    )
+    def get_form_slots(
+            self,
+            request: Request,
+            doctor_id: int,
+            start: date | None = None,
+            end: date | None = None,
+            options: AsyncBookingFormOptions = Depends(
+                get_async_booking_form_options
+            )
+    ) -> Response:
+        conditional = ConditionalGet(
+            request, options.get_slots_version(doctor_id)
+        )
+        if conditional.is_not_modified():
+            return conditional.not_modified()
+        slots = options.get_slots(doctor_id, start, end)
+        response = JSONResponse(slots)
+        return conditional.apply(response)
+
     @router.post(
         "/new",
         name="send_form",
         status_code=status.HTTP_303_SEE_OTHER,
         response_class=RedirectResponse
     )
-    def create_appointment(
+    async def create_appointment(
             self,
             form: AppointmentBookingForm = Depends(AppointmentBookingForm.as_form),
-            service: AppointmentBooking = Depends(get_appointment_booking)
+            service: AsyncAppointmentBooking = Depends(
+                get_async_appointment_booking
+            )
     ) -> RedirectResponse:
-        response = service.exec(form)
+        response = await service.exec(form)
         return response
 
     @router.get("/view", name="info", status_code=status.HTTP_200_OK)
-    def created_info(
+    async def created_info(
             self,
             request: Request,
             token: str,
-            service: AppointmentJWTTokenService = Depends(
-                get_appointment_jwt_token_service
+            service: AsyncAppointmentJWTTokenService = Depends(
+                get_async_appointment_jwt_token_service
             )
     ) -> None:
         try:
-            appointment = service.get_appointment(token)
+            appointment = await service.get_appointment(token)
         except ExpiredSignatureError:
             response = RedirectResponse(
                 url=request.app.url_path_for("Main.main"),
@@ -8,7 +8,9 @@ from sqlmodel import Session
 from logger.setup import get_logger
 from web.base_routes import BaseRouter, Prefixes
 from model.form_models import PhoneForm, OTPCodeForm
-from service.auth_services import AuthService, OTPCodeService, get_auth_service
+from service.auth_services import (
+    AuthService, AsyncOTPCodeService, get_auth_service
+)
 from data.connections import MySQLConnection
 
 login_router = APIRouter(prefix=f"{Prefixes.AUTH}/login")
@@ -29,13 +31,13 @@ class Login(BaseRouter):
 
     @login_router.post(
         "/", status_code=status.HTTP_303_SEE_OTHER, name="form")
-    def send_form(
+    async def send_form(
             self,
             request: Request,
             form: PhoneForm = Depends(PhoneForm.as_form),
     ) -> RedirectResponse:
         try:
-            OTPCodeService().create(form.phone)
+            await AsyncOTPCodeService().create(form.phone)
         except ValidationError as exc:
             content = {
                 "request": request,
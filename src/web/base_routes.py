@@ -1,10 +1,158 @@
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+from collections.abc import Awaitable, Callable, Collection
+from typing import Any
+
+from fastapi import Request, Response, status
+from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
 from config import Config
+from data.page_data import AsyncPageRedis
+
+settings = Config.get_settings()
+
+type Loader = Callable[[], Awaitable[Any]]
+
+
+class PageCache:
+    """
+    Rendered pages keyed by template, URL and the version of the data they
+    are built from, so a hit skips both the database and Jinja. Only the
+    query parameters a page is rendered from are part of the key, so
+    arbitrary ones don't multiply the entries. Pages are kept in an LRU per
+    template within the worker, with 'AsyncPageRedis' shared between
+    workers behind it. Both are bounded by 'page_cache_sizes', templates
+    missing there or sized 0 are rendered every time
+    """
+    def __init__(
+            self,
+            templates: Jinja2Templates,
+            store: AsyncPageRedis | None = None,
+            sizes: dict[str, int] | None = None
+    ) -> None:
+        self.templates = templates
+        self.store = store or AsyncPageRedis()
+        self.sizes = settings.page_cache_sizes if sizes is None else sizes
+        self._pages: dict[str, OrderedDict[str, bytes]] = defaultdict(
+            OrderedDict
+        )
+        self._lock = threading.Lock()
+
+    async def render(
+            self,
+            request: Request,
+            name: str,
+            version: str,
+            params: Collection[str] = (),
+            **loaders: Loader
+    ) -> Response:
+        """
+        'loaders' produce the template context on a miss, 'params' are the
+        query parameters the page depends on
+        """
+        if not self.sizes.get(name):
+            return await self._render(request, name, loaders)
+        key = self._get_key(request, name, version, params)
+        page = await self._get(name, key)
+        if page is not None:
+            return HTMLResponse(page)
+        response = await self._render(request, name, loaders)
+        self._keep(name, key, response.body)
+        await self.store.set(name, key, response.body, self.sizes[name])
+        return response
+
+    async def _render(
+            self, request: Request, name: str, loaders: dict[str, Loader]
+    ) -> Response:
+        content = {"request": request}
+        for content_name, load in loaders.items():
+            content[content_name] = await load()
+        response = self.templates.TemplateResponse(name, content)
+        return response
+
+    async def _get(self, name: str, key: str) -> bytes | None:
+        with self._lock:
+            pages = self._pages[name]
+            page = pages.get(key)
+            if page is not None:
+                pages.move_to_end(key)
+                return page
+        page = await self.store.get(key)
+        if page is not None:
+            self._keep(name, key, page)
+        return page
+
+    def _keep(self, name: str, key: str, page: bytes) -> None:
+        with self._lock:
+            pages = self._pages[name]
+            pages[key] = page
+            pages.move_to_end(key)
+            while len(pages) > self.sizes[name]:
+                pages.popitem(last=False)
+
+    def _get_key(
+            self,
+            request: Request,
+            name: str,
+            version: str,
+            params: Collection[str]
+    ) -> str:
+        """The base URL is kept, as links are rendered with it"""
+        query = sorted(
+            (param, value)
+            for param, value
+            in request.query_params.multi_items()
+            if param in params
+        )
+        digest = hashlib.sha1(
+            f"{request.base_url}{request.url.path}?{query}:{version}".encode()
+        ).hexdigest()
+        return f"{name}:{digest}"
 
 
 class BaseRouter:
     template = Jinja2Templates(directory=Config.templates_dir)
+    pages = PageCache(template)
+
+
+class ConditionalGet:
+    """
+    Weak ETag derived from the URL and the version of the data a response
+    is built from. Requests already holding it are answered with '304 Not Modified'
+    before anything is rendered
+    """
+    def __init__(self, request: Request, version: str) -> None:
+        self.request = request
+        validated = f"{request.url.path}?{request.url.query}:{version}"
+        digest = hashlib.sha1(validated.encode()).hexdigest()[:16]
+        self.etag = f'W/"{digest}"'
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Caches have to revalidate before reusing the response"""
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        return headers
+
+    def is_not_modified(self) -> bool:
+        if_none_match = self.request.headers.get("if-none-match")
+        if if_none_match is None:
+            return False
+        etags = {etag.strip() for etag in if_none_match.split(",")}
+        return "*" in etags or bool(
+            {self.etag, self.etag.removeprefix("W/")} & etags
+        )
+
+    def not_modified(self) -> Response:
+        response = Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers
+        )
+        return response
+
+    def apply[T: Response](self, response: T) -> T:
+        response.headers.update(self.headers)
+        return response
 
 
 class Prefixes:
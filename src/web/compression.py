@@ -0,0 +1,307 @@
+"""
+Response compression. Dynamic responses are compressed on the fly by
+'CompressionMiddleware', static assets are compressed once at build time by
+'StaticAssetCompressor' and served as they are by 'PrecompressedStaticFiles'.
+
+Brotli is an optional dependency, without it only gzip is offered.
+
+Usage (at build time, from the repository root):
+    PYTHONPATH=src python -m web.compression src/static
+"""
+
+import os
+import stat
+import sys
+import zlib
+from collections.abc import Iterable
+from mimetypes import guess_type
+from pathlib import Path
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class GzipEncoder:
+    name = "gzip"
+    suffix = ".gz"
+
+    def __init__(self, level: int = 6) -> None:
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush()
+
+
+class BrotliEncoder:
+    name = "br"
+    suffix = ".br"
+
+    def __init__(self, quality: int = 5) -> None:
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self.compressor.finish()
+
+
+type Encoder = GzipEncoder | BrotliEncoder
+
+
+class ContentEncoding:
+    """Picks the encoding of a response from the request's Accept-Encoding"""
+    encoders: dict[str, type[Encoder]] = {
+        "br": BrotliEncoder, "gzip": GzipEncoder
+    }
+
+    def __init__(self, encodings: Iterable[str] = ("br", "gzip")) -> None:
+        self.encodings = [
+            encoding
+            for encoding
+            in encodings
+            if encoding in self.encoders and self.is_available(encoding)
+        ]
+
+    @classmethod
+    def is_available(cls, encoding: str) -> bool:
+        return encoding != "br" or brotli is not None
+
+    def choose(self, headers: Headers) -> str | None:
+        """The first of the configured encodings the client accepts"""
+        accepted = self._parse(headers.get("accept-encoding", ""))
+        for encoding in self.encodings:
+            if accepted.get(encoding, accepted.get("*", 0)) > 0:
+                return encoding
+        return None
+
+    def _parse(self, header: str) -> dict[str, float]:
+        accepted = {}
+        for item in header.split(","):
+            encoding, _, params = item.strip().partition(";")
+            if not encoding:
+                continue
+            accepted[encoding.strip().lower()] = self._get_quality(params)
+        return accepted
+
+    def _get_quality(self, params: str) -> float:
+        name, _, value = params.strip().partition("=")
+        if name.strip() != "q":
+            return 1
+        try:
+            return float(value)
+        except ValueError:
+            return 0
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses of the listed content types which are at least
+    'minimum_size' bytes long. Responses that already carry a
+    Content-Encoding, e.g. pre-compressed static assets, are passed through
+    """
+    def __init__(
+            self,
+            app: ASGIApp,
+            encodings: Iterable[str] = ("br", "gzip"),
+            minimum_size: int = 1024,
+            content_types: Iterable[str] = ("text/html", "application/json"),
+            gzip_level: int = 6,
+            brotli_quality: int = 5
+    ) -> None:
+        self.app = app
+        self.content_encoding = ContentEncoding(encodings)
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types)
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+
+    async def __call__(
+            self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.content_encoding.choose(Headers(scope=scope))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def get_encoder(self, encoding: str) -> Encoder:
+        encoder = ContentEncoding.encoders[encoding](self.levels[encoding])
+        return encoder
+
+    def is_compressible(self, headers: MutableHeaders) -> bool:
+        content_type = headers.get("content-type", "")
+        compressible = (
+            "content-encoding" not in headers
+            and content_type.startswith(self.content_types)
+        )
+        return compressible
+
+
+class CompressionResponder:
+    """
+    Holds back the start of the response until its first chunk of the body
+    shows whether it is worth compressing
+    """
+    def __init__(
+            self, middleware: CompressionMiddleware, encoding: str, send: Send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.inner_send = send
+        self.start: Message | None = None
+        self.encoder: Encoder | None = None
+        self.started = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+        elif message["type"] != "http.response.body":
+            await self.inner_send(message)
+        elif not self.started:
+            await self._send_first(message)
+        elif self.encoder is not None:
+            await self._send_compressed(message)
+        else:
+            await self.inner_send(message)
+
+    async def _send_first(self, message: Message) -> None:
+        self.started = True
+        headers = MutableHeaders(raw=self.start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.middleware.is_compressible(headers) or (
+                not more_body and len(body) < self.middleware.minimum_size
+        ):
+            await self.inner_send(self.start)
+            await self.inner_send(message)
+            return
+        self.encoder = self.middleware.get_encoder(self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        del headers["Content-Length"]
+        await self.inner_send(self.start)
+        await self._send_compressed(message)
+
+    async def _send_compressed(self, message: Message) -> None:
+        more_body = message.get("more_body", False)
+        body = self.encoder.compress(message.get("body", b""))
+        if not more_body:
+            body += self.encoder.flush()
+        await self.inner_send({
+            "type": "http.response.body", "body": body, "more_body": more_body
+        })
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    Serves the '.br' or '.gz' sibling of an asset written by
+    'StaticAssetCompressor' when the client accepts it and the sibling is
+    not older than the asset
+    """
+    def __init__(
+            self, *args, encodings: Iterable[str] = ("br", "gzip"), **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.content_encoding = ContentEncoding(encodings)
+
+    def file_response(
+            self,
+            full_path: os.PathLike,
+            stat_result: os.stat_result,
+            scope: Scope,
+            status_code: int = 200
+    ) -> Response:
+        encoding = self.content_encoding.choose(Headers(scope=scope))
+        compressed = self._lookup_compressed(full_path, stat_result, encoding)
+        if compressed is None:
+            response = super().file_response(
+                full_path, stat_result, scope, status_code
+            )
+            return response
+        compressed_path, compressed_stat = compressed
+        response = FileResponse(
+            compressed_path,
+            status_code=status_code,
+            stat_result=compressed_stat,
+            media_type=guess_type(full_path)[0] or "text/plain",
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _lookup_compressed(
+            self,
+            full_path: os.PathLike,
+            stat_result: os.stat_result,
+            encoding: str | None
+    ) -> tuple[str, os.stat_result] | None:
+        if encoding is None:
+            return None
+        suffix = ContentEncoding.encoders[encoding].suffix
+        compressed_path = f"{full_path}{suffix}"
+        try:
+            compressed_stat = os.stat(compressed_path)
+        except FileNotFoundError:
+            return None
+        if (
+                not stat.S_ISREG(compressed_stat.st_mode)
+                or compressed_stat.st_mtime < stat_result.st_mtime
+        ):
+            return None
+        return compressed_path, compressed_stat
+
+
+class StaticAssetCompressor:
+    """Writes '.gz' and '.br' siblings of the assets with the best levels"""
+    extensions = (".js", ".css", ".html", ".svg", ".json")
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        self.directory = Path(directory)
+        self.levels = {"gzip": 9, "br": 11}
+
+    def exec(self) -> list[Path]:
+        written = [
+            self._write(asset, encoding)
+            for asset
+            in self._get_assets()
+            for encoding
+            in self.levels
+            if ContentEncoding.is_available(encoding)
+        ]
+        return written
+
+    def _get_assets(self) -> list[Path]:
+        assets = sorted(
+            path
+            for path
+            in self.directory.rglob("*")
+            if path.is_file() and path.suffix in self.extensions
+        )
+        return assets
+
+    def _write(self, asset: Path, encoding: str) -> Path:
+        encoder = ContentEncoding.encoders[encoding](self.levels[encoding])
+        compressed = encoder.compress(asset.read_bytes()) + encoder.flush()
+        path = asset.with_name(asset.name + encoder.suffix)
+        path.write_bytes(compressed)
+        return path
+
+
+if __name__ == "__main__":
+    for path in StaticAssetCompressor(sys.argv[1]).exec():
+        print(path)
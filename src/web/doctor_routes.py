@@ -1,11 +1,10 @@
-from fastapi import APIRouter, status, Depends, Request
+from fastapi import APIRouter, status, Depends, Request, Response
 from fastapi.responses import JSONResponse
 from fastapi_utils.cbv import cbv
-from starlette.templating import _TemplateResponse
 
-from service.doctor_services import DoctorPage, get_doctor_page
-from service.form_services import get_reschedule_data_constructor
-from web.base_routes import BaseRouter
+from service.doctor_services import AsyncDoctorPage, get_async_doctor_page
+from service.form_services import get_async_reschedule_data_constructor
+from web.base_routes import BaseRouter, ConditionalGet
 
 router = APIRouter(prefix="/doctors")
 
@@ -13,18 +12,23 @@ router = APIRouter(prefix="/doctors")
 @cbv(router)
 class Doctor(BaseRouter):
     @router.get("/{id}", name="doctor", status_code=status.HTTP_200_OK)
-    def get(
+    async def get(
             self,
             request: Request,
             id: str,
-            doctor_page: DoctorPage = Depends(get_doctor_page)
-    ) -> _TemplateResponse:
-        doctor = doctor_page.get_detailed_info(int(id))
-        content = {"request": request, "doctor": doctor}
-        response = self.template.TemplateResponse(
-            "doctor_detail.html", content
+            doctor_page: AsyncDoctorPage = Depends(get_async_doctor_page)
+    ) -> Response:
+        version = await doctor_page.get_version()
+        conditional = ConditionalGet(request, version)
+        if conditional.is_not_modified():
+            return conditional.not_modified()
+        response = await self.pages.render(
+            request,
+            "doctor_detail.html",
+            version,
+            doctor=lambda: doctor_page.get_detailed_info(int(id))
         )
-        return response
+        return conditional.apply(response)
 
     @router.get(
         "/{id}/schedule",
@@ -32,10 +36,15 @@ class Doctor(BaseRouter):
         response_class=JSONResponse,
         status_code=status.HTTP_200_OK
     )
-    def schedule(
+    async def schedule(
             self,
+            request: Request,
             id: str,
-            constructor=Depends(get_reschedule_data_constructor)
-    ):
-        appointment_schedule = constructor.exec()
-        return appointment_schedule
+            constructor=Depends(get_async_reschedule_data_constructor)
+    ) -> Response:
+        conditional = ConditionalGet(request, await constructor.get_version())
+        if conditional.is_not_modified():
+            return conditional.not_modified()
+        appointment_schedule = await constructor.exec()
+        response = JSONResponse(appointment_schedule)
+        return conditional.apply(response)
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, status
+from fastapi_utils.cbv import cbv
+
+from model.cache_models import CacheStatistics
+from model.connection_models import (
+    PoolStatistics, RedisPoolStatistics, StatementCacheStatistics
+)
+from web.base_routes import BaseRouter
+from service.auth_services import TokenCache
+from data.connections import MySQLConnection, RedisConnection
+from data.reference_data import ReferenceCache
+
+router = APIRouter(prefix="/health")
+
+
+@cbv(router)
+class Health(BaseRouter):
+    @router.get("/db-pool", name="db_pool", status_code=status.HTTP_200_OK)
+    def db_pool(self) -> PoolStatistics:
+        pool_statistics = MySQLConnection.get_pool_statistics()
+        return pool_statistics
+
+    @router.get(
+        "/db-async-pool",
+        name="db_async_pool",
+        status_code=status.HTTP_200_OK
+    )
+    async def db_async_pool(self) -> PoolStatistics:
+        pool_statistics = MySQLConnection.get_async_pool_statistics()
+        return pool_statistics
+
+    @router.get(
+        "/redis-async-pool",
+        name="redis_async_pool",
+        status_code=status.HTTP_200_OK
+    )
+    async def redis_async_pool(self) -> RedisPoolStatistics:
+        pool_statistics = RedisConnection.get_async_pool_statistics()
+        return pool_statistics
+
+    @router.get(
+        "/statement-cache",
+        name="statement_cache",
+        status_code=status.HTTP_200_OK
+    )
+    def statement_cache(self) -> StatementCacheStatistics:
+        cache_statistics = MySQLConnection.get_statement_cache_statistics()
+        return cache_statistics
+
+    @router.get(
+        "/async-statement-cache",
+        name="async_statement_cache",
+        status_code=status.HTTP_200_OK
+    )
+    async def async_statement_cache(self) -> StatementCacheStatistics:
+        cache_statistics = (
+            MySQLConnection.get_async_statement_cache_statistics()
+        )
+        return cache_statistics
+
+    @router.get(
+        "/reference-cache",
+        name="reference_cache",
+        status_code=status.HTTP_200_OK
+    )
+    def reference_cache(self) -> CacheStatistics:
+        cache_statistics = ReferenceCache.statistics()
+        return cache_statistics
+
+    @router.get(
+        "/token-cache",
+        name="token_cache",
+        status_code=status.HTTP_200_OK
+    )
+    def token_cache(self) -> CacheStatistics:
+        cache_statistics = TokenCache.statistics()
+        return cache_statistics
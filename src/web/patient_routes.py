@@ -1,12 +1,12 @@
-from fastapi import APIRouter, Depends, status, Request
+from fastapi import APIRouter, Depends, Query, status, Request
 from fastapi.responses import RedirectResponse
 from fastapi_utils.cbv import cbv
 from starlette.templating import _TemplateResponse
 
-from model.appointment_models import AppointmentDateTime
+from model.appointment_models import AppointmentDateTime, AppointmentPage
 from model.form_models import PatientUpdateForm
 from web.base_routes import Prefixes, BaseRouter
-from service.patient_services import PatientPage, get_patient_page
+from service.patient_services import AsyncPatientPage, get_async_patient_page
 from data.sql_models import Status
 
 patient_appointments_router = APIRouter(prefix=f"{Prefixes.MY}/appointments")
@@ -20,14 +20,22 @@ class PatientAppointment(BaseRouter):
         name="all",
         status_code=status.HTTP_200_OK,
     )
-    def get_all(
+    async def get_all(
             self,
             request: Request,
             appointment_status: str = "pending",
-            patient_page: PatientPage = Depends(get_patient_page)
+            cursor: str | None = None,
+            limit: int = Query(default=20, ge=1, le=100),
+            patient_page: AsyncPatientPage = Depends(get_async_patient_page)
     ) -> _TemplateResponse:
-        appointments = patient_page.get_appointments(appointment_status)
-        content = {"request": request, "appointments": appointments}
+        page = await patient_page.get_appointments_page(
+            appointment_status, cursor, limit
+        )
+        content = {
+            "request": request,
+            "appointments": page.appointments,
+            "next_url": self._get_next_url(request, page, appointment_status)
+        }
         response = self.template.TemplateResponse(
             "my_appointments.html", content
         )
@@ -35,13 +43,13 @@ class PatientAppointment(BaseRouter):
 
     @patient_appointments_router.get(
         "/{id}", name="appointment", status_code=status.HTTP_200_OK)
-    def get(
+    async def get(
             self,
             request: Request,
             id: str,
-            patient_page: PatientPage = Depends(get_patient_page)
+            patient_page: AsyncPatientPage = Depends(get_async_patient_page)
     ) -> _TemplateResponse:
-        appointment = patient_page.get_appointment(int(id))
+        appointment = await patient_page.get_appointment(int(id))
         content = {"request": request, "appointment": appointment}
         response = self.template.TemplateResponse(
             "my_appointment_info.html", content
@@ -51,15 +59,15 @@ class PatientAppointment(BaseRouter):
     @patient_appointments_router.put(
         "/{id}", name="appointment", status_code=status.HTTP_200_OK
     )
-    def update(
+    async def update(
             self,
             request: Request,
             id: str,
             form: AppointmentDateTime,
-            patient_page: PatientPage = Depends(get_patient_page)
+            patient_page: AsyncPatientPage = Depends(get_async_patient_page)
     ) -> RedirectResponse:
         appointment_id = self._convert_appointment_id(id)
-        patient_page.reschedule_appointment(appointment_id, form)
+        await patient_page.reschedule_appointment(appointment_id, form)
         url = request.app.url_path_for("PatientAppointment.appointment", id=id)
         response = RedirectResponse(
             url=url, status_code=status.HTTP_303_SEE_OTHER
@@ -69,20 +77,30 @@ class PatientAppointment(BaseRouter):
     @patient_appointments_router.patch(
         "/{id}", name="appointment", status_code=status.HTTP_200_OK
     )
-    def cancel(
+    async def cancel(
             self,
             request: Request,
             id: str,
-            patient_page: PatientPage = Depends(get_patient_page)
+            patient_page: AsyncPatientPage = Depends(get_async_patient_page)
     ) -> RedirectResponse:
         appointment_id = self._convert_appointment_id(id)
-        patient_page.change_appointment_status(appointment_id, Status.CANCELLED)
+        await patient_page.change_appointment_status(appointment_id, Status.CANCELLED)
         url = request.app.url_path_for("PatientAppointment.appointment", id=id)
         response = RedirectResponse(
             url=url, status_code=status.HTTP_303_SEE_OTHER
         )
         return response
 
+    def _get_next_url(
+            self, request: Request, page: AppointmentPage, status: str
+    ) -> str | None:
+        if page.next_cursor is None:
+            return None
+        url = request.url.include_query_params(
+            appointment_status=status, cursor=page.next_cursor
+        )
+        return str(url)
+
     def _convert_appointment_id(self, id: str) -> int:
         id = int(id)
         return id
@@ -92,12 +110,13 @@ class PatientAppointment(BaseRouter):
 class PatientInfo(BaseRouter):
     @patient_info_router.get(
         "/", name="info", status_code=status.HTTP_200_OK)
-    def get(
+    async def get(
             self,
             request: Request,
-            patient_page: PatientPage = Depends(get_patient_page)
+            patient_page: AsyncPatientPage = Depends(get_async_patient_page)
     ) -> _TemplateResponse:
-        content = {"request": request, "patient": patient_page.patient_public}
+        patient = await patient_page.get_patient_public()
+        content = {"request": request, "patient": patient}
         response = self.template.TemplateResponse("my_info.html", content)
         return response
 
@@ -105,13 +124,13 @@ class PatientInfo(BaseRouter):
     @patient_info_router.put(
         "/", name="info", status_code=status.HTTP_200_OK
     )
-    def update(
+    async def update(
             self,
             request: Request,
             form: PatientUpdateForm = Depends(PatientUpdateForm.as_form),
-            patient_page: PatientPage = Depends(get_patient_page)
+            patient_page: AsyncPatientPage = Depends(get_async_patient_page)
     ) -> RedirectResponse:
-        patient_page.update_info(form)
+        await patient_page.update_info(form)
         url = request.app.url_path_for("PatientInfo.info")
         response = RedirectResponse(
             url=url, status_code=status.HTTP_303_SEE_OTHER
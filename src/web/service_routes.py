@@ -1,9 +1,8 @@
-from fastapi import APIRouter, status, Depends, Request
+from fastapi import APIRouter, status, Depends, Request, Response
 from fastapi_utils.cbv import cbv
-from starlette.templating import _TemplateResponse
 
-from service.service_services import ServicePage, get_service_page
-from web.base_routes import BaseRouter
+from service.service_services import AsyncServicePage, get_async_service_page
+from web.base_routes import BaseRouter, ConditionalGet
 
 router = APIRouter(prefix="/services")
 
@@ -11,14 +10,19 @@ router = APIRouter(prefix="/services")
 @cbv(router)
 class Service(BaseRouter):
     @router.get("/lab-tests", name="lab_tests", status_code=status.HTTP_200_OK)
-    def get_lab_tests(
+    async def get_lab_tests(
             self,
             request: Request,
-            service_page: ServicePage = Depends(get_service_page)
-    ) -> _TemplateResponse:
-        lab_tests = service_page.get_lab_tests()
-        content = {"request": request, "lab_tests": lab_tests}
-        response = self.template.TemplateResponse(
-            "lab_tests.html", content
+            service_page: AsyncServicePage = Depends(get_async_service_page)
+    ) -> Response:
+        version = await service_page.get_version()
+        conditional = ConditionalGet(request, version)
+        if conditional.is_not_modified():
+            return conditional.not_modified()
+        response = await self.pages.render(
+            request,
+            "lab_tests.html",
+            version,
+            lab_tests=service_page.get_lab_tests
         )
-        return response
+        return conditional.apply(response)
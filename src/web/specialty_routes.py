@@ -1,9 +1,11 @@
-from fastapi import APIRouter, status, Request, Depends
+from fastapi import APIRouter, status, Request, Response, Depends
 from fastapi_utils.cbv import cbv
-from starlette.templating import _TemplateResponse
 
-from service.specialty_services import SpecialtyPage, get_specialty_page
-from web.base_routes import BaseRouter
+from service.specialty_services import (
+    AsyncSpecialtyPage,
+    get_async_specialty_page
+)
+from web.base_routes import BaseRouter, ConditionalGet
 
 router = APIRouter(prefix="/specialties")
 
@@ -11,26 +13,42 @@ router = APIRouter(prefix="/specialties")
 @cbv(router)
 class Specialty(BaseRouter):
     @router.get("/", name="all", status_code=status.HTTP_200_OK)
-    def get_all(
+    async def get_all(
             self,
             request: Request,
-            specialty_page: SpecialtyPage = Depends(get_specialty_page)
-    ) -> _TemplateResponse:
-        specialties = specialty_page.get_all_specialties()
-        content = {"request": request, "specialties": specialties}
-        response = self.template.TemplateResponse("specialties.html", content)
-        return response
+            specialty_page: AsyncSpecialtyPage = Depends(
+                get_async_specialty_page
+            )
+    ) -> Response:
+        version = await specialty_page.get_version()
+        conditional = ConditionalGet(request, version)
+        if conditional.is_not_modified():
+            return conditional.not_modified()
+        response = await self.pages.render(
+            request,
+            "specialties.html",
+            version,
+            specialties=specialty_page.get_all_specialties
+        )
+        return conditional.apply(response)
 
     @router.get("/{title}", name="specialty", status_code=status.HTTP_200_OK)
-    def get(
+    async def get(
             self,
             request: Request,
             title: str,
-            specialty_page: SpecialtyPage = Depends(get_specialty_page),
-    ) -> _TemplateResponse:
-        specialty = specialty_page.get_detailed_info(title)
-        content = {"request": request, "specialty": specialty}
-        response = self.template.TemplateResponse(
-            "specialty_detail.html", content
+            specialty_page: AsyncSpecialtyPage = Depends(
+                get_async_specialty_page
+            ),
+    ) -> Response:
+        version = await specialty_page.get_version()
+        conditional = ConditionalGet(request, version)
+        if conditional.is_not_modified():
+            return conditional.not_modified()
+        response = await self.pages.render(
+            request,
+            "specialty_detail.html",
+            version,
+            specialty=lambda: specialty_page.get_detailed_info(title)
         )
-        return response
+        return conditional.apply(response)
@@ -3,6 +3,8 @@ from pathlib import Path
 
 import pytest
 from fastapi import Response
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 from sqlmodel import Session, SQLModel, Field
 
 from main import app
@@ -43,6 +45,17 @@ def session() -> Session:
     return next(MySQLConnection.get_session())
 
 
+@pytest.fixture(scope="session", autouse=True)
+def async_engine() -> None:
+    """
+    'TestClient' and 'asyncio.run' start a new event loop for every call, and
+    pooled aiomysql connections can't outlive the loop they were opened in
+    """
+    MySQLConnection.async_engine = create_async_engine(
+        MySQLConnection.ASYNC_MYSQL_URL, poolclass=NullPool
+    )
+
+
 @pytest.fixture
 def crud_test(session: Session) -> BaseCRUD:
     return BaseCRUD(session, SQLModelForTest, SQLModelForTest)
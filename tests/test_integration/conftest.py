@@ -16,6 +16,7 @@ from model.appointment_models import AppointmentOuter, AppointmentDateTime
 from service.auth_services import JWTTokenService, OTPCodeService
 from service.appointment_services import AppointmentJWTTokenService
 from service.patient_services import PatientService
+from service.service_services import PriceCalculator
 from data.base_data import BaseSQLModel, BaseCRUD
 from data.sql_models import (
     Appointment, Doctor, ServiceToAppointment, Specialty, Service
@@ -123,8 +124,19 @@ def appointments(
 def converted_appointments(
         appointments: list[Appointment]
 ) -> list[AppointmentOuter]:
-    patient_crud = PatientCRUD(None, None, None)
-    converted_appointments = patient_crud._convert_appointments(appointments)
+    converted_appointments = [
+        AppointmentOuter(
+            **appointment.model_dump(exclude=["patient_id"]),
+            doctor=appointment.doctor.full_name,
+            price=sum(
+                PriceCalculator(appointment.doctor, link.service).exec()
+                for link
+                in appointment.appointment_links
+            )
+        )
+        for appointment
+        in appointments
+    ]
     return converted_appointments
 
 
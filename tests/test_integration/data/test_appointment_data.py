@@ -1,17 +1,19 @@
+from collections.abc import Iterator
+from datetime import date, time, timedelta
 from decimal import Decimal
 
 import pytest
-from sqlmodel import Session
+from sqlalchemy.exc import NoResultFound
+from sqlmodel import Session, select
 
-from logger.setup import get_logger
 from utils import SetUpTest
 from model.appointment_models import AppointmentOuter
 from service.service_services import PriceCalculator
 from data.base_data import BaseCRUD
 from data.sql_models import (
-    Appointment, Service, ServiceToAppointment, Doctor
+    Appointment, DoctorToService, Service, ServiceToAppointment, Doctor
 )
-from data.appointment_data import AppointmentCRUD, AppointmentDataConverter
+from data.appointment_data import AppointmentCRUD
 from tests.test_integration.conftest import (
     BaseDoctorTest, BaseAppointmentTest
 )
@@ -32,12 +34,6 @@ def link_service_to_appointment(
     setup_test.create_entry(entry)
 
 
-@pytest.fixture
-def converter(appointment: Appointment) -> AppointmentDataConverter:
-    converter = AppointmentDataConverter(appointment)
-    return converter
-
-
 @pytest.fixture
 def service(session: Session, service_id: int) -> Service:
     crud = BaseCRUD(session, Service, Service)
@@ -45,6 +41,26 @@ def service(session: Session, service_id: int) -> Service:
     return service
 
 
+@pytest.fixture
+def null_doctor_markup(
+        session: Session, appointment: Appointment, service: Service
+) -> Iterator[Service]:
+    """The doctor's markup of the service is NULL during the test"""
+    link = session.exec(
+        select(DoctorToService).where(
+            DoctorToService.doctor_id == appointment.doctor_id,
+            DoctorToService.service_id == service.id
+        )
+    ).one()
+    markup, link.markup = link.markup, None
+    session.add(link)
+    session.commit()
+    yield service
+    link.markup = markup
+    session.add(link)
+    session.commit()
+
+
 @pytest.fixture
 def calculate_price_expected_output(
         appointment: Appointment, service: Service
@@ -54,11 +70,6 @@ def calculate_price_expected_output(
     return price
 
 
-@pytest.fixture
-def get_services_expected_output(service: Service) -> list[Service]:
-    return [service]
-
-
 @pytest.fixture
 def to_outer_expected_output(
         appointment: Appointment, calculate_price_expected_output: Decimal
@@ -74,29 +85,48 @@ def to_outer_expected_output(
 @pytest.mark.parametrize("patients_data", ["patient_1"], indirect=True)
 @pytest.mark.parametrize("get_appointment", [0], indirect=True)
 @pytest.mark.usefixtures("link_service_to_appointment")
-class TestAppointmentDataConverter(BaseAppointmentTest):
-    @pytest.fixture(autouse=True)
-    def _converter(self, converter: AppointmentDataConverter) -> None:
-        self.converter = converter
-
-    def test_to_otuer(
-            self, to_outer_expected_output: AppointmentOuter
+class TestAppointmentCRUDOuter(BaseAppointmentTest):
+    def test_get_all_outer_by_patient(
+            self,
+            session: Session,
+            appointment: Appointment,
+            to_outer_expected_output: AppointmentOuter
+    ) -> None:
+        crud = AppointmentCRUD(session)
+        appointments = crud.get_all_outer_by_patient(appointment.patient_id)
+        assert appointments == [to_outer_expected_output]
+
+    def test_get_outer_by_patient(
+            self,
+            session: Session,
+            appointment: Appointment,
+            to_outer_expected_output: AppointmentOuter
     ) -> None:
-        outer = self.converter.to_outer()
+        crud = AppointmentCRUD(session)
+        outer = crud.get_outer_by_patient(
+            appointment.id, appointment.patient_id
+        )
         assert outer == to_outer_expected_output
 
-    def test__calculate_appointment_price(
-            self, calculate_price_expected_output: Decimal
+    def test_get_outer_by_patient_of_other_patient_fails(
+            self, session: Session, appointment: Appointment
     ) -> None:
-        price = self.converter._calculate_appointment_price()
-        assert price == calculate_price_expected_output
-
-    def test__get_serivces(
-            self, get_services_expected_output: list[Service]
+        crud = AppointmentCRUD(session)
+        with pytest.raises(NoResultFound):
+            crud.get_outer_by_patient(appointment.id, bytes(16))
+
+    def test_get_outer_by_patient_with_null_markup(
+            self,
+            session: Session,
+            appointment: Appointment,
+            null_doctor_markup: Service
     ) -> None:
-        services = self.converter._get_services()
-        assert services == get_services_expected_output
-        get_logger().debug(services)
+        crud = AppointmentCRUD(session)
+        outer = crud.get_outer_by_patient(
+            appointment.id, appointment.patient_id
+        )
+        service = null_doctor_markup
+        assert outer.price == service.type.price + (service.markup or 0)
 
 
 class TestAppointmentCRUD(BaseDoctorTest):
@@ -107,3 +137,40 @@ class TestAppointmentCRUD(BaseDoctorTest):
     def test_get_all_by_doctor(self, doctor: Doctor) -> None:
         appointments = self.crud.get_all_by_doctor(doctor.id)
         assert len(appointments) == 4
+
+    def test_get_pending_times(self, doctor: Doctor) -> None:
+        expected = self._get_pending_times(doctor)
+        start, end = min(expected)[0], max(expected)[0] + timedelta(days=1)
+        pending_times = self.crud.get_pending_times(doctor.id, start, end)
+        assert pending_times == expected
+
+    def test_get_pending_times_is_limited_by_window(
+            self, doctor: Doctor
+    ) -> None:
+        last_date = max(self._get_pending_times(doctor))[0]
+        pending_times = self.crud.get_pending_times(
+            doctor.id, last_date, last_date + timedelta(days=1)
+        )
+        assert pending_times
+        assert all(
+            appointment_date == last_date
+            for appointment_date, _
+            in pending_times
+        )
+
+    def test_get_pending_times_by_doctors(self, doctor: Doctor) -> None:
+        expected = self._get_pending_times(doctor)
+        start, end = min(expected)[0], max(expected)[0] + timedelta(days=1)
+        pending_times = self.crud.get_pending_times_by_doctors(
+            [doctor.id, 0], start, end
+        )
+        assert pending_times == {doctor.id: expected, 0: set()}
+
+    def _get_pending_times(self, doctor: Doctor) -> set[tuple[date, time]]:
+        pending_times = {
+            (appointment.date, appointment.time)
+            for appointment
+            in doctor.appointments
+            if appointment.status == "pending"
+        }
+        return pending_times
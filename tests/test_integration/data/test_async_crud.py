@@ -0,0 +1,61 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import pytest
+from sqlmodel import Sequence
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from data.connections import MySQLConnection
+from data.base_data import AsyncBaseCRUD
+from data.sql_models import Doctor, Specialty
+from data.doctor_data import AsyncDoctorCRUD
+from data.specialty_data import AsyncSpecialtyCRUD
+
+
+def run_with_session[T](
+        routine: Callable[[AsyncSession], Awaitable[T]]
+) -> T:
+    async def run() -> T:
+        async with AsyncSession(
+                MySQLConnection.async_engine, expire_on_commit=False
+        ) as session:
+            return await routine(session)
+    return asyncio.run(run())
+
+
+class TestAsyncBaseCRUD:
+    def test_get_all(self, specialties: Sequence[Specialty]) -> None:
+        specialties_db = run_with_session(
+            lambda session: AsyncBaseCRUD(
+                session, Specialty, Specialty
+            ).get_all()
+        )
+        assert len(specialties_db) == len(specialties)
+
+    def test_get(self, specialties: Sequence[Specialty]) -> None:
+        specialty_db = run_with_session(
+            lambda session: AsyncBaseCRUD(
+                session, Specialty, Specialty
+            ).get(specialties[0].id)
+        )
+        assert specialty_db.title == specialties[0].title
+
+
+class TestAsyncSpecialtyCRUD:
+    @pytest.mark.parametrize("specialty", [0], indirect=True)
+    def test_get_by_title(self, specialty: Specialty) -> None:
+        specialty_db = run_with_session(
+            lambda session: AsyncSpecialtyCRUD(session).get_by_title(
+                specialty.title
+            )
+        )
+        assert specialty_db.title == specialty.title
+
+
+class TestAsyncDoctorCRUD:
+    @pytest.mark.parametrize("doctor", [0], indirect=True)
+    def test_get(self, doctor: Doctor) -> None:
+        doctor_db = run_with_session(
+            lambda session: AsyncDoctorCRUD(session).get(doctor.id)
+        )
+        assert doctor_db.id == doctor.id
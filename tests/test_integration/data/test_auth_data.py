@@ -1,3 +1,4 @@
+import asyncio
 import time
 
 import pytest
@@ -5,7 +6,7 @@ import pytest
 from logger.setup import get_logger
 from exceptions.exc import OTPCodeNotFound
 from model.auth_models import OTPCode
-from data.auth_data import OTPCodeRedis
+from data.auth_data import AsyncOTPCodeRedis, OTPCodeRedis
 
 
 class TestOTPRedis:
@@ -41,3 +42,61 @@ class TestOTPRedis:
         otp_redis.delete(otp_set_random.phone)
         with pytest.raises(OTPCodeNotFound):
             otp_redis.get(otp_set_random.phone)
+
+    def test_consume(
+            self, otp_redis: OTPCodeRedis, otp_set_random: OTPCode
+    ) -> None:
+        assert otp_redis.consume(otp_set_random)
+        with pytest.raises(OTPCodeNotFound):
+            otp_redis.get(otp_set_random.phone)
+        assert not otp_redis.consume(otp_set_random)
+
+    def test_consume_keeps_replaced_code(
+            self,
+            otp_redis: OTPCodeRedis,
+            otp_set_random: OTPCode,
+            uuid_bytes: bytes
+    ) -> None:
+        replaced = otp_set_random.model_copy(update={"code": uuid_bytes})
+        assert not otp_redis.consume(replaced)
+        assert otp_redis.get(otp_set_random.phone)
+
+    def test_fail_deletes_code_after_max_attempts(
+            self, otp_redis: OTPCodeRedis, otp_set_random: OTPCode
+    ) -> None:
+        for _ in range(otp_redis.max_attempts - 1):
+            otp_redis.fail(otp_set_random.phone)
+        assert otp_redis.get(otp_set_random.phone)
+        otp_redis.fail(otp_set_random.phone)
+        with pytest.raises(OTPCodeNotFound):
+            otp_redis.get(otp_set_random.phone)
+
+    def test_set_resets_attempts(
+            self, otp_redis: OTPCodeRedis, otp_set_random: OTPCode
+    ) -> None:
+        otp_redis.fail(otp_set_random.phone)
+        otp_redis.set(otp_set_random)
+        key = otp_redis._get_key(otp_set_random.phone)
+        assert otp_redis.conn.hget(key, "attempts") is None
+
+    def test_set_sets_expiry(
+            self, otp_redis: OTPCodeRedis, otp_random: OTPCode
+    ) -> None:
+        otp_redis.set(otp_random)
+        key = otp_redis._get_key(otp_random.phone)
+        assert 0 < otp_redis.conn.ttl(key) <= otp_redis.lifetime
+
+
+class TestAsyncOTPRedis:
+    def test_set_and_get(
+            self, otp_redis: OTPCodeRedis, otp_random: OTPCode
+    ) -> None:
+        async_otp_redis = AsyncOTPCodeRedis()
+
+        async def set_and_get() -> OTPCode:
+            await async_otp_redis.set(otp_random)
+            return await async_otp_redis.get(otp_random.phone)
+
+        otp_from_db = asyncio.run(set_and_get())
+        assert otp_from_db.model_dump() == otp_random.model_dump()
+        otp_redis.delete(otp_random.phone)
@@ -0,0 +1,144 @@
+import asyncio
+from collections.abc import Iterator
+from datetime import date, time, timedelta
+
+import pytest
+
+from data.availability_data import (
+    AsyncAvailabilityRedis, AvailabilityRedis, FreeTimes
+)
+
+TEST_DOCTOR_ID = 0
+
+
+@pytest.fixture
+def availability() -> Iterator[AvailabilityRedis]:
+    availability = AvailabilityRedis()
+    yield availability
+    keys = availability.conn.keys(f"{availability.prefix}{TEST_DOCTOR_ID}:*")
+    if keys:
+        availability.conn.delete(*keys)
+
+
+@pytest.fixture
+def tomorrow() -> date:
+    return date.today() + timedelta(days=1)
+
+
+@pytest.fixture
+def free_times(tomorrow: date) -> FreeTimes:
+    return {tomorrow.isoformat(): ["09:00:00", "09:30:00"]}
+
+
+@pytest.fixture
+def availability_built(
+        availability: AvailabilityRedis, free_times: FreeTimes
+) -> AvailabilityRedis:
+    version = availability.get_version(TEST_DOCTOR_ID)
+    availability.set(TEST_DOCTOR_ID, free_times, version)
+    return availability
+
+
+class TestAvailabilityRedis:
+    def test_get_returns_none_if_not_built(
+            self, availability: AvailabilityRedis
+    ) -> None:
+        assert availability.get(TEST_DOCTOR_ID) is None
+
+    def test_set(
+            self, availability_built: AvailabilityRedis, free_times: FreeTimes
+    ) -> None:
+        assert availability_built.get(TEST_DOCTOR_ID) == free_times
+
+    def test_get_many(
+            self, availability_built: AvailabilityRedis, free_times: FreeTimes
+    ) -> None:
+        free_times_by_doctor = availability_built.get_many(
+            [TEST_DOCTOR_ID, TEST_DOCTOR_ID - 1]
+        )
+        assert free_times_by_doctor == {
+            TEST_DOCTOR_ID: free_times, TEST_DOCTOR_ID - 1: None
+        }
+
+    def test_set_with_outdated_version_is_rejected(
+            self, availability: AvailabilityRedis, free_times: FreeTimes
+    ) -> None:
+        version = availability.get_version(TEST_DOCTOR_ID)
+        availability.delete(TEST_DOCTOR_ID)
+        assert not availability.set(TEST_DOCTOR_ID, free_times, version)
+        assert availability.get(TEST_DOCTOR_ID) is None
+
+    def test_remove(
+            self, availability_built: AvailabilityRedis, tomorrow: date
+    ) -> None:
+        availability_built.remove(TEST_DOCTOR_ID, tomorrow, time(9))
+        free_times = availability_built.get(TEST_DOCTOR_ID)
+        assert free_times == {tomorrow.isoformat(): ["09:30:00"]}
+
+    def test_add(
+            self,
+            availability_built: AvailabilityRedis,
+            free_times: FreeTimes,
+            tomorrow: date
+    ) -> None:
+        availability_built.remove(TEST_DOCTOR_ID, tomorrow, time(9))
+        availability_built.add(TEST_DOCTOR_ID, tomorrow, time(9))
+        assert availability_built.get(TEST_DOCTOR_ID) == free_times
+
+    def test_fully_booked_day_is_omitted(
+            self, availability_built: AvailabilityRedis, tomorrow: date
+    ) -> None:
+        availability_built.remove(TEST_DOCTOR_ID, tomorrow, time(9))
+        availability_built.remove(TEST_DOCTOR_ID, tomorrow, time(9, 30))
+        assert availability_built.get(TEST_DOCTOR_ID) == {}
+
+    def test_get_misses_while_writing(
+            self, availability_built: AvailabilityRedis, free_times: FreeTimes
+    ) -> None:
+        with availability_built.writing(TEST_DOCTOR_ID):
+            assert availability_built.get(TEST_DOCTOR_ID) is None
+        assert availability_built.get(TEST_DOCTOR_ID) == free_times
+
+    def test_set_while_writing_is_rejected(
+            self, availability: AvailabilityRedis, free_times: FreeTimes
+    ) -> None:
+        with availability.writing(TEST_DOCTOR_ID):
+            version = availability.get_version(TEST_DOCTOR_ID)
+            assert not availability.set(TEST_DOCTOR_ID, free_times, version)
+
+    def test_write_ends_on_error(self, availability: AvailabilityRedis) -> None:
+        with pytest.raises(RuntimeError):
+            with availability.writing(TEST_DOCTOR_ID):
+                raise RuntimeError()
+        writing_key = availability._get_writing_key(TEST_DOCTOR_ID)
+        assert not availability.conn.scard(writing_key)
+
+
+class TestAsyncAvailabilityRedis:
+    def test_writing_and_remove(
+            self, availability_built: AvailabilityRedis, tomorrow: date
+    ) -> None:
+        async_availability = AsyncAvailabilityRedis()
+
+        async def book() -> FreeTimes | None:
+            async with async_availability.writing(TEST_DOCTOR_ID):
+                await async_availability.remove(
+                    TEST_DOCTOR_ID, tomorrow, time(9)
+                )
+                return availability_built.get(TEST_DOCTOR_ID)
+
+        assert asyncio.run(book()) is None
+        free_times = availability_built.get(TEST_DOCTOR_ID)
+        assert free_times == {tomorrow.isoformat(): ["09:30:00"]}
+
+    def test_add(
+            self,
+            availability_built: AvailabilityRedis,
+            free_times: FreeTimes,
+            tomorrow: date
+    ) -> None:
+        availability_built.remove(TEST_DOCTOR_ID, tomorrow, time(9))
+        asyncio.run(
+            AsyncAvailabilityRedis().add(TEST_DOCTOR_ID, tomorrow, time(9))
+        )
+        assert availability_built.get(TEST_DOCTOR_ID) == free_times
@@ -0,0 +1,66 @@
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+
+from data.catalog_data import AsyncCatalogRedis, CatalogRedis
+from data.change_data import ChangeNotifier
+
+TEST_PAGE = "test-page"
+
+
+@pytest.fixture
+def catalog() -> Iterator[CatalogRedis]:
+    catalog = CatalogRedis()
+    yield catalog
+    keys = catalog.conn.keys(f"{catalog.prefix}*:{TEST_PAGE}")
+    if keys:
+        catalog.conn.delete(*keys)
+
+
+class TestCatalogRedis:
+    def test_get_returns_none_if_not_cached(
+            self, catalog: CatalogRedis
+    ) -> None:
+        assert catalog.get(TEST_PAGE, catalog.get_version()) is None
+
+    def test_set(self, catalog: CatalogRedis) -> None:
+        version = catalog.get_version()
+        catalog.set(TEST_PAGE, version, b"[]")
+        assert catalog.get(TEST_PAGE, version) == b"[]"
+
+    def test_set_expires(self, catalog: CatalogRedis) -> None:
+        version = catalog.get_version()
+        catalog.set(TEST_PAGE, version, b"[]", lifetime=60)
+        ttl = catalog.conn.ttl(catalog._get_key(TEST_PAGE, version))
+        assert 0 < ttl <= 60
+
+    def test_invalidate(self, catalog: CatalogRedis) -> None:
+        version = catalog.get_version()
+        catalog.set(TEST_PAGE, version, b"[]")
+        catalog.invalidate()
+        assert catalog.get_version() == version + 1
+        assert catalog.get(TEST_PAGE, catalog.get_version()) is None
+
+    def test_change_of_catalog_table_invalidates(
+            self, catalog: CatalogRedis
+    ) -> None:
+        version = catalog.get_version()
+        ChangeNotifier.notify({"specialties"})
+        assert catalog.get_version() == version + 1
+
+
+class TestAsyncCatalogRedis:
+    def test_set(self, catalog: CatalogRedis) -> None:
+        async def set_and_get() -> bytes | None:
+            async_catalog = AsyncCatalogRedis()
+            version = await async_catalog.get_version()
+            await async_catalog.set(TEST_PAGE, version, b"[]")
+            return await async_catalog.get(TEST_PAGE, version)
+
+        assert asyncio.run(set_and_get()) == b"[]"
+
+    def test_sees_invalidation(self, catalog: CatalogRedis) -> None:
+        version = catalog.get_version()
+        catalog.invalidate()
+        assert asyncio.run(AsyncCatalogRedis().get_version()) == version + 1
@@ -1,3 +1,4 @@
+import asyncio
 import importlib
 
 import pytest
@@ -40,3 +41,75 @@ class TestRedisConn:
     def test_incorrect_port_raises_conn_err(self, monkeypatch) -> None:
         monkeypatch.setenv("REDIS_PORT", "6666")
         self.ping_redis_with_error(ConnectionError)
+
+
+class TestMySQLConnectionPool:
+    def test_engine_uses_configured_pool(self) -> None:
+        settings = config.Config.get_settings()
+        pool = conn.MySQLConnection.engine.pool
+        assert isinstance(pool, conn.InstrumentedQueuePool)
+        assert pool.size() == settings.mysql_pool_size
+        assert conn.MySQLConnection.engine.echo == settings.mysql_echo
+
+    def test_pool_statistics_count_checkouts(self) -> None:
+        checkouts = conn.MySQLConnection.get_pool_statistics().checkouts
+        with conn.MySQLConnection.engine.connect() as connection:
+            connection.execute(text("SELECT 1;"))
+            statistics = conn.MySQLConnection.get_pool_statistics()
+            assert statistics.checked_out >= 1
+        assert statistics.checkouts > checkouts
+        assert statistics.wait_time_max >= 0
+
+
+class TestRedisConnectionPool:
+    def get_pool(self, max_connections: int) -> conn.InstrumentedAsyncRedisPool:
+        settings = config.Config.get_settings()
+        pool = conn.InstrumentedAsyncRedisPool(
+            host=settings.redis_host,
+            password=settings.redis_password,
+            port=settings.redis_port,
+            max_connections=max_connections,
+            timeout=0.1
+        )
+        return pool
+
+    def test_async_conn_uses_configured_pool(self) -> None:
+        settings = config.Config.get_settings()
+        pool = conn.RedisConnection.async_conn.connection_pool
+        assert isinstance(pool, conn.InstrumentedAsyncRedisPool)
+        assert pool.max_connections == settings.redis_max_connections
+
+    def test_pool_statistics_count_checkouts(self) -> None:
+        checkouts = conn.RedisConnection.get_async_pool_statistics().checkouts
+        assert asyncio.run(conn.RedisConnection.async_conn.ping())
+        statistics = conn.RedisConnection.get_async_pool_statistics()
+        assert statistics.checkouts > checkouts
+        assert statistics.idle >= 1
+
+    def test_pool_statistics_count_timeouts(self) -> None:
+        pool = self.get_pool(1)
+
+        async def exhaust() -> None:
+            connection = await pool.get_connection()
+            try:
+                with pytest.raises(ConnectionError):
+                    await pool.get_connection()
+            finally:
+                await pool.release(connection)
+
+        asyncio.run(exhaust())
+        assert pool.statistics().timeouts == 1
+
+    def test_pool_is_usable_from_new_event_loop(self) -> None:
+        pool = self.get_pool(1)
+
+        async def ping() -> bool:
+            connection = await pool.get_connection()
+            try:
+                await connection.send_command("PING")
+                return await connection.read_response()
+            finally:
+                await pool.release(connection)
+
+        assert asyncio.run(ping())
+        assert asyncio.run(ping())
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from collections.abc import Generator, Iterator
 from pathlib import Path
 from time import sleep
@@ -6,6 +7,8 @@ import pytest
 from sqlalchemy.exc import NoResultFound
 
 from data.base_data import BaseSQLModel, BaseCRUD
+from data.connections import MySQLConnection
+from data.reference_data import ReferenceCache
 from tests.conftest import SQLModelForTest
 from utils import SetUpTest, read_fixture
 
@@ -78,6 +81,31 @@ class TestBaseCRUD:
         entry = crud_test._get(test_entry.id)
         assert entry.title == test_entry.title
 
+    def test_get_from_reference_cache(
+            self,
+            crud_test: BaseCRUD,
+            test_entry: SQLModelForTest,
+            monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(ReferenceCache, "tables", (crud_test.table,))
+        monkeypatch.setattr(ReferenceCache, "_entries", OrderedDict())
+        crud_test._get(test_entry.id)
+        hits = ReferenceCache.statistics().hits
+        entry = crud_test._get(test_entry.id)
+        assert ReferenceCache.statistics().hits == hits + 1
+        assert entry.title == test_entry.title
+
+    def test_get_hits_statement_cache(
+            self, crud_test: BaseCRUD, test_entry: SQLModelForTest
+    ) -> None:
+        crud_test._select_one(test_entry.id)
+        statistics = MySQLConnection.get_statement_cache_statistics()
+        crud_test._select_one(test_entry.id)
+        assert crud_test._select_by("id") is crud_test._select_by("id")
+        assert MySQLConnection.get_statement_cache_statistics().hits == (
+            statistics.hits + 1
+        )
+
     def test_get_unexisting_entry(self, crud_test: BaseCRUD) -> None:
         with pytest.raises(NoResultFound):
             crud_test._get(0)
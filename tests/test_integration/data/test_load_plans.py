@@ -0,0 +1,96 @@
+from collections.abc import Callable, Iterator
+from datetime import date, time
+
+import pytest
+from sqlmodel import Session, Sequence
+
+from utils import QueryCounter, SetUpTest
+from service.form_services import CompactBookingPayload
+from data.connections import MySQLConnection
+from data.base_data import BaseSQLModel
+from data.doctor_data import DoctorCRUD
+from data.availability_data import AvailabilityRedis
+from data.sql_models import (
+    Doctor,
+    DoctorToService,
+    Service,
+    Specialty,
+    SpecialtyToDoctor,
+    WorkSchedule
+)
+from data.load_plans import BookingFormLoadPlan
+
+type ClinicGrowth = Callable[[int], None]
+
+
+def count_booking_form_queries() -> int:
+    """Availability indexes are dropped, so their build is counted too"""
+    with Session(MySQLConnection.engine) as session:
+        availability = AvailabilityRedis()
+        for doctor in DoctorCRUD(session).get_all():
+            availability.delete(doctor.id)
+    with Session(MySQLConnection.engine) as session:
+        with QueryCounter(MySQLConnection.engine) as counter:
+            specialties = BookingFormLoadPlan(session).exec()
+            CompactBookingPayload(specialties).exec()
+    return counter.count
+
+
+@pytest.fixture
+def grow_clinic(
+        setup_test: SetUpTest, specialties: Sequence[Specialty]
+) -> Iterator[ClinicGrowth]:
+    """Adds doctors with their own services and work days to every specialty"""
+    created: list[list[BaseSQLModel]] = []
+
+    def grow(amount: int) -> None:
+        for specialty in specialties:
+            for number in range(amount):
+                created.append(_add_doctor(setup_test, specialty, number))
+
+    yield grow
+    for entries in reversed(created):
+        setup_test.delete_multiple(list(reversed(entries)))
+
+
+def _add_doctor(
+        setup_test: SetUpTest, specialty: Specialty, number: int
+) -> list[BaseSQLModel]:
+    doctor = setup_test.create_entry(
+        Doctor(
+            first_name="Load",
+            middle_name="Plan",
+            last_name=f"Doctor{number}",
+            experience=date(2015, 1, 1)
+        )
+    )
+    service = setup_test.create_entry(
+        Service(title=f"Load plan service {number}", type_id=1)
+    )
+    links = [
+        SpecialtyToDoctor(doctor_id=doctor.id, specialty_id=specialty.id),
+        DoctorToService(doctor_id=doctor.id, service_id=service.id),
+        WorkSchedule(
+            doctor_id=doctor.id,
+            weekday="0",
+            start_time=time(hour=8),
+            end_time=time(hour=12)
+        )
+    ]
+    setup_test.create_multiple(links)
+    return [doctor, service, *links]
+
+
+class TestBookingFormLoadPlan:
+    def test_exec_returns_all_specialties(
+            self, session: Session, specialties: Sequence[Specialty]
+    ) -> None:
+        loaded = BookingFormLoadPlan(session).exec()
+        assert len(loaded) == len(specialties)
+
+    def test_query_count_is_constant(self, grow_clinic: ClinicGrowth) -> None:
+        query_count = count_booking_form_queries()
+        grow_clinic(3)
+        assert count_booking_form_queries() == query_count
+        grow_clinic(5)
+        assert count_booking_form_queries() == query_count
@@ -0,0 +1,49 @@
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+
+from data.connections import redis_conn
+from data.page_data import AsyncPageRedis
+
+TEST_TEMPLATE = "test-page.html"
+
+
+@pytest.fixture
+def pages() -> Iterator[AsyncPageRedis]:
+    pages = AsyncPageRedis()
+    yield pages
+    keys = redis_conn.keys(f"{pages.prefix}*{TEST_TEMPLATE}*")
+    if keys:
+        redis_conn.delete(*keys)
+
+
+class TestAsyncPageRedis:
+    def test_set(self, pages: AsyncPageRedis) -> None:
+        async def set_and_get() -> bytes | None:
+            await pages.set(
+                TEST_TEMPLATE, f"{TEST_TEMPLATE}:0", b"<p></p>", size=2
+            )
+            return await pages.get(f"{TEST_TEMPLATE}:0")
+
+        assert asyncio.run(set_and_get()) == b"<p></p>"
+
+    def test_set_evicts_oldest_pages(self, pages: AsyncPageRedis) -> None:
+        async def set_three() -> list[bytes | None]:
+            for number in range(3):
+                await pages.set(
+                    TEST_TEMPLATE,
+                    f"{TEST_TEMPLATE}:{number}",
+                    b"<p></p>",
+                    size=2
+                )
+            return [
+                await pages.get(f"{TEST_TEMPLATE}:{number}")
+                for number
+                in range(3)
+            ]
+
+        first, *rest = asyncio.run(set_three())
+        assert first is None
+        assert None not in rest
+        assert redis_conn.zcard(pages._get_index_key(TEST_TEMPLATE)) == 2
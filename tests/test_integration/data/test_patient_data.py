@@ -1,7 +1,9 @@
 import pytest
 
 from logger.setup import get_logger
+from utils import QueryCounter
 from model.patient_models import PatientCreate
+from data.connections import MySQLConnection
 from data.patient_data import PatientCRUD, Patient
 
 
@@ -30,6 +32,18 @@ class TestPatientCRUD:
         assert patient_db.phone == patient.phone
         assert patient_db.id == str_uuid
 
+    def test_lookups_are_memoized_per_session(
+            self, patient_crud: PatientCRUD, patient: Patient
+    ) -> None:
+        patient_crud.get_by_phone(patient.phone)
+        with QueryCounter(MySQLConnection.engine) as counter:
+            by_phone = PatientCRUD(patient_crud.session).get_by_phone(
+                patient.phone
+            )
+            by_id = PatientCRUD(patient_crud.session).get(by_phone.id)
+        assert counter.count == 0
+        assert by_id == by_phone
+
     def test_convert_to_patient_inner(
             self, patient_sql_model: Patient
     ) -> None:
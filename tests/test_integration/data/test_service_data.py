@@ -1,7 +1,11 @@
+import asyncio
+
 import pytest
 
-from data.sql_models import Doctor
-from data.service_data import ServiceDataConverter
+from sqlmodel import Session
+
+from data.sql_models import Doctor, DoctorToService
+from data.service_data import PriceCatalog, ServiceDataConverter
 
 
 class TestServiceDataConstructor:
@@ -10,3 +14,39 @@ class TestServiceDataConstructor:
         converter = ServiceDataConverter(doctor, doctor.services[0])
         service_outer = converter.convert_to_outer()
         assert service_outer.price == 3000
+
+
+@pytest.mark.parametrize("doctor", [0], indirect=True)
+class TestPriceCatalog:
+    def test_get(self, doctor: Doctor) -> None:
+        link = doctor.doctor_links[0]
+        price = PriceCatalog.get(doctor.id, link.service_id)
+        assert price == link.service.price + link.markup
+
+    def test_commit_invalidates_catalog(
+            self, session: Session, doctor: Doctor
+    ) -> None:
+        PriceCatalog.get(doctor.id, doctor.doctor_links[0].service_id)
+        link: DoctorToService = doctor.doctor_links[0]
+        link.markup += 1
+        session.add(link)
+        session.commit()
+        assert PriceCatalog._prices is None
+        price = PriceCatalog.get(doctor.id, link.service_id)
+        link.markup -= 1
+        session.add(link)
+        session.commit()
+        assert price == link.service.price + link.markup + 1
+
+    def test_get_reloads_for_missing_pair(self, doctor: Doctor) -> None:
+        link = doctor.doctor_links[0]
+        PriceCatalog.get(doctor.id, link.service_id)
+        del PriceCatalog._prices[(doctor.id, link.service_id)]
+        price = PriceCatalog.get(doctor.id, link.service_id)
+        assert price == link.service.price + link.markup
+
+    def test_preload(self, doctor: Doctor) -> None:
+        PriceCatalog.invalidate()
+        asyncio.run(PriceCatalog.preload())
+        link = doctor.doctor_links[0]
+        assert (doctor.id, link.service_id) in PriceCatalog._prices
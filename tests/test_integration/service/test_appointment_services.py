@@ -8,11 +8,10 @@ from exceptions.exc import FormInputError
 from model.form_models import AppointmentBookingForm
 from model.appointment_models import AppointmentBase
 from service.appointment_services import (
-    AppointmentShceduleDataConstructor,
     AppointmentBooking,
+    AppointmentSlotEngine,
     AppointmentJWTTokenService
 )
-from service.doctor_services import WorkScheduleDataConstructor
 from data.sql_models import Appointment, Doctor
 from data.patient_data import Patient
 from utils import SetUpTest
@@ -56,26 +55,23 @@ class BaseAppointmentServiceTest:
         self.form = form
 
 
-class TestAppointmentScheduleDataConstructor:
+class TestAppointmentSlotEngine:
     @pytest.mark.parametrize("doctor", [1], indirect=True)
     def test_doctor_with_fully_booked_day_returns_none(
             self, doctor: Doctor
     ) -> None:
-        week_day = doctor.work_days[0]
-        schedule_constructor = WorkScheduleDataConstructor(week_day)
-        doctor_schedule = {int(week_day.weekday): schedule_constructor.exec()}
-        booked = [
+        fully_booked_day = date(2025, 11, 10)
+        work_masks = AppointmentSlotEngine.get_work_masks(doctor.work_days)
+        booked = {
             (appointment.date, appointment.time)
             for appointment
             in doctor.appointments
-            if appointment.date == date(2025, 11, 10)
-        ]
-        appointment_constructor = AppointmentShceduleDataConstructor(
-            doctor_schedule, booked, timedelta(days=1)
-        )
-        appointment_constructor.today += timedelta(days=7)
-        appoointment_schedule = appointment_constructor.exec()
-        assert not appoointment_schedule
+            if appointment.date == fully_booked_day
+        }
+        engine = AppointmentSlotEngine(work_masks, booked, timedelta(days=1))
+        engine.today = fully_booked_day
+        appointment_schedule = engine.exec()
+        assert not appointment_schedule
 
 
 @pytest.mark.parametrize(
@@ -0,0 +1,42 @@
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+from pydantic import TypeAdapter
+
+from model.service_models import ServiceOuter
+from service.catalog_services import CatalogCache
+from data.catalog_data import CatalogRedis
+
+TEST_PAGE = "test-page"
+
+
+@pytest.fixture
+def cache() -> Iterator[CatalogCache]:
+    cache = CatalogCache()
+    yield cache
+    catalog = CatalogRedis()
+    keys = catalog.conn.keys(f"{catalog.prefix}*:{TEST_PAGE}")
+    if keys:
+        catalog.conn.delete(*keys)
+
+
+class TestCatalogCache:
+    adapter = TypeAdapter(list[ServiceOuter])
+
+    def test_get_loads_page_once(self, cache: CatalogCache) -> None:
+        page = [ServiceOuter(title="Blood test", price=500)]
+        loads = []
+
+        async def load() -> list[ServiceOuter]:
+            loads.append(page)
+            return page
+
+        async def get_twice() -> list[list[ServiceOuter]]:
+            return [
+                await cache.get(TEST_PAGE, self.adapter, load)
+                for _ in range(2)
+            ]
+
+        assert asyncio.run(get_twice()) == [page, page]
+        assert len(loads) == 1
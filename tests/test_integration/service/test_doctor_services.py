@@ -1,16 +1,14 @@
-from datetime import time
 from pathlib import Path
 
 import pytest
-from sqlmodel import Session
+from sqlmodel import Session, Sequence
 
 from logger.setup import get_logger
 from utils import read_fixture
 from service.doctor_services import (
-    DoctorDataConstructor, WorkScheduleDataConstructor, DoctorPage
+    DoctorAvailability, DoctorDataConstructor, DoctorPage
 )
-from data.sql_models import Doctor, WorkSchedule
-from tests.test_integration.conftest import BaseDoctorTest
+from data.sql_models import Doctor
 
 
 @pytest.fixture
@@ -32,17 +30,6 @@ def work_schedules_data(fixture_dir: Path) -> list[dict] | dict:
     return work_schedules
 
 
-@pytest.fixture
-def mock_work_schedule() -> WorkSchedule:
-    work_day = WorkSchedule(
-            doctor_id=1,
-            weekday="1",
-            start_time=time(hour=8),
-            end_time=time(hour=16)
-        )
-    return work_day
-
-
 @pytest.fixture
 def doctor_page(session: Session) -> DoctorPage:
     doctor_page = DoctorPage(session)
@@ -76,27 +63,20 @@ class TestDoctorDataConstructor:
         assert dumped
 
 
-class TestDoctorDataConstructorSingle(BaseDoctorTest):
-    @pytest.fixture(autouse=True)
-    def _constructor(
-            self, doctor_data_constructor_single: DoctorDataConstructor
+class TestDoctorAvailability:
+    def test_get_many_builds_missing_indexes(
+            self, doctors: Sequence[Doctor]
     ) -> None:
-        self.constructor = doctor_data_constructor_single
-
-    def test__get_schedule(self, doctor: Doctor) -> None:
-        self.constructor.doctor = doctor
-        schedule = self.constructor._get_schedule()
-        assert schedule
-
-    def test__get_appointments(self, doctor: Doctor) -> None:
-        self.constructor.doctor = doctor
-        appointments = self.constructor._get_appointments()
-        assert appointments
-        assert len(appointments) == 3
-
+        availability = DoctorAvailability()
+        for doctor in doctors:
+            availability.store.delete(doctor.id)
+        free_times = availability.get_many(doctors)
+        assert free_times == {
+            doctor.id: availability.build(doctor.id) for doctor in doctors
+        }
+        assert all(
+            availability.store.get(doctor.id) is not None
+            for doctor
+            in doctors
+        )
 
-class TestWorkScheduleService:
-    def test_exec(self, mock_work_schedule: WorkSchedule) -> None:
-        constructor = WorkScheduleDataConstructor(mock_work_schedule)
-        schedule = constructor.exec()
-        assert schedule
@@ -1,4 +1,4 @@
-from datetime import date, time
+from datetime import date, time, timedelta
 
 import pytest
 from sqlmodel import Session
@@ -6,8 +6,11 @@ from sqlmodel import Session
 from logger.setup import get_logger
 from service.form_services import (
     AppointmentBookingFormDataConstructor,
-    AppointmentRescheduleFormDataConstructor
+    AppointmentRescheduleFormDataConstructor,
+    BookingFormOptions,
+    CompactBookingPayload
 )
+from service.doctor_services import DoctorAvailability
 from data.sql_models import Doctor
 from data.appointment_data import AppointmentCRUD
 from tests.test_integration.conftest import (
@@ -46,6 +49,16 @@ class TestAppointmentBookingFormDataConstructor(BasePatientTest):
         content = self.constructor.exec()
         assert content
 
+    def test_construct_compact(
+            self, session: Session, mock_request: MockRequest
+    ) -> None:
+        constructor = AppointmentBookingFormDataConstructor(
+            session, mock_request, "compact"
+        )
+        options = constructor.exec().get("options")
+        assert options.get("format") == "compact"
+        assert options.get("specialties").get("id")
+
 
 class TestAppointmentRescheduleFormDataConstructor(BaseDoctorTest):
     @pytest.fixture(autouse=True)
@@ -59,13 +72,87 @@ class TestAppointmentRescheduleFormDataConstructor(BaseDoctorTest):
         assert appointment_schedule
         get_logger().debug(f"Appointment schedule: {appointment_schedule}")
 
-    def test__get_doctor_appointments(
+    def test_exec_excludes_pending_appointments(
         self, get_doctor_appointments_expected_result: set[tuple[date, time]]
     ) -> None:
-        appointments = self.constructor._get_doctor_appointments()
-        assert appointments == get_doctor_appointments_expected_result
+        appointment_schedule = self.constructor.exec()
+        for day, appointment_time in get_doctor_appointments_expected_result:
+            free_times = appointment_schedule.get(day.isoformat(), [])
+            assert appointment_time.isoformat() not in free_times
+
+
+class TestBookingFormOptions(BaseDoctorTest):
+    @pytest.fixture(autouse=True)
+    def _options(self, session: Session) -> None:
+        self.options = BookingFormOptions(session)
+
+    def test_get_doctors(self, doctor: Doctor) -> None:
+        specialty = doctor.specialties[0]
+        doctors = self.options.get_doctors(specialty.id)
+        assert doctor.id in [option.id for option in doctors]
+
+    def test_get_services(self, doctor: Doctor) -> None:
+        services = self.options.get_services(doctor.id)
+        assert sorted(option.id for option in services) == sorted(
+            service.id for service in doctor.services
+        )
+
+    def test_get_slots_within_range(self, doctor: Doctor) -> None:
+        slots = self.options.get_slots(doctor.id)
+        start = min(slots)
+        slots_in_range = self.options.get_slots(
+            doctor.id, date.fromisoformat(start), date.fromisoformat(start)
+        )
+        assert list(slots_in_range) == [start]
+
+
+class TestCompactBookingPayload(BaseDoctorTest):
+    @pytest.fixture(autouse=True)
+    def _payload(self, doctor: Doctor) -> None:
+        self.availability = DoctorAvailability()
+        self.payload = CompactBookingPayload(
+            doctor.specialties, self.availability
+        ).exec()
+        self.index = self.payload["doctors"]["id"].index(doctor.id)
+
+    def test_doctor_is_encoded_once(self, doctor: Doctor) -> None:
+        assert self.payload["doctors"]["id"].count(doctor.id) == 1
+
+    def test_encodes_services(self, session: Session, doctor: Doctor) -> None:
+        doctors = self.payload["doctors"]
+        services = [
+            (
+                self.payload["services"]["id"][service],
+                self.payload["prices"][price]
+            )
+            for service, price
+            in zip(
+                doctors["services"][self.index], doctors["prices"][self.index]
+            )
+        ]
+        expected = [
+            (service.id, service.price)
+            for service
+            in BookingFormOptions(session).get_services(doctor.id)
+        ]
+        assert services == expected
 
-    def test__get_doctor_schedule(self) -> None:
-        doctor_schedule = self.constructor._get_doctor_schedule()
-        assert doctor_schedule
-        get_logger().debug(doctor_schedule)
+    def test_encodes_free_times(self, doctor: Doctor) -> None:
+        doctors = self.payload["doctors"]
+        start = date.fromisoformat(self.payload["start"])
+        free_times = {
+            (start + timedelta(days=offset)).isoformat(): sorted(
+                time
+                for index, time
+                in enumerate(self.payload["times"])
+                if int(slot, 16) >> index & 1
+            )
+            for offset, slot
+            in zip(doctors["days"][self.index], doctors["slots"][self.index])
+        }
+        expected = {
+            day: sorted(times)
+            for day, times
+            in self.availability.get(doctor.id).items()
+        }
+        assert free_times == expected
@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+from model.auth_models import JWTKey
+from service.keyring_services import RedisKeyring
+from data.auth_data import JWTKeyRedis
+
+
+@pytest.fixture
+def storage(monkeypatch: pytest.MonkeyPatch) -> JWTKeyRedis:
+    monkeypatch.setattr(JWTKeyRedis, "key", "jwt:test:keys")
+    monkeypatch.setattr(JWTKeyRedis, "rotation_key", "jwt:test:rotation")
+    storage = JWTKeyRedis()
+    yield storage
+    storage.conn.delete(storage.key, storage.rotation_key)
+
+
+def add_key(storage: JWTKeyRedis, kid: str, age: float) -> JWTKey:
+    key = JWTKey(kid=kid, secret=kid, created_at=time.time() - age)
+    storage.add(key)
+    return key
+
+
+class TestRedisKeyring:
+    def test_empty_keyring_is_rotated(self, storage: JWTKeyRedis) -> None:
+        key = RedisKeyring(storage).get_active()
+        assert [key] == storage.get_all()
+
+    def test_new_key_signs_after_refresh_interval(
+            self, storage: JWTKeyRedis
+    ) -> None:
+        add_key(storage, "old", 120)
+        add_key(storage, "new", 0)
+        keyring = RedisKeyring(storage, refresh_interval=60)
+        assert keyring.get_active().kid == "old"
+        assert keyring.get("new")
+
+    def test_key_is_rotated_when_due(self, storage: JWTKeyRedis) -> None:
+        add_key(storage, "old", 120)
+        keyring = RedisKeyring(
+            storage, rotation_interval=60, refresh_interval=0
+        )
+        assert keyring.get_active().kid != "old"
+        assert keyring.get("old")
+
+    def test_rotation_is_locked(self, storage: JWTKeyRedis) -> None:
+        add_key(storage, "old", 120)
+        storage.lock_rotation(60)
+        keyring = RedisKeyring(storage, rotation_interval=60)
+        assert keyring.get_active().kid == "old"
+
+    def test_unknown_kid_is_reloaded(self, storage: JWTKeyRedis) -> None:
+        keyring = RedisKeyring(storage)
+        keyring.get_active()
+        key = add_key(storage, "new", 0)
+        assert keyring.get("new") is None
+        time.sleep(1)
+        assert keyring.get("new") == key
+
+    def test_rotation_prunes_expired_keys(self, storage: JWTKeyRedis) -> None:
+        add_key(storage, "oldest", 300)
+        add_key(storage, "old", 200)
+        keyring = RedisKeyring(storage, retention=60, refresh_interval=60)
+        keyring.rotate()
+        kids = {key.kid for key in storage.get_all()}
+        assert "oldest" not in kids
+        assert "old" in kids
@@ -101,6 +101,24 @@ class TestPatientPage(BasePatientPageTest):
         )
         assert pending_appointments == expected_result
 
+    @pytest.mark.parametrize(
+        "filtered_appointments", appointment_status, indirect=True
+    )
+    def test_get_appointments_page(
+            self, filtered_appointments: list[AppointmentOuter]
+    ) -> None:
+        appointment_status, expected_result = filtered_appointments
+        appointments, cursor = [], None
+        while True:
+            page = self.patient_page.get_appointments_page(
+                appointment_status, cursor, limit=1
+            )
+            appointments.extend(page.appointments)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert appointments == expected_result
+
     def test_get_appointment_raises_appointment_not_found(self) -> None:
         with pytest.raises(AppointmentNotFound):
             self.patient_page.get_appointment(0)
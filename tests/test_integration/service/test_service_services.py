@@ -1,28 +1,12 @@
-from pathlib import Path
-
 import pytest
 from sqlmodel import Session
 
-from utils import read_fixture
 from service.service_services import (
     ServiceDataConstructor, PriceCalculator, ServicePage
 )
 from data.sql_models import Doctor, Service
 
 
-@pytest.fixture
-def fixture_dir() -> Path:
-    return Path("src", "data", "sql", "fixtures")
-
-
-@pytest.fixture
-def doctors_to_services_data(
-        fixture_dir: Path, request: pytest.FixtureRequest
-) -> dict[str, str]:
-    content = read_fixture(fixture_dir.joinpath("doctors_to_services.json"))
-    return content[request.param]
-
-
 @pytest.fixture
 def service_page(session: Session) -> ServicePage:
     service_page = ServicePage(session)
@@ -66,10 +50,3 @@ class TestPriceCalculator(BaseServiceTest):
         price = self.calculator.exec()
         expected_price = 3000
         assert price == expected_price
-
-    @pytest.mark.parametrize("doctors_to_services_data", [0], indirect=True)
-    def test__get_doctor_to_service_markup(
-            self, doctors_to_services_data: dict[str, str]
-    ) -> None:
-        markup = self.calculator._get_doctor_to_service_markup()
-        assert markup == doctors_to_services_data.get("markup")
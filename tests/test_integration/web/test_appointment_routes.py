@@ -9,7 +9,9 @@ from fastapi import status
 from utils import SetUpTest
 from model.form_models import AppointmentBookingForm
 from model.appointment_models import AppointmentInner
+from service.doctor_services import DoctorAvailability
 from data.patient_data import Patient
+from data.sql_models import Doctor
 from tests.test_integration.web.conftest import (
     BaseTestEndpoint, EndpointWithForm, BaseProtectedEndpointTest
 )
@@ -46,6 +48,30 @@ class TestAppointmentEndpointGetForm(BaseTestEndpoint):
         assert sorted(field_values) == sorted(list(patient_dumped.values()))
 
 
+class TestAppointmentEndpointFormSlots(BaseTestEndpoint):
+    base_url = "Appointment.form_slots"
+
+    @pytest.mark.parametrize("doctor", [0], indirect=True)
+    def test_returns_free_times(self, doctor: Doctor) -> None:
+        response = self.client.get(
+            self._get_url(), params={"doctor_id": doctor.id}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == DoctorAvailability().get(doctor.id)
+
+    def test_unknown_doctor_returns_404(self) -> None:
+        response = self.client.get(self._get_url(), params={"doctor_id": 0})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestAppointmentEndpointFormServices(BaseTestEndpoint):
+    base_url = "Appointment.form_services"
+
+    def test_unknown_doctor_returns_404(self) -> None:
+        response = self.client.get(self._get_url(), params={"doctor_id": 0})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 class TestAppointmentEndpointSendForm(EndpointWithForm):
     base_url = "Appointment.send_form"
 
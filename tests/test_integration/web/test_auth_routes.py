@@ -9,6 +9,7 @@ from fastapi import status
 from fastapi.testclient import TestClient
 
 from logger.setup import get_logger
+from exceptions.exc import OTPCodeNotFound
 from main import app
 from model.form_models import PhoneForm, OTPCodeForm
 from service.auth_services import AuthService
@@ -151,6 +152,33 @@ class TestVerifyCodeEndpoint(EndpointWithForm):
         assert self.client.cookies.get("access_token")
         assert self.client.cookies.get("refresh_token")
 
+    @pytest.mark.usefixtures("otp_code_db", "patient")
+    def test_code_is_consumed(
+            self, otp_code_data: dict[str, str], otp_redis: OTPCodeRedis
+    ) -> None:
+        self.client.post(self._get_url(), data=otp_code_data)
+        with pytest.raises(OTPCodeNotFound):
+            otp_redis.get(otp_code_data.get("phone"))
+
+    @pytest.mark.usefixtures("otp_code_db", "patient")
+    def test_code_can_be_retried_after_typo(
+            self, otp_code_data: dict[str, str]
+    ) -> None:
+        typo = self._post_req({**otp_code_data, "code": "000000"})
+        assert "Verification code does not match" in typo.text
+        self._post_req(otp_code_data)
+        assert self.client.cookies.get("access_token")
+
+    @pytest.mark.usefixtures("otp_code_db", "patient")
+    def test_code_is_deleted_after_max_attempts(
+            self, otp_code_data: dict[str, str], otp_redis: OTPCodeRedis
+    ) -> None:
+        for _ in range(otp_redis.max_attempts):
+            self._post_req({**otp_code_data, "code": "000000"})
+        response = self._post_req(otp_code_data)
+        assert "Code expired or already used" in response.text
+        assert not self.client.cookies.get("access_token")
+
 
 @pytest.mark.parametrize("patients_data", ["patient_1"], indirect=True)
 class TestRefreshEndpoint(BaseTestEndpoint):
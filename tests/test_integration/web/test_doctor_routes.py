@@ -46,6 +46,19 @@ class TestDoctorScheduleEndpoint(BaseTestEndpoint):
         response = self.client.get(self.path)
         assert response.status_code == status.HTTP_200_OK
 
+    def test_schedule_not_modified(self) -> None:
+        etag = self.client.get(self.path).headers["etag"]
+        response = self.client.get(
+            self.path, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_schedule_modified(self) -> None:
+        response = self.client.get(
+            self.path, headers={"If-None-Match": 'W/"outdated"'}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
     def test_schedule(self) -> None:
         response = self.client.get(self.path)
         assert response
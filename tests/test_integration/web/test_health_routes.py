@@ -0,0 +1,13 @@
+from fastapi import status
+
+from model.connection_models import PoolStatistics
+from tests.test_integration.web.conftest import BaseTestEndpoint
+
+
+class TestDBPoolEndpoint(BaseTestEndpoint):
+    base_url = "Health.db_pool"
+
+    def test_returns_pool_statistics(self) -> None:
+        response = self.client.get(self._get_url())
+        assert response.status_code == status.HTTP_200_OK
+        assert PoolStatistics(**response.json())
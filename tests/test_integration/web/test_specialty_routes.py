@@ -5,6 +5,7 @@ from fastapi import status
 from sqlmodel import Session, Sequence
 
 from logger.setup import get_logger
+from web.base_routes import BaseRouter
 from data.sql_models import Specialty
 from tests.test_integration.web.conftest import EndpointWithURLParams
 
@@ -19,6 +20,31 @@ class TestSpecialtyEndpoint(EndpointWithURLParams):
         response = self.client.get(self._get_url(path="Specialty.all"))
         assert response.status_code == status.HTTP_200_OK
 
+    def test_all_specialties_not_modified(self) -> None:
+        url = self._get_url(path="Specialty.all")
+        etag = self.client.get(url).headers["etag"]
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not response.content
+
+    def test_all_specialties_rendered_once(
+            self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        rendered = []
+        render = BaseRouter.pages._render
+
+        async def count_render(*args, **kwargs):
+            rendered.append(args)
+            return await render(*args, **kwargs)
+
+        monkeypatch.setattr(BaseRouter.pages, "_render", count_render)
+        url = self._get_url(path="Specialty.all")
+        first = self.client.get(url)
+        rendered_before = len(rendered)
+        second = self.client.get(url)
+        assert first.text == second.text
+        assert len(rendered) == rendered_before
+
     @override
     def test_multiple_exist(self, session: Session) -> None:
         super().test_multiple_exist(session)
@@ -0,0 +1,12 @@
+import secrets
+
+import pytest
+
+from service.keyring_services import JWTKeyrings, SettingsKeyring
+
+
+@pytest.fixture(autouse=True)
+def jwt_keyring(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Unit tests sign tokens with a local key rather than the Redis keyring"""
+    keyring = SettingsKeyring({"test": secrets.token_hex(32)})
+    monkeypatch.setattr(JWTKeyrings, "_default", keyring)
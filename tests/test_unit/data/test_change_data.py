@@ -0,0 +1,23 @@
+from data.change_data import ChangeNotifier
+
+
+class TestChangeNotifier:
+    def test_notify_calls_subscribers_of_changed_tables(self) -> None:
+        notified = []
+        ChangeNotifier.subscribe(["test_notify"], notified.append)
+        ChangeNotifier.notify({"test_notify", "test_other"})
+        assert notified == [{"test_notify", "test_other"}]
+
+    def test_notify_calls_subscriber_once(self) -> None:
+        notified = []
+        ChangeNotifier.subscribe(
+            ["test_once_1", "test_once_2"], notified.append
+        )
+        ChangeNotifier.notify({"test_once_1", "test_once_2"})
+        assert len(notified) == 1
+
+    def test_notify_skips_unrelated_subscribers(self) -> None:
+        notified = []
+        ChangeNotifier.subscribe(["test_unrelated"], notified.append)
+        ChangeNotifier.notify({"test_other"})
+        assert not notified
@@ -0,0 +1,43 @@
+from datetime import date
+
+from sqlmodel import Session
+
+from data.identity_data import IdentityMap
+from data.sql_models import Patient, Specialty
+
+
+def create_patient() -> Patient:
+    patient = Patient(
+        id=b"identity-map-key",
+        phone="9990000000",
+        birth_date=date(1990, 1, 1)
+    )
+    return patient
+
+
+class TestIdentityMap:
+    def test_get_by_every_tracked_column(self) -> None:
+        session, patient = Session(), create_patient()
+        IdentityMap.add(session, patient)
+        assert IdentityMap.get(
+            session, "patients", "id", patient.id
+        ) is patient
+        assert IdentityMap.get(
+            session, "patients", "phone", patient.phone
+        ) is patient
+
+    def test_untracked_table_is_not_memoized(self) -> None:
+        session = Session()
+        IdentityMap.add(session, Specialty(id=1, title="Cardiology"))
+        assert IdentityMap.get(session, "specialties", "id", 1) is None
+
+    def test_discard(self) -> None:
+        session, patient = Session(), create_patient()
+        IdentityMap.add(session, patient)
+        IdentityMap.discard(session, patient)
+        assert IdentityMap.get(session, "patients", "id", patient.id) is None
+
+    def test_sessions_do_not_share_entities(self) -> None:
+        patient = create_patient()
+        IdentityMap.add(Session(), patient)
+        assert IdentityMap.get(Session(), "patients", "id", patient.id) is None
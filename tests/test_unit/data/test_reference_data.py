@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+import pytest
+
+from data.reference_data import ReferenceCache
+
+
+@pytest.fixture(autouse=True)
+def _cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ReferenceCache, "_entries", OrderedDict())
+    monkeypatch.setattr(ReferenceCache, "max_size", 2)
+    monkeypatch.setattr(ReferenceCache, "hits", 0)
+    monkeypatch.setattr(ReferenceCache, "misses", 0)
+    monkeypatch.setattr(ReferenceCache, "evictions", 0)
+
+
+def set_value(key: tuple[str, int | None], value: dict) -> None:
+    ReferenceCache.set(key, value, ReferenceCache.get_generation())
+
+
+class TestReferenceCache:
+    def test_get(self) -> None:
+        set_value(("doctors", 1), {"id": 1})
+        assert ReferenceCache.get(("doctors", 1)) == {"id": 1}
+        assert ReferenceCache.get(("doctors", 2)) is None
+        statistics = ReferenceCache.statistics()
+        assert (statistics.hits, statistics.misses) == (1, 1)
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        set_value(("doctors", 1), {"id": 1})
+        set_value(("doctors", 2), {"id": 2})
+        ReferenceCache.get(("doctors", 1))
+        set_value(("doctors", 3), {"id": 3})
+        assert ReferenceCache.get(("doctors", 2)) is None
+        assert ReferenceCache.get(("doctors", 1)) == {"id": 1}
+        assert ReferenceCache.statistics().evictions == 1
+
+    def test_expired_entry_is_missed(
+            self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        set_value(("doctors", 1), {"id": 1})
+        monkeypatch.setattr(ReferenceCache, "lifetime", -1)
+        assert ReferenceCache.get(("doctors", 1)) is None
+
+    def test_invalidate_drops_entries_of_changed_tables(self) -> None:
+        set_value(("doctors", 1), {"id": 1})
+        set_value(("services", 1), {"id": 1})
+        ReferenceCache.invalidate({"doctors"})
+        assert ReferenceCache.get(("doctors", 1)) is None
+        assert ReferenceCache.get(("services", 1)) == {"id": 1}
+
+    def test_value_loaded_before_invalidation_is_not_kept(self) -> None:
+        generation = ReferenceCache.get_generation()
+        ReferenceCache.invalidate({"doctors"})
+        ReferenceCache.set(("doctors", 1), {"id": 1}, generation)
+        assert ReferenceCache.get(("doctors", 1)) is None
@@ -0,0 +1,24 @@
+from sqlmodel import Session
+
+from data.base_data import BaseCRUD, Statements
+from data.sql_models import Specialty
+
+
+class TestStatements:
+    def test_statement_is_built_once(self) -> None:
+        built = []
+
+        def build() -> object:
+            built.append(object())
+            return built[-1]
+
+        first = Statements.get("test_built_once", build)
+        second = Statements.get("test_built_once", build)
+        assert first is second
+        assert len(built) == 1
+
+    def test_crud_statements_are_shared(self) -> None:
+        first = BaseCRUD(Session(), Specialty, Specialty)
+        second = BaseCRUD(Session(), Specialty, Specialty)
+        assert first.select is second.select
+        assert first._select_by("title") is second._select_by("title")
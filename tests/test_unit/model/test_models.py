@@ -1,7 +1,9 @@
 import pytest
 from pydantic import ValidationError, Field
 
+from exceptions.exc import InvalidCursor
 from model.base_models import PersonAbstract, AbstractModel
+from model.appointment_models import AppointmentCursor
 from model.patient_models import Phone
 
 
@@ -53,3 +55,14 @@ class TestPhone:
     def test_not_numeric_value_raises_validation_error(self) -> None:
         with pytest.raises(ValidationError):
             Phone(phone="999999999q")
+
+
+class TestAppointmentCursor:
+    def test_decode_returns_encoded_cursor(self) -> None:
+        cursor = AppointmentCursor(date="2025-11-18", time="09:00:00", id=1)
+        assert AppointmentCursor.decode(cursor.encode()) == cursor
+
+    @pytest.mark.parametrize("cursor", ["not a cursor", "e30="])
+    def test_decode_raises_invalid_cursor(self, cursor: str) -> None:
+        with pytest.raises(InvalidCursor):
+            AppointmentCursor.decode(cursor)
@@ -6,7 +6,10 @@ from logger.setup import get_logger
 from service.appointment_services import (
     AppointmentSchedule,
     AppointmentShceduleDataConstructor,
+    AppointmentSlotEngine,
+    WorkMasks
 )
+from data.sql_models import WorkSchedule
 
 
 @pytest.fixture
@@ -91,6 +94,16 @@ def constructor(
     return constructor
 
 
+@pytest.fixture
+def work_masks() -> WorkMasks:
+    """Same working hours as in 'doctor_schedule'"""
+    work_day = WorkSchedule(
+        weekday="0", start_time=time(hour=8), end_time=time(hour=9, minute=30)
+    )
+    work_mask = AppointmentSlotEngine.get_work_mask(work_day)
+    return {weekday: work_mask for weekday in range(7)}
+
+
 @pytest.fixture
 def constructor_blank() -> AppointmentShceduleDataConstructor:
     return AppointmentShceduleDataConstructor({}, [])
@@ -138,3 +151,45 @@ class TestAppointmentScheduleDataConstructor:
         constructor_blank._set_free_appointment_times()
         assert not constructor_blank.schedule
         get_logger().debug(constructor_blank.schedule)
+
+
+class TestAppointmentSlotEngine:
+    def test_get_work_mask(self) -> None:
+        work_day = WorkSchedule(
+            weekday="0", start_time=time(hour=8), end_time=time(hour=9)
+        )
+        work_mask = AppointmentSlotEngine.get_work_mask(work_day)
+        assert work_mask == 0b11 << 16
+
+    def test_exec(
+            self,
+            work_masks: WorkMasks,
+            booked_appointment_times: set[tuple[date, time]],
+            expected_appointment_schedule: AppointmentSchedule
+    ) -> None:
+        engine = AppointmentSlotEngine(
+            work_masks, booked_appointment_times, timedelta(days=7)
+        )
+        assert engine.exec() == expected_appointment_schedule
+
+    def test_exec_matches_schedule_constructor(
+            self,
+            work_masks: WorkMasks,
+            constructor: AppointmentShceduleDataConstructor,
+            booked_appointment_times: set[tuple[date, time]]
+    ) -> None:
+        engine = AppointmentSlotEngine(work_masks, booked_appointment_times)
+        assert engine.exec() == constructor.exec()
+
+    def test_fully_booked_day_is_omitted(
+            self, work_masks: WorkMasks, today: date
+    ) -> None:
+        booked = {
+            (today, time(hour=8)),
+            (today, time(hour=8, minute=30)),
+            (today, time(hour=9))
+        }
+        engine = AppointmentSlotEngine(work_masks, booked, timedelta(days=2))
+        schedule = engine.exec()
+        assert today.isoformat() not in schedule
+        assert len(schedule) == 1
@@ -1,4 +1,6 @@
 import os
+import time
+from collections import OrderedDict
 from datetime import timedelta
 from time import sleep
 
@@ -10,7 +12,9 @@ from logger.setup import get_logger
 from exceptions.exc import (
     OTPCodeHashDoesNotMatch, UnauthorizedError, AccessTokenExpired
 )
-from service.auth_services import JWTTokenService, AuthService, OTPCodeService
+from service.auth_services import (
+    JWTTokenService, AuthService, OTPCodeService, TokenCache
+)
 from tests.conftest import MockRequest
 
 
@@ -127,6 +131,51 @@ class TestJWTTokenService:
             jwt_token_service.verify(jwt_token_expired)
 
 
+@pytest.fixture
+def token_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(TokenCache, "_entries", OrderedDict())
+    monkeypatch.setattr(TokenCache, "max_size", 2)
+    monkeypatch.setattr(TokenCache, "hits", 0)
+    monkeypatch.setattr(TokenCache, "misses", 0)
+    monkeypatch.setattr(TokenCache, "evictions", 0)
+
+
+@pytest.mark.usefixtures("token_cache")
+class TestTokenCache:
+    def test_verify_cached(self, access_token: str, id: int) -> None:
+        for _ in range(2):
+            payload = JWTTokenService().verify_cached(access_token)
+            assert payload.get("id") == id
+        statistics = TokenCache.statistics()
+        assert (statistics.hits, statistics.misses) == (1, 1)
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        exp = int(time.time()) + 60
+        for token in ("1", "2"):
+            TokenCache.set(token, {"id": token, "exp": exp})
+        TokenCache.get("1")
+        TokenCache.set("3", {"id": "3", "exp": exp})
+        assert TokenCache.get("2") is None
+        assert TokenCache.get("1") == {"id": "1", "exp": exp}
+        assert TokenCache.statistics().evictions == 1
+
+    def test_expired_entry_is_missed(self) -> None:
+        TokenCache.set("1", {"id": "1", "exp": int(time.time())})
+        assert TokenCache.get("1") is None
+        assert TokenCache.statistics().size == 0
+
+    @pytest.mark.parametrize(
+        "jwt_token_service", [timedelta(seconds=1)], indirect=True
+    )
+    def test_cached_expired_token_raises_access_token_expired(
+            self, auth_service_with_expired_token: AuthService
+    ) -> None:
+        assert auth_service_with_expired_token._get_access_token_payload()
+        sleep(2)
+        with pytest.raises(AccessTokenExpired):
+            auth_service_with_expired_token._get_access_token_payload()
+
+
 class TestOTPCode:
     def test__generate_value(
             self, otp_code_service: OTPCodeService
@@ -146,6 +195,10 @@ class TestOTPCode:
             self, otp_code_service: OTPCodeService
     ) -> None:
         rand_bytes_1 = os.urandom(16)
-        rand_bytes_2 = os.urandom
+        rand_bytes_2 = os.urandom(16)
         with pytest.raises(OTPCodeHashDoesNotMatch):
             otp_code_service._check_hash(rand_bytes_1, rand_bytes_2)
+
+    def test__check_hash(self, otp_code_service: OTPCodeService) -> None:
+        rand_bytes = os.urandom(16)
+        assert otp_code_service._check_hash(rand_bytes, bytes(rand_bytes))
@@ -0,0 +1,45 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from service.hashing_services import (
+    HMACHasher, OTPHashers, PBKDF2Hasher, pbkdf2
+)
+
+
+class TestHMACHasher:
+    def test_hash_depends_on_pepper(self) -> None:
+        salt = os.urandom(16)
+        first = HMACHasher("pepper_1").hash("123456", salt)
+        second = HMACHasher("pepper_2").hash("123456", salt)
+        assert first != second
+
+    def test_hash_is_repeatable(self) -> None:
+        salt, hasher = os.urandom(16), HMACHasher("pepper")
+        assert hasher.hash("123456", salt) == hasher.hash("123456", salt)
+
+
+class TestPBKDF2Hasher:
+    def test_algorithm_carries_cost(self) -> None:
+        assert PBKDF2Hasher(1000).algorithm == "pbkdf2-sha256:1000"
+
+    def test_executor_gives_same_hash(self) -> None:
+        salt = os.urandom(16)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            hashed = PBKDF2Hasher(1000, executor).hash("123456", salt)
+        assert hashed == pbkdf2("123456", salt, 1000)
+
+
+class TestOTPHashers:
+    @pytest.mark.parametrize("hasher", [
+        HMACHasher(), PBKDF2Hasher(1000)
+    ])
+    def test_from_algorithm_restores_hasher(self, hasher) -> None:
+        salt = os.urandom(16)
+        restored = OTPHashers.from_algorithm(hasher.algorithm)
+        assert restored.hash("123456", salt) == hasher.hash("123456", salt)
+
+    def test_unknown_algorithm(self) -> None:
+        with pytest.raises(ValueError):
+            OTPHashers.from_algorithm("md5")
@@ -0,0 +1,53 @@
+import pytest
+from jose import jwt
+from jose.exceptions import JWTError
+
+from service.auth_services import JWTTokenService
+from service.keyring_services import JWTKeyrings, SettingsKeyring
+
+
+@pytest.fixture
+def keyring() -> SettingsKeyring:
+    return SettingsKeyring({"old": "secret_1", "new": "secret_2"})
+
+
+class TestSettingsKeyring:
+    def test_last_key_is_active_by_default(
+            self, keyring: SettingsKeyring
+    ) -> None:
+        assert keyring.get_active().kid == "new"
+
+    def test_active_kid(self) -> None:
+        keyring = SettingsKeyring(
+            {"old": "secret_1", "new": "secret_2"}, "old"
+        )
+        assert keyring.get_active().secret == "secret_1"
+
+    def test_unknown_active_kid_raises_value_error(self) -> None:
+        with pytest.raises(ValueError):
+            SettingsKeyring({"old": "secret_1"}, "new")
+
+    def test_unknown_source_raises_value_error(self) -> None:
+        with pytest.raises(ValueError):
+            JWTKeyrings.from_source("vault")
+
+
+class TestJWTTokenServiceKeyring:
+    def test_token_carries_kid(self, keyring: SettingsKeyring) -> None:
+        token = JWTTokenService(keyring=keyring).create(1)
+        assert jwt.get_unverified_header(token).get("kid") == "new"
+
+    def test_token_of_previous_key_is_verified(
+            self, keyring: SettingsKeyring
+    ) -> None:
+        previous = SettingsKeyring({"old": "secret_1"})
+        token = JWTTokenService(keyring=previous).create(1)
+        assert JWTTokenService(keyring=keyring).verify(token).get("id") == 1
+
+    def test_unknown_kid_raises_jwt_error(
+            self, keyring: SettingsKeyring
+    ) -> None:
+        other = SettingsKeyring({"other": "secret_3"})
+        token = JWTTokenService(keyring=other).create(1)
+        with pytest.raises(JWTError):
+            JWTTokenService(keyring=keyring).verify(token)
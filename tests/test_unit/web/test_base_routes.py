@@ -0,0 +1,53 @@
+import pytest
+from fastapi.templating import Jinja2Templates
+from starlette.requests import Request
+
+from config import Config
+from web.base_routes import PageCache
+
+
+def get_request(query: str, host: str = "testserver") -> Request:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "scheme": "http",
+        "server": (host, 80),
+        "path": "/specialties/",
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", host.encode())]
+    }
+    return Request(scope)
+
+
+@pytest.fixture
+def page_cache() -> PageCache:
+    return PageCache(Jinja2Templates(directory=Config.templates_dir))
+
+
+class TestPageCacheKey:
+    def test_unlisted_params_are_ignored(self, page_cache: PageCache) -> None:
+        key = page_cache._get_key(get_request(""), "page.html", "1", ())
+        assert page_cache._get_key(
+            get_request("utm=1&page=2"), "page.html", "1", ()
+        ) == key
+
+    def test_listed_params_are_kept(self, page_cache: PageCache) -> None:
+        key = page_cache._get_key(get_request(""), "page.html", "1", ["page"])
+        assert page_cache._get_key(
+            get_request("utm=1&page=2"), "page.html", "1", ["page"]
+        ) != key
+
+    def test_params_order_is_ignored(self, page_cache: PageCache) -> None:
+        assert page_cache._get_key(
+            get_request("a=1&b=2"), "page.html", "1", ["a", "b"]
+        ) == page_cache._get_key(
+            get_request("b=2&a=1"), "page.html", "1", ["a", "b"]
+        )
+
+    def test_host_is_kept(self, page_cache: PageCache) -> None:
+        assert page_cache._get_key(
+            get_request(""), "page.html", "1", ()
+        ) != page_cache._get_key(
+            get_request("", "example.com"), "page.html", "1", ()
+        )
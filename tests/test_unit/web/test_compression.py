@@ -0,0 +1,120 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, PlainTextResponse
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers
+
+from web.compression import (
+    CompressionMiddleware,
+    ContentEncoding,
+    PrecompressedStaticFiles,
+    StaticAssetCompressor
+)
+
+body = "<p>Podalirius</p>" * 100
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(
+        CompressionMiddleware, encodings=["gzip"], minimum_size=1024
+    )
+
+    @app.get("/large")
+    def large() -> HTMLResponse:
+        return HTMLResponse(body)
+
+    @app.get("/small")
+    def small() -> HTMLResponse:
+        return HTMLResponse("<p>Podalirius</p>")
+
+    @app.get("/text")
+    def text() -> PlainTextResponse:
+        return PlainTextResponse(body)
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def static_client(tmp_path) -> TestClient:
+    (tmp_path / "form.js").write_text("console.log('Podalirius');" * 100)
+    StaticAssetCompressor(tmp_path).exec()
+    app = FastAPI()
+    app.mount(
+        "/static",
+        PrecompressedStaticFiles(directory=tmp_path, encodings=["gzip"])
+    )
+    return TestClient(app)
+
+
+class TestContentEncoding:
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0", None),
+        ("*", "gzip"),
+        ("identity", None),
+        ("", None)
+    ])
+    def test_choose(self, header: str, expected: str | None) -> None:
+        encoding = ContentEncoding(["gzip"])
+        headers = Headers({"accept-encoding": header})
+        assert encoding.choose(headers) == expected
+
+
+class TestCompressionMiddleware:
+    def test_compresses_large_response(self, client: TestClient) -> None:
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers.get("content-encoding") == "gzip"
+        assert response.headers.get("vary") == "Accept-Encoding"
+        assert response.num_bytes_downloaded < len(body)
+        assert response.text == body
+
+    def test_skips_small_response(self, client: TestClient) -> None:
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    def test_skips_unlisted_content_type(self, client: TestClient) -> None:
+        response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    def test_skips_client_without_encoding(self, client: TestClient) -> None:
+        response = client.get(
+            "/large", headers={"Accept-Encoding": "identity"}
+        )
+        assert "content-encoding" not in response.headers
+
+
+class TestPrecompressedStaticFiles:
+    def test_serves_compressed_sibling(
+            self, static_client: TestClient, tmp_path
+    ) -> None:
+        response = static_client.get(
+            "/static/form.js", headers={"Accept-Encoding": "gzip"}
+        )
+        compressed = (tmp_path / "form.js.gz").read_bytes()
+        assert response.headers.get("content-encoding") == "gzip"
+        assert response.headers.get("content-type").startswith(
+            "text/javascript"
+        )
+        assert response.num_bytes_downloaded == len(compressed)
+        assert response.content == gzip.decompress(compressed)
+
+    def test_serves_asset_to_client_without_encoding(
+            self, static_client: TestClient
+    ) -> None:
+        response = static_client.get(
+            "/static/form.js", headers={"Accept-Encoding": "identity"}
+        )
+        assert "content-encoding" not in response.headers
+
+    def test_not_modified(self, static_client: TestClient) -> None:
+        headers = {"Accept-Encoding": "gzip"}
+        response = static_client.get("/static/form.js", headers=headers)
+        response = static_client.get(
+            "/static/form.js",
+            headers=headers | {"If-None-Match": response.headers["etag"]}
+        )
+        assert response.status_code == 304